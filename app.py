@@ -2,58 +2,138 @@
 # Simplified David with full tool system
 
 import chainlit as cl
-import uuid
+import os
 import asyncio
-from src.local_agent.agent import create_agent_executor, get_or_create_session_history
+import logging
+import time
+from src.local_agent.agent import astream_turn, create_agent_executor, get_or_create_session_history
+from src.local_agent.session_manager import SESSIONS
+from src.local_agent.warmup import warm_up_model
+from src.local_agent.model_pool import backend_specs
+from src.local_agent.approval_grants import APPROVAL_GRANTS
+from src.local_agent.speculative import SPECULATIVE_RUNS
+from src.local_agent.llm_scheduler import LLM_SCHEDULER
+from src.local_agent.spill_store import collect_garbage
 from src.conversation_logger import log_conversation_summary
 from langchain_core.messages import HumanMessage
 
+logging.basicConfig(
+    level=os.getenv("DAVID_LOG_LEVEL", "INFO"),
+    format="%(asctime)s %(levelname)s %(name)s %(message)s",
+)
+logger = logging.getLogger("david.app")
+
 # Global state
-MODEL_LOAD_LOCK = asyncio.Lock()
-IS_MODEL_LOADED = False
 DAVID_GRAPH = None
+DAVID_READY = asyncio.Event()
+WARMUP_TASK = None
+WARMUP_ERROR = None
+POOL_MONITOR = None
+SESSION_MAINTENANCE = None
+MAINTENANCE_INTERVAL = 60
+
+async def maintain_sessions():
+    """Move idle sessions to disk and purge expired snapshots, once a minute."""
+    while True:
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
+        try:
+            SESSIONS.evict_idle(DAVID_GRAPH)
+            SESSIONS.purge_expired()
+        except Exception as e:
+            logger.warning("sessions.maintenance_failed error=%s", e)
+
+async def warm_up():
+    """Build the graph and load the model into every Ollama backend in parallel."""
+    global DAVID_GRAPH, WARMUP_ERROR, POOL_MONITOR, SESSION_MAINTENANCE
+    model_name = os.getenv("OLLAMA_MODEL", "qwen3:14b")
+    specs = backend_specs(model_name)
+    small_model = os.getenv("DAVID_SMALL_MODEL")
+    if small_model:
+        specs += [{"url": s["url"], "model": small_model} for s in specs]
+    start = time.perf_counter()
+    try:
+        graph_result, *model_results = await asyncio.gather(
+            asyncio.to_thread(create_agent_executor),
+            *(warm_up_model(s["model"], host=s["url"]) for s in specs),
+            return_exceptions=True,
+        )
+        if isinstance(graph_result, BaseException):
+            raise graph_result
+        for spec, model_result in zip(specs, model_results):
+            if isinstance(model_result, BaseException):
+                # Not fatal - the first request will load the model instead
+                logger.warning("warmup.model_failed model=%s host=%s error=%s",
+                               spec["model"], spec["url"], model_result)
+
+        DAVID_GRAPH, pool = graph_result
+        if len(pool.backends) > 1 and POOL_MONITOR is None:
+            POOL_MONITOR = asyncio.get_running_loop().create_task(pool.monitor())
+        if SESSION_MAINTENANCE is None:
+            SESSION_MAINTENANCE = asyncio.get_running_loop().create_task(maintain_sessions())
+        WARMUP_ERROR = None
+        logger.info("warmup.ready seconds=%.2f", time.perf_counter() - start)
+        print("🟢 David loaded successfully!")
+    except Exception as e:
+        WARMUP_ERROR = e
+        logger.exception("warmup.failed error=%s", e)
+    finally:
+        DAVID_READY.set()
+
+def ensure_warmup(retry: bool = False):
+    """Start warm-up once per process (again if `retry` and the last attempt failed)."""
+    global WARMUP_TASK
+    if WARMUP_TASK is None or (retry and WARMUP_TASK.done() and DAVID_GRAPH is None):
+        DAVID_READY.clear()
+        WARMUP_TASK = asyncio.get_running_loop().create_task(warm_up())
+    return WARMUP_TASK
+
+async def collect_spill_garbage():
+    """Delete spilled outputs orphaned by an earlier run that stopped before releasing them."""
+    try:
+        await asyncio.to_thread(collect_garbage)
+    except Exception as e:
+        logger.warning("spill.gc_failed error=%s", e)
+
+@cl.on_app_startup
+async def on_app_startup():
+    """Begin warming up as soon as the server starts."""
+    ensure_warmup()
+    asyncio.get_running_loop().create_task(collect_spill_garbage())
 
 @cl.on_chat_start
 async def on_chat_start():
-    """Initialize simplified David."""
-    global IS_MODEL_LOADED, DAVID_GRAPH
-    
-    async with MODEL_LOAD_LOCK:
-        if not IS_MODEL_LOADED:
-            loading_msg = cl.Message(content="🔄 Loading David...")
-            await loading_msg.send()
-            
-            try:
-                david_graph, llm_instance = create_agent_executor()
-                
-                # Test with simple message
-                test_config = {"configurable": {"thread_id": "preload"}}
-                test_response = await david_graph.ainvoke(
-                    {"messages": [HumanMessage(content="Hi")]}, 
-                    config=test_config
-                )
-
-                DAVID_GRAPH = david_graph
-                IS_MODEL_LOADED = True
-
-                print("🟢 David loaded successfully!")
-                await loading_msg.remove()
-            
-            except Exception as e:
-                print(f"❌ Error loading David: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                
-                await loading_msg.remove()
-                await cl.Message(content=f"❌ Error loading David: {str(e)}").send()
-                return
+    """Create the session right away - warm-up keeps running in the background."""
+    ensure_warmup()
     
-    # Create session
-    session_id = str(uuid.uuid4())
+    # Create session - keyed by the Chainlit thread so it can be resumed later
+    session_id = cl.context.session.thread_id
     cl.user_session.set("session_id", session_id)
     
-    if IS_MODEL_LOADED:
+    if DAVID_READY.is_set() and DAVID_GRAPH is not None:
         await cl.Message(content="🟢 David is ready! What can I help you with?").send()
+    else:
+        await cl.Message(content="🔄 David is still loading - go ahead and type, your first message will be answered as soon as he's ready.").send()
+
+@cl.on_chat_resume
+async def on_chat_resume(thread):
+    """Reattach to a previous thread - its state is restored from disk with the next message."""
+    ensure_warmup()
+    cl.user_session.set("session_id", thread["id"])
+
+async def wait_until_ready() -> bool:
+    """Hold a message until warm-up finishes. Returns False if David couldn't be loaded."""
+    if DAVID_GRAPH is not None:
+        return True
+    ensure_warmup(retry=True)
+    if not DAVID_READY.is_set():
+        waiting_msg = cl.Message(content="⏳ Still loading David - your message is queued...")
+        await waiting_msg.send()
+        await DAVID_READY.wait()
+        await waiting_msg.remove()
+    if DAVID_GRAPH is None:
+        await cl.Message(content=f"❌ Error loading David: {WARMUP_ERROR}").send()
+        return False
+    return True
 
 @cl.on_message
 async def on_message(message: cl.Message):
@@ -61,19 +141,22 @@ async def on_message(message: cl.Message):
     session_id = cl.user_session.get("session_id")
     config = {"configurable": {"thread_id": session_id}}
 
+    if not await wait_until_ready():
+        return
+
+    SESSIONS.begin(session_id, DAVID_GRAPH)
     try:
         # Prepare input
         graph_input = {"messages": [HumanMessage(content=message.content)]}
         
-        # Invoke David
-        result = await DAVID_GRAPH.ainvoke(graph_input, config=config)
+        # Invoke David - new messages reach the session history as each step finishes
+        history = get_or_create_session_history(session_id)
+        last_message = await astream_turn(DAVID_GRAPH, graph_input, config, history.record)
         
         # Extract response
         full_content = ""
-        if result and 'messages' in result:
-            last_message = result['messages'][-1]
-            if hasattr(last_message, 'content'):
-                full_content = last_message.content
+        if last_message is not None and hasattr(last_message, 'content'):
+            full_content = last_message.content
 
         # Send response
         if full_content:
@@ -84,7 +167,6 @@ async def on_message(message: cl.Message):
             await msg.send()
         
         # Log conversation
-        get_or_create_session_history(session_id, DAVID_GRAPH)
         log_conversation_summary(session_id)
         
     except Exception as e:
@@ -93,3 +175,23 @@ async def on_message(message: cl.Message):
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        SESSIONS.end(session_id)
+
+@cl.on_stop
+async def on_stop():
+    """Stop button - free this session's queued and running model requests."""
+    session_id = cl.user_session.get("session_id")
+    if session_id:
+        LLM_SCHEDULER.cancel_session(session_id)
+
+@cl.on_chat_end
+async def on_chat_end():
+    """Drop session-scoped approval grants and pending work; move the session's state to disk."""
+    session_id = cl.user_session.get("session_id")
+    if session_id:
+        APPROVAL_GRANTS.clear_session(session_id)
+        SPECULATIVE_RUNS.discard(session_id)
+        LLM_SCHEDULER.cancel_session(session_id)
+        if DAVID_GRAPH is not None:
+            SESSIONS.evict(session_id, DAVID_GRAPH)
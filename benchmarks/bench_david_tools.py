@@ -0,0 +1,306 @@
+# C:\David\benchmarks\bench_david_tools.py
+# Micro-benchmarks for the david_tools file and directory tools
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_david_tools.py                       # run, print table
+#   python benchmarks/bench_david_tools.py --save v1             # also write benchmarks/baselines/v1.json
+#   python benchmarks/bench_david_tools.py --compare v1          # diff against a saved baseline
+#   python benchmarks/bench_david_tools.py --scale 0.1 --only directory_size
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.local_agent import david_tools
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Tree shapes at scale 1.0 - everything is multiplied by --scale
+TREE_SHAPES = {
+    "wide": {"dirs": 1, "depth": 1, "files_per_dir": 5000, "file_size": 512},
+    "deep": {"dirs": 1, "depth": 200, "files_per_dir": 5, "file_size": 512},
+    "many_small": {"dirs": 20, "depth": 2, "files_per_dir": 25, "file_size": 128},
+    "huge": {"dirs": 1, "depth": 1, "files_per_dir": 3, "file_size": 64 * 1024 * 1024},
+}
+
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+         "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa"]
+
+
+# =============================================================================
+# SYNTHETIC TREES
+# =============================================================================
+
+def _text_block(rng: random.Random, size: int) -> bytes:
+    """Deterministic text payload of exactly `size` bytes."""
+    line = " ".join(rng.choice(WORDS) for _ in range(12)) + "\n"
+    chunk = (line * (4096 // len(line) + 1)).encode("utf-8")[:4096]
+    full, rest = divmod(size, len(chunk))
+    return chunk * full + chunk[:rest]
+
+
+def _write_dir(path: Path, rng: random.Random, files: int, size: int, payload_cache: dict) -> tuple:
+    path.mkdir(parents=True, exist_ok=True)
+    if size not in payload_cache:
+        payload_cache[size] = _text_block(rng, size)
+    payload = payload_cache[size]
+    for i in range(files):
+        with open(path / f"file_{i:05d}.txt", "wb") as f:
+            f.write(payload)
+    return files, files * size
+
+
+def build_tree(root: Path, shape: str, scale: float, seed: int) -> dict:
+    """Create one synthetic tree and return its file/byte totals."""
+    spec = TREE_SHAPES[shape]
+    rng = random.Random(f"{seed}:{shape}")
+    payload_cache = {}
+    file_count = 0
+    byte_count = 0
+
+    files_per_dir = max(1, int(spec["files_per_dir"] * (scale if shape != "huge" else 1)))
+    file_size = spec["file_size"] if shape != "huge" else max(1024 * 1024, int(spec["file_size"] * scale))
+    dirs = max(1, int(spec["dirs"] * (scale ** 0.5 if shape == "many_small" else 1)))
+    depth = max(1, int(spec["depth"] * (scale if shape == "deep" else 1)))
+
+    if shape == "deep":
+        current = root
+        for level in range(depth):
+            current = current / f"level_{level:03d}"
+            n, b = _write_dir(current, rng, files_per_dir, file_size, payload_cache)
+            file_count += n
+            byte_count += b
+    elif shape == "many_small":
+        for a in range(dirs):
+            for b_idx in range(dirs):
+                n, b = _write_dir(root / f"d{a:03d}" / f"d{b_idx:03d}", rng, files_per_dir, file_size, payload_cache)
+                file_count += n
+                byte_count += b
+    else:
+        n, b = _write_dir(root, rng, files_per_dir, file_size, payload_cache)
+        file_count += n
+        byte_count += b
+
+    return {"path": str(root), "files": file_count, "bytes": byte_count}
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def _time_call(fn, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _peak_memory(fn) -> int:
+    """Peak Python heap allocation of a single call, in bytes."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _check(result: str, tool_name: str) -> None:
+    if isinstance(result, str) and result.startswith("Error"):
+        raise RuntimeError(f"{tool_name} failed: {result[:200]}")
+
+
+def benchmark_cases(trees: dict) -> list:
+    """(case name, tool, args, files touched, bytes touched) for every benchmark."""
+    cases = []
+    for shape, info in trees.items():
+        if shape == "huge":
+            continue
+        cases.append((f"directory_size[{shape}]", david_tools.directory_size,
+                      {"path": info["path"]}, info["files"], info["bytes"]))
+        cases.append((f"directory_tree[{shape}]", david_tools.directory_tree,
+                      {"path": info["path"]}, info["files"], 0))
+        cases.append((f"file_search[{shape}]", david_tools.file_search,
+                      {"directory": info["path"], "pattern": "**/*.txt"}, info["files"], 0))
+
+    huge = trees.get("huge")
+    if huge:
+        first = str(sorted(Path(huge["path"]).glob("*.txt"))[0])
+        size = os.path.getsize(first)
+        cases.append(("file_hash[huge,md5]", david_tools.file_hash,
+                      {"path": first, "algorithm": "md5"}, 1, size))
+        cases.append(("file_hash[huge,sha256]", david_tools.file_hash,
+                      {"path": first, "algorithm": "sha256"}, 1, size))
+        cases.append(("read_file[huge]", david_tools.read_file, {"path": first}, 1, size))
+        # Same-length swap so repeated runs keep the file size stable
+        cases.append(("find_replace[huge]", david_tools.find_replace,
+                      {"path": first, "find": "alpha", "replace": "ALPHA"}, 1, size))
+
+    small = trees.get("wide")
+    if small:
+        first = str(sorted(Path(small["path"]).glob("*.txt"))[0])
+        size = os.path.getsize(first)
+        cases.append(("read_file[small]", david_tools.read_file, {"path": first}, 1, size))
+        cases.append(("file_hash[small,md5]", david_tools.file_hash,
+                      {"path": first, "algorithm": "md5"}, 1, size))
+        cases.append(("find_replace[small]", david_tools.find_replace,
+                      {"path": first, "find": "bravo", "replace": "BRAVO"}, 1, size))
+    return cases
+
+
+def run_case(name: str, tool_obj, args: dict, files: int, nbytes: int, repeat: int, memory: bool) -> dict:
+    """Time one tool invocation and derive throughput numbers."""
+    def call():
+        _check(tool_obj.invoke(args), name)
+
+    call()  # warm the page cache and the tool's schema
+    timings = _time_call(call, repeat)
+    median = statistics.median(timings)
+    result = {
+        "case": name,
+        "tool": tool_obj.name,
+        "repeat": repeat,
+        "median_s": median,
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "files": files,
+        "bytes": nbytes,
+        "files_per_s": files / median if median > 0 and files else None,
+        "mb_per_s": (nbytes / (1024 ** 2)) / median if median > 0 and nbytes else None,
+        "peak_mem_bytes": _peak_memory(call) if memory else None,
+    }
+    return result
+
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+
+def _git_revision() -> str:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=5)
+        return result.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def _fmt(value, pattern: str) -> str:
+    return pattern.format(value) if value is not None else "-"
+
+
+def print_table(results: list, baseline: dict = None) -> None:
+    base = {r["case"]: r for r in baseline["results"]} if baseline else {}
+    header = f"{'case':<28} {'median ms':>10} {'files/s':>12} {'MB/s':>9} {'peak MB':>9}"
+    if base:
+        header += f" {'vs base':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        line = (f"{r['case']:<28} {r['median_s'] * 1000:>10.2f} "
+                f"{_fmt(r['files_per_s'], '{:>12,.0f}'):>12} "
+                f"{_fmt(r['mb_per_s'], '{:>9.1f}'):>9} "
+                f"{_fmt(r['peak_mem_bytes'] and r['peak_mem_bytes'] / (1024 ** 2), '{:>9.2f}'):>9}")
+        if base:
+            old = base.get(r["case"])
+            if old and old["median_s"] > 0:
+                change = (r["median_s"] - old["median_s"]) / old["median_s"] * 100
+                line += f" {change:>+8.1f}%"
+            else:
+                line += f" {'new':>9}"
+        print(line)
+
+
+def load_baseline(name_or_path: str) -> dict:
+    path = Path(name_or_path)
+    if not path.suffix:
+        path = BASELINE_DIR / f"{name_or_path}.json"
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(name: str, payload: dict) -> Path:
+    BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+    path = BASELINE_DIR / f"{name}.json"
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark David's file and directory tools")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply tree sizes (default 1.0)")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for synthetic content")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (median reported)")
+    parser.add_argument("--shapes", default=",".join(TREE_SHAPES), help="Comma-separated tree shapes")
+    parser.add_argument("--only", default="", help="Only run cases whose name contains this string")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--workdir", default="", help="Build trees here instead of a temp dir (kept afterwards)")
+    parser.add_argument("--save", default="", help="Save results as benchmarks/baselines/<name>.json")
+    parser.add_argument("--compare", default="", help="Baseline name or JSON path to compare against")
+    args = parser.parse_args(argv)
+
+    shapes = [s.strip() for s in args.shapes.split(",") if s.strip()]
+    unknown = [s for s in shapes if s not in TREE_SHAPES]
+    if unknown:
+        parser.error(f"unknown shapes: {', '.join(unknown)}")
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="david_bench_"))
+    try:
+        print(f"Building synthetic trees in {workdir} (scale={args.scale}, seed={args.seed})")
+        trees = {}
+        for shape in shapes:
+            start = time.perf_counter()
+            trees[shape] = build_tree(workdir / shape, shape, args.scale, args.seed)
+            print(f"  {shape:<11} {trees[shape]['files']:>7,} files "
+                  f"{trees[shape]['bytes'] / (1024 ** 2):>9.1f} MB  ({time.perf_counter() - start:.1f}s)")
+
+        results = []
+        for case in benchmark_cases(trees):
+            if args.only and args.only not in case[0]:
+                continue
+            results.append(run_case(*case, repeat=args.repeat, memory=not args.no_memory))
+
+        baseline = load_baseline(args.compare) if args.compare else None
+        print()
+        print_table(results, baseline)
+
+        payload = {
+            "created": datetime.utcnow().isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "trees": {k: {"files": v["files"], "bytes": v["bytes"]} for k, v in trees.items()},
+            "results": results,
+        }
+        if args.save:
+            print(f"\nBaseline saved to {save_baseline(args.save, payload)}")
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
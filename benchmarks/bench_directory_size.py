@@ -0,0 +1,89 @@
+# C:\David\benchmarks\bench_directory_size.py
+# Directory sizing benchmark - disk_usage.measure vs. the os.walk + getsize it replaced
+#
+# Generates a synthetic tree (top-level packages, nested folders, small files, some hard
+# links) in a temporary directory and times a full sizing pass with each approach. Both
+# directory caches are warm after the first run, so the numbers measure per-entry overhead.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_directory_size.py
+#   python benchmarks/bench_directory_size.py --top 20 --depth 3 --files 50 --workers 1 8
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.local_agent.disk_usage import measure  # noqa: E402
+
+
+def build_tree(root: Path, top: int, depth: int, fanout: int, files: int) -> int:
+    count = 0
+    payload = b"x" * 1500
+
+    def fill(folder: Path, level: int) -> None:
+        nonlocal count
+        folder.mkdir(parents=True, exist_ok=True)
+        for f in range(files):
+            (folder / f"file_{f:03d}.txt").write_bytes(payload)
+            count += 1
+        os.link(folder / "file_000.txt", folder / "hardlink.txt")
+        count += 1
+        if level < depth:
+            for d in range(fanout):
+                fill(folder / f"sub_{d}", level + 1)
+
+    for t in range(top):
+        fill(root / f"package_{t:02d}", 1)
+    return count
+
+
+def walk_getsize(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(dirpath, name))
+               for dirpath, _, filenames in os.walk(path) for name in filenames)
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark directory sizing")
+    parser.add_argument("--top", type=int, default=10, help="Top-level folders")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--files", type=int, default=40, help="Files per folder")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        count = build_tree(Path(tmp), args.top, args.depth, args.fanout, args.files)
+        walk_getsize(tmp)  # warm the directory cache
+        baseline = timed(lambda: walk_getsize(tmp), args.repeat)
+        print(f"{count:,} files\n")
+        print(f"{'method':<24} {'median s':>9} {'entries/s':>11} {'speedup':>8}")
+        print(f"{'os.walk + getsize':<24} {baseline:>9.3f} {count / baseline:>11,.0f} {1.0:>7.1f}x")
+        for workers in args.workers:
+            seconds = timed(lambda: measure(tmp, workers=workers), args.repeat)
+            print(f"{f'measure workers={workers}':<24} {seconds:>9.3f} {count / seconds:>11,.0f} "
+                  f"{baseline / seconds:>7.1f}x")
+        usage = measure(tmp)
+        print(f"\nwalk+getsize total {walk_getsize(tmp):,} bytes, measure total {usage.bytes:,} bytes "
+              f"({usage.hardlinks_skipped:,} hard links counted once)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
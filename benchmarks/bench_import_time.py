@@ -0,0 +1,102 @@
+# C:\David\benchmarks\bench_import_time.py
+# Import/startup-time benchmark for the tool modules
+#
+# Every measurement runs in a fresh interpreter so module caches don't leak between runs.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_import_time.py
+#   python benchmarks/bench_import_time.py --repeat 10 --save imports-v2 --compare imports-v1
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# name -> code whose wall time is measured (after interpreter start-up)
+STAGES = {
+    "import david_tools": "import src.local_agent.david_tools",
+    "import agent": "import src.local_agent.agent",
+    "agent + build tools": (
+        "import src.local_agent.agent as a\n"
+        "a.get_david_tools()"
+    ),
+    "optional deps (deferred)": (
+        "for name in ('psutil', 'requests', 'pyautogui'):\n"
+        "    try:\n"
+        "        __import__(name)\n"
+        "    except Exception:\n"
+        "        pass"
+    ),
+}
+
+TIMER = (
+    "import time, warnings\n"
+    "warnings.simplefilter('ignore')\n"
+    "_t = time.perf_counter()\n"
+    "{code}\n"
+    "print(time.perf_counter() - _t)\n"
+)
+
+
+def time_stage(code: str) -> float:
+    result = subprocess.run([sys.executable, "-c", TIMER.format(code=code)], cwd=REPO_ROOT,
+                            capture_output=True, text=True, timeout=300)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "stage failed")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure import and tool-build time")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per stage (median reported)")
+    parser.add_argument("--save", default="", help="Save results as benchmarks/baselines/<name>.json")
+    parser.add_argument("--compare", default="", help="Baseline name or JSON path to compare against")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        path = Path(args.compare)
+        if not path.suffix:
+            path = BASELINE_DIR / f"{args.compare}.json"
+        with path.open("r", encoding="utf-8") as f:
+            baseline = {r["stage"]: r for r in json.load(f)["results"]}
+
+    results = []
+    print(f"{'stage':<26} {'median ms':>10} {'min ms':>9}" + (f" {'vs base':>9}" if baseline else ""))
+    for stage, code in STAGES.items():
+        try:
+            timings = [time_stage(code) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{stage:<26} failed: {e}")
+            continue
+        median = statistics.median(timings)
+        results.append({"stage": stage, "median_s": median, "min_s": min(timings), "repeat": args.repeat})
+        line = f"{stage:<26} {median * 1000:>10.1f} {min(timings) * 1000:>9.1f}"
+        old = baseline.get(stage)
+        if old and old["median_s"] > 0:
+            line += f" {(median - old['median_s']) / old['median_s'] * 100:>+8.1f}%"
+        print(line)
+
+    if args.save:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        with path.open("w", encoding="utf-8") as f:
+            json.dump({
+                "created": datetime.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            }, f, indent=2)
+        print(f"\nBaseline saved to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# C:\David\benchmarks\bench_model_pool.py
+# Model pool benchmark against several mock Ollama servers on local ports
+#
+# Starts one mock server per --speeds entry (tokens/s), sends --requests chat calls with
+# --concurrency in flight through ModelPool, and reports how each routing strategy spread
+# the load. --kill-after N takes the first server down after N requests to show failover.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_model_pool.py
+#   python benchmarks/bench_model_pool.py --speeds 120,60,15 --requests 60 --concurrency 6 --kill-after 20
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_ollama import MockOllama  # noqa: E402
+from src.local_agent.model_pool import Backend, ModelPool  # noqa: E402
+
+MODEL = "qwen3:14b"
+
+
+async def run_strategy(strategy: str, mocks, args) -> dict:
+    from langchain_ollama import ChatOllama
+    from langchain_core.messages import HumanMessage
+
+    for mock in mocks:
+        mock.requests, mock.down = 0, False
+    pool = ModelPool([Backend(m.url, MODEL, 1, ChatOllama(model=MODEL, base_url=m.url)) for m in mocks],
+                     strategy=strategy)
+    await pool.check_health()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, failures, done = [], 0, 0
+
+    async def one(i: int):
+        nonlocal failures, done
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await pool.ainvoke([HumanMessage(content=f"request {i}")])
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                failures += 1
+            done += 1
+            if args.kill_after and done == args.kill_after:
+                mocks[0].down = True
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    wall = time.perf_counter() - start
+    return {
+        "strategy": strategy,
+        "wall_s": wall,
+        "p50_s": statistics.median(latencies) if latencies else 0.0,
+        "max_s": max(latencies) if latencies else 0.0,
+        "failures": failures,
+        "per_backend": [m.requests for m in mocks],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ModelPool routing against mock Ollama servers")
+    parser.add_argument("--speeds", default="120,60,20", help="Comma-separated tokens/s, one mock server each")
+    parser.add_argument("--base-port", type=int, default=11501)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--tokens", type=int, default=30, help="Tokens per response")
+    parser.add_argument("--kill-after", type=int, default=0, help="Take the first server down after N requests")
+    parser.add_argument("--strategies", default="least_outstanding,throughput")
+    args = parser.parse_args(argv)
+
+    speeds = [float(s) for s in args.speeds.split(",")]
+    mocks = [MockOllama(args.base_port + i, MODEL, tps, args.tokens).start() for i, tps in enumerate(speeds)]
+    try:
+        print(f"{'strategy':<18} {'wall s':>7} {'p50 s':>6} {'max s':>6} {'fail':>5}  requests per backend "
+              f"({', '.join(f'{s:g} tok/s' for s in speeds)})")
+        for strategy in args.strategies.split(","):
+            r = asyncio.run(run_strategy(strategy, mocks, args))
+            print(f"{r['strategy']:<18} {r['wall_s']:>7.2f} {r['p50_s']:>6.2f} {r['max_s']:>6.2f} "
+                  f"{r['failures']:>5}  {r['per_backend']}")
+    finally:
+        for mock in mocks:
+            mock.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
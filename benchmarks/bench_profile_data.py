@@ -0,0 +1,67 @@
+# C:\David\benchmarks\bench_profile_data.py
+# Data profiling benchmark - NumPy vs. pure-Python accumulators, and a cached repeat
+#
+# Generates a CSV with numeric, text and partly-null columns in a temporary directory, profiles
+# it with each engine and then asks again through the content-hash cache.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_profile_data.py
+#   python benchmarks/bench_profile_data.py --rows 500000 --repeat 3
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.local_agent.data_profile import ProfileCache, cached_profile, profile_file  # noqa: E402
+
+
+def build_csv(path: Path, rows: int) -> None:
+    rng = random.Random(1)
+    cities = ["Oslo", "Rome", "Lima", "Pune", "Kyiv"]
+    with open(path, "w", newline="") as f:
+        f.write("id,price,quantity,city,comment\n")
+        for i in range(rows):
+            price = "" if i % 40 == 0 else f"{rng.gauss(100, 15):.2f}"
+            f.write(f"{i},{price},{rng.randint(1, 20)},{rng.choice(cities)},{'NA' if i % 9 else 'ok'}\n")
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark data profiling")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.csv"
+        build_csv(path, args.rows)
+        print(f"{args.rows:,} rows, {path.stat().st_size / 1e6:.1f} MB\n")
+        print(f"{'method':<16} {'median s':>9} {'rows/s':>11} {'speedup':>8}")
+        baseline = timed(lambda: profile_file(str(path), use_numpy=False), args.repeat)
+        print(f"{'python':<16} {baseline:>9.3f} {args.rows / baseline:>11,.0f} {1.0:>7.1f}x")
+        seconds = timed(lambda: profile_file(str(path)), args.repeat)
+        print(f"{'numpy':<16} {seconds:>9.3f} {args.rows / seconds:>11,.0f} {baseline / seconds:>7.1f}x")
+        cache = ProfileCache(path=str(Path(tmp) / "profiles.sqlite"))
+        cached_profile(str(path), cache=cache)
+        seconds = timed(lambda: cached_profile(str(path), cache=cache), args.repeat)
+        print(f"{'cached':<16} {seconds:>9.3f} {args.rows / seconds:>11,.0f} {baseline / seconds:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
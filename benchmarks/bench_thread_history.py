@@ -0,0 +1,95 @@
+# C:\David\benchmarks\bench_thread_history.py
+# Thread-history paging benchmark - ThreadStore range reads vs. decoding a whole checkpoint
+#
+# Builds a synthetic thread (user turns, tool calls, tool results), stores it in a temporary
+# ThreadStore and times tail/page reads against deserializing the full message list the way a
+# persistent checkpointer would. Also reports the on-disk size of both encodings.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_thread_history.py
+#   python benchmarks/bench_thread_history.py --messages 20000 --repeat 50
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, message_to_dict  # noqa: E402
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer  # noqa: E402
+
+from src.local_agent.thread_store import ThreadStore  # noqa: E402
+
+TOOLS = ["read_file", "list_directory", "execute_command", "file_search", "system_info"]
+
+
+def synthetic_thread(n: int) -> list:
+    messages = []
+    i = 0
+    while len(messages) < n:
+        tool = TOOLS[i % len(TOOLS)]
+        call_id = f"call_{i}"
+        messages.append(HumanMessage(content=f"Please run step {i} on C:\\David\\src\\module_{i % 40}.py", id=f"h{i}"))
+        messages.append(AIMessage(content="", id=f"a{i}", tool_calls=[
+            {"name": tool, "args": {"path": f"C:\\David\\src\\module_{i % 40}.py"}, "id": call_id}]))
+        messages.append(ToolMessage(content=("line of output " * 30) + str(i), name=tool, tool_call_id=call_id,
+                                    id=f"t{i}"))
+        messages.append(AIMessage(content=f"Step {i} is done. " * 5, id=f"r{i}"))
+        i += 1
+    return messages[:n]
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark thread-history paging")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--page", type=int, default=20, help="Messages per page read")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    messages = synthetic_thread(args.messages)
+    serde = JsonPlusSerializer()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "threads.sqlite"
+        store = ThreadStore(db_path)
+        start = time.perf_counter()
+        store.append("bench", messages)
+        write_s = time.perf_counter() - start
+
+        full_type, full_blob = serde.dumps_typed(messages)
+        cold = ThreadStore(db_path)  # fresh connection and string table, as after a restart
+        results = [
+            ("tail (cold store)", timed(lambda: ThreadStore(db_path).tail("bench", args.page), args.repeat)),
+            ("tail", timed(lambda: cold.tail("bench", args.page), args.repeat)),
+            ("page (middle)", timed(lambda: cold.page("bench", args.messages // 2, args.messages // 2 + args.page),
+                                    args.repeat)),
+            ("full checkpoint decode", timed(lambda: serde.loads_typed((full_type, full_blob)), max(3, args.repeat // 5))),
+        ]
+
+        stored_bytes = sum(len(store.encode(m)) for m in messages)
+        json_bytes = sum(len(json.dumps(message_to_dict(m))) for m in messages)
+        print(f"{args.messages} messages, written in {write_s * 1000:.0f} ms\n")
+        print(f"{'read':<24} {'median ms':>10}")
+        for name, seconds in results:
+            print(f"{name:<24} {seconds * 1000:>10.2f}")
+        print(f"\nmsgpack rows: {stored_bytes / 1024:.0f} KiB   JSON messages: {json_bytes / 1024:.0f} KiB   "
+              f"checkpoint blob: {len(full_blob) / 1024:.0f} KiB")
+        print(f"shared strings: {store.stats()['shared_strings']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# C:\David\benchmarks\mock_ollama.py
+# Minimal fake Ollama server for exercising the model pool without GPUs
+#
+# Implements /api/tags, /api/generate (warm-up) and /api/chat, streamed or not, generating
+# a fixed number of tokens at a configurable rate. Several can run side by side on different ports.
+#
+# Usage (from the repo root):
+#   python benchmarks/mock_ollama.py --port 11501 --tokens-per-second 80
+#   python benchmarks/mock_ollama.py --port 11502 --tokens-per-second 20 --fail-rate 0.1
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockOllama:
+    """Settings of one mock server; start() serves it on a background thread."""
+
+    def __init__(self, port: int, model: str = "qwen3:14b", tokens_per_second: float = 50.0,
+                 tokens: int = 40, latency: float = 0.05, fail_rate: float = 0.0):
+        self.port = port
+        self.model = model
+        self.tokens_per_second = tokens_per_second
+        self.tokens = tokens
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.requests = 0
+        self.down = False
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "MockOllama":
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _handler_for(self))
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _handler_for(mock: MockOllama):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _json(self, status: int, body: dict) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if mock.down:
+                return self._json(503, {"error": "server down"})
+            if self.path == "/api/tags":
+                return self._json(200, {"models": [{"name": mock.model, "model": mock.model}]})
+            self._json(404, {"error": "not found"})
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if mock.down or random.random() < mock.fail_rate:
+                return self._json(500, {"error": "mock failure"})
+            if self.path == "/api/generate":
+                return self._json(200, {"model": mock.model, "created_at": _now(), "response": "",
+                                        "done": True, "done_reason": "load"})
+            if self.path != "/api/chat":
+                return self._json(404, {"error": "not found"})
+            mock.requests += 1
+            start = time.perf_counter()
+            time.sleep(mock.latency)
+            final = {"model": mock.model, "created_at": _now(), "done": True, "done_reason": "stop",
+                     "message": {"role": "assistant", "content": ""},
+                     "prompt_eval_count": 10, "eval_count": mock.tokens}
+            if not body.get("stream", True):
+                time.sleep(mock.tokens / mock.tokens_per_second)
+                final["message"]["content"] = "tok " * mock.tokens
+                final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+                return self._json(200, final)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for _ in range(mock.tokens):
+                time.sleep(1 / mock.tokens_per_second)
+                self._chunk({"model": mock.model, "created_at": _now(), "done": False,
+                             "message": {"role": "assistant", "content": "tok "}})
+            final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+            self._chunk(final)
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _chunk(self, body: dict) -> None:
+            data = json.dumps(body).encode("utf-8") + b"\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server")
+    parser.add_argument("--port", type=int, default=11501)
+    parser.add_argument("--model", default="qwen3:14b")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--tokens", type=int, default=40, help="Tokens generated per chat request")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before the first token")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    args = parser.parse_args(argv)
+    mock = MockOllama(args.port, args.model, args.tokens_per_second, args.tokens, args.latency, args.fail_rate)
+    mock.start()
+    print(f"Mock Ollama serving {args.model} on {mock.url} - Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
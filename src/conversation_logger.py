@@ -4,13 +4,24 @@ import os
 
 from src.local_agent.agent import session_histories
 
-# Track which sessions already have files created
-_session_files = {}
+def _role(message) -> str:
+    # Handle both LangChain and LangGraph message types
+    if hasattr(message, 'type'):
+        return "User" if message.type == "human" else "AI"
+    if hasattr(message, '__class__'):
+        class_name = message.__class__.__name__
+        if 'Human' in class_name:
+            return "User"
+        if 'AI' in class_name:
+            return "AI"
+        return "System"
+    return "Unknown"
 
 def log_conversation_summary(session_id: str, conversations_dir: str = "Conversations") -> None:
     """Log conversation to individual session file - one file per session.
 
-    Creates ONE file per session and appends all messages to that same file.
+    Creates ONE file per session and appends the messages added since the last call,
+    so each turn costs O(new messages) rather than rewriting the whole conversation.
     
     Args:
         session_id: The unique session identifier
@@ -20,72 +31,42 @@ def log_conversation_summary(session_id: str, conversations_dir: str = "Conversa
     if history is None:
         return
 
-    # Update from LangGraph state before logging
-    if hasattr(history, 'update_from_graph'):
-        history.update_from_graph()
+    first_index = history.logged + 1
+    new_messages = history.take_new()
+    if not new_messages:
+        return
 
     # Create conversations directory if it doesn't exist
     conversations_path = Path(conversations_dir)
     conversations_path.mkdir(exist_ok=True)
 
     # Check if we already have a file for this session
-    if session_id not in _session_files:
+    if history.log_path is None:
         # First time logging this session - create new file
         timestamp = datetime.utcnow().strftime("%Y-%m-%d_%H-%M-%S")
         short_session = session_id[:8]
         filename = f"{timestamp}_session-{short_session}.txt"
-        file_path = conversations_path / filename
-        _session_files[session_id] = file_path
+        history.log_path = conversations_path / filename
         
         # Write session header
-        with file_path.open("w", encoding="utf-8") as f:
+        with history.log_path.open("w", encoding="utf-8") as f:
             f.write(f"Session ID: {session_id}\n")
             f.write(f"Started: {timestamp}\n")
             f.write("="*50 + "\n\n")
-    else:
-        # Use existing file for this session
-        file_path = _session_files[session_id]
 
-    # Append current conversation state (overwrite content section)
+    # Append the new messages
     lines = []
-    for i, message in enumerate(history.messages, 1):
-        # Handle both LangChain and LangGraph message types
-        if hasattr(message, 'type'):
-            role = "User" if message.type == "human" else "AI"
-        elif hasattr(message, '__class__'):
-            class_name = message.__class__.__name__
-            if 'Human' in class_name:
-                role = "User"
-            elif 'AI' in class_name:
-                role = "AI"
-            else:
-                role = "System"
-        else:
-            role = "Unknown"
-            
+    for i, message in enumerate(new_messages, first_index):
         content = getattr(message, 'content', str(message))
-        lines.append(f"[{i:03d}] {role}: {content}")
+        lines.append(f"[{i:03d}] {_role(message)}: {content}")
         lines.append("")
-
-    # Read existing header and rewrite with updated conversation
-    with file_path.open("r", encoding="utf-8") as f:
-        header_lines = []
-        for line in f:
-            header_lines.append(line.rstrip())
-            if line.strip() == "="*50:
-                break
-    
-    # Write header + updated conversation
-    with file_path.open("w", encoding="utf-8") as f:
-        f.write("\n".join(header_lines) + "\n\n")
-        f.write(f"Messages: {len(history.messages)}\n")
-        f.write(f"Last Updated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write("\n".join(lines))
+    with history.log_path.open("a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
 
     # Also append to legacy log for backward compatibility
     legacy_log_path = Path("conversation_logs.txt")
-    summary = " | ".join([f"{role}: {getattr(msg, 'content', str(msg))[:50]}..." 
-                         for msg in history.messages[-1:]])  # Only last message
+    summary = " | ".join([f"{_role(msg)}: {getattr(msg, 'content', str(msg))[:50]}..." 
+                         for msg in new_messages[-1:]])  # Only last message
     timestamp_iso = datetime.utcnow().isoformat()
     log_entry = f"{timestamp_iso} - Session {session_id} - {summary}\n"
 
@@ -2,18 +2,37 @@
 # Simple David with approval system - no consciousness complexity
 
 import os
+import json
+import logging
+import time
+from collections import OrderedDict
 from typing import Annotated, Literal, Dict, List, Any
-from langchain_ollama import ChatOllama
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+import chainlit as cl
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
 from langchain_core.tools import tool
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END, add_messages
 from langgraph.prebuilt import ToolNode
-from langgraph.checkpoint.memory import MemorySaver
 from typing_extensions import TypedDict
-from .david_tools import DAVID_TOOLS
+from .david_tools import available_tools
+from .tool_registry import materialize
+from .tool_cache import BROAD_INVALIDATIONS, MUTATING_TOOLS, TOOL_CACHE, with_tool_cache
+from .approval_policy import get_policy, format_approval_message
+from .approval_grants import APPROVAL_GRANTS, APPROVAL_HELP
+from .result_compaction import compact_tool_output
+from .spill_store import release_thread
+from .speculative import SPECULATIVE_RUNS, speculation_enabled, speculative_calls
+from .llm_scheduler import LLM_SCHEDULER, request_priority
+from .model_pool import ModelPool, get_active_pool, set_active_pool
+from .model_router import LARGE, ROUTER_STATS, SMALL, route_turn
+from .llm_cache import LLM_CACHE, CachedModel, llm_cache_enabled
+from .thread_store import THREAD_STORE, MessageLogSaver
+from .session_context import get_session_context, session_id_from_config, session_scope
 
-# Global checkpointer for memory persistence
-checkpointer = MemorySaver()
+logger = logging.getLogger(__name__)
+
+# Global checkpointer for memory persistence - also keeps a pageable message log on disk (thread_store)
+checkpointer = MessageLogSaver()
 
 # Simple system prompt
 SIMPLE_PROMPT = """You are David, an AI assistant that helps Ben with coding and system tasks. 
@@ -25,6 +44,7 @@ Be helpful, direct, and use tools when needed to accomplish tasks."""
 class DavidState(TypedDict):
     messages: Annotated[list, add_messages]
     approval_status: str
+    route: str
 
 # Tool Definitions
 @tool
@@ -35,7 +55,12 @@ def get_status() -> dict:
         "model_name": model,
         "temperature": 0.6,
         "context_window": 8192,
-        "status": "operational"
+        "status": "operational",
+        "tool_cache": TOOL_CACHE.stats(),
+        "llm_scheduler": LLM_SCHEDULER.stats(),
+        "model_pool": get_active_pool().stats() if get_active_pool() else None,
+        "router": ROUTER_STATS.stats(),
+        "llm_cache": LLM_CACHE.stats() if llm_cache_enabled() else None
     }
 
 @tool  
@@ -43,200 +68,171 @@ def david_memory_check(query: str = "") -> str:
     """Check David's memory or conversation context."""
     return f"Memory system operational. Context query: {query if query else 'general status'}"
 
-# Available tools for David  
-david_tools = [get_status, david_memory_check] + DAVID_TOOLS
-tool_node = ToolNode(david_tools)
+# Available tools for David - the LangChain tools and their schemas are built on
+# first use (see tool_registry), so importing this module stays cheap
+_david_tools = None
+_tool_node = None
+
+def get_david_tools() -> list:
+    """All of David's tools, built and wrapped with the result cache."""
+    global _david_tools, _tool_node
+    if _david_tools is None:
+        tools = with_tool_cache(materialize([get_status, david_memory_check] + available_tools()))
+        _tool_node = ToolNode(tools)
+        _david_tools = tools
+    return _david_tools
+
+def get_tool_node() -> ToolNode:
+    get_david_tools()
+    return _tool_node
+
+def has_side_effects(tool_name: str) -> bool:
+    """True for tools whose results describe a change they made (writes, commands, service control)."""
+    return (tool_name in MUTATING_TOOLS or tool_name in BROAD_INVALIDATIONS
+            or get_policy().risk_of(tool_name) is not None)
+
+def current_request_id(messages: list):
+    """Id of the latest human message - a plan approval lasts until the next one."""
+    for msg in reversed(messages):
+        if isinstance(msg, HumanMessage):
+            return msg.id
+    return None
 
 def create_agent_executor():
     """Create simple David with approval system."""
     
-    # Initialize LLM
+    # Initialize LLM - one ChatOllama per configured backend (see model_pool)
     model_name = os.getenv("OLLAMA_MODEL", "qwen3:14b")
-    llm = ChatOllama(
-        model=model_name,
-        temperature=0.6,
-        top_p=0.95,
-        top_k=20,
-        num_ctx=8192,
-    )
+    params = dict(temperature=0.6, top_p=0.95, top_k=20, num_ctx=8192)
+    if os.getenv("DAVID_LLM_SEED"):
+        params["seed"] = int(os.getenv("DAVID_LLM_SEED"))  # reproducible sampling - makes answers cacheable
+    llm = ModelPool.from_env(model_name, **params)
+    set_active_pool(llm)
+    LLM_SCHEDULER.max_in_flight = llm.capacity
     
     # Bind tools to LLM
-    david_with_tools = llm.bind_tools(david_tools)
+    david_with_tools = llm.bind_tools(get_david_tools())
+    if llm_cache_enabled():
+        david_with_tools = CachedModel(david_with_tools, [b.model for b in llm.backends], params,
+                                       get_david_tools(), has_side_effects)
+    tool_node = get_tool_node()
     
-    def david_agent(state: DavidState):
+    # Optional small model for trivial turns - no tools bound (see model_router)
+    small_model = os.getenv("DAVID_SMALL_MODEL")
+    small_llm = ModelPool.from_env(model_name, model=small_model, temperature=0.6, num_ctx=8192) if small_model else None
+    
+    async def router_node(state: DavidState, config: RunnableConfig):
+        """Pick the model tier for this turn."""
+        route = await route_turn(state["messages"], small_llm, session_id_from_config(config))
+        return {"route": route}
+    
+    async def david_agent(state: DavidState, config: RunnableConfig):
         """Simple David agent with tools."""
         messages = state["messages"]
+        priority = request_priority(messages)
+        session_id = session_id_from_config(config)
         
         # Add system prompt if not present
         if not any(isinstance(msg, SystemMessage) for msg in messages):
             messages = [SystemMessage(content=SIMPLE_PROMPT)] + messages
         
-        response = david_with_tools.invoke(messages)
+        if state.get("route") == SMALL and small_llm is not None:
+            start = time.perf_counter()
+            try:
+                async with LLM_SCHEDULER.slot(session_id, priority):
+                    response = await small_llm.ainvoke(messages)
+                ROUTER_STATS.record_latency(SMALL, time.perf_counter() - start)
+                # One small answer per turn - anything after it goes to the large model
+                return {"messages": [response], "route": LARGE}
+            except Exception as e:
+                ROUTER_STATS.fallbacks += 1
+                logger.warning("router.small_failed error=%s - falling back to the large model", e)
+        
+        # Wait for a free Ollama slot - shared fairly between sessions
+        start = time.perf_counter()
+        async with LLM_SCHEDULER.slot(session_id, priority):
+            response = await david_with_tools.ainvoke(messages)
+        ROUTER_STATS.record_latency(LARGE, time.perf_counter() - start)
         return {"messages": [response]}
 
-    async def approval_node(state: DavidState):
+    async def approval_node(state: DavidState, config: RunnableConfig):
         """Check if operations need approval and get human consent for dangerous operations"""
-        print("🔍 APPROVAL NODE CALLED - CHECKING TOOLS")  # DEBUG
         last_message = state["messages"][-1]
         
         if not (hasattr(last_message, 'tool_calls') and last_message.tool_calls):
             return {"approval_status": "approved"}  # No tools to approve
         
-        def resolve_path(path: str) -> str:
-            """Resolve relative paths to C:\David default"""
-            import os
-            if not os.path.isabs(path):
-                return os.path.join("C:\\David", path)
-            return path
-        
-        def is_outside_david_dir(path: str) -> bool:
-            """Check if resolved path is outside C:\David"""
-            resolved = resolve_path(path)
-            return not resolved.startswith("C:\\David")
-        
-        # Check each tool call for danger level and location
-        dangerous_operations = []
-        medium_risk_operations = []
-        outside_david_operations = []
-        
-        for tool_call in last_message.tool_calls:
-            tool_name = tool_call.get('name', '')
-            
-            # Check if operation involves paths outside C:\David
-            if 'args' in tool_call:
-                for key, value in tool_call['args'].items():
-                    if key in ['path', 'source', 'destination', 'working_dir'] and isinstance(value, str):
-                        if is_outside_david_dir(value):
-                            outside_david_operations.append((tool_call, key, value))
-            
-            # High risk operations
-            if tool_name in ['delete_file', 'execute_command', 'execute_command_confirmed', 
-                           'kill_process', 'start_process', 'execute_powershell', 'execute_batch',
-                           'delete_directory', 'registry_write', 'start_service', 'stop_service',
-                           'restart_service', 'set_environment_variable', 'click_coordinates',
-                           'type_text', 'key_combination', 'create_scheduled_task', 
-                           'delete_scheduled_task']:
-                dangerous_operations.append(tool_call)
-            # Medium risk operations 
-            elif tool_name in ['write_file', 'append_file', 'edit_line', 'find_replace',
-                             'file_permissions', 'copy_file', 'move_file', 'copy_directory',
-                             'move_directory', 'screenshot', 'sqlite_query', 'sqlite_create_table',
-                             'create_zip', 'extract_zip']:
-                medium_risk_operations.append(tool_call)
+        policy = get_policy()
+        session_id = session_id_from_config(config)
+        base = get_session_context(session_id).cwd
+        classification = policy.classify(last_message.tool_calls, base)
         
         # Auto-approve safe operations within C:\David
-        if not dangerous_operations and not medium_risk_operations and not outside_david_operations:
+        if not classification.needs_approval:
             return {"approval_status": "approved"}
         
-        # Print details and request approval
-        print("\n" + "="*50)
-        print("🚨 APPROVAL REQUIRED 🚨")
-        print("="*50)
-        
-        if outside_david_operations:
-            print("OPERATIONS OUTSIDE C:\\DAVID:")
-            for tool_call, key, value in outside_david_operations:
-                resolved = resolve_path(value)
-                print(f"  • {tool_call.get('name', 'unknown')}")
-                print(f"    {key}: {value} → {resolved}")
-            print()
-        
-        if dangerous_operations:
-            print("HIGH RISK OPERATIONS:")
-            for tool_call in dangerous_operations:
-                print(f"  • {tool_call.get('name', 'unknown')}")
-                if 'args' in tool_call:
-                    for key, value in tool_call['args'].items():
-                        if isinstance(value, str) and key in ['path', 'source', 'destination']:
-                            resolved = resolve_path(value)
-                            print(f"    {key}: {value} → {resolved}")
-                        else:
-                            print(f"    {key}: {value}")
-                print()
-        
-        if medium_risk_operations:
-            print("MEDIUM RISK OPERATIONS:")
-            for tool_call in medium_risk_operations:
-                print(f"  • {tool_call.get('name', 'unknown')}")
-                if 'args' in tool_call:
-                    for key, value in tool_call['args'].items():
-                        if isinstance(value, str) and key in ['path', 'source', 'destination']:
-                            resolved = resolve_path(value)
-                            print(f"    {key}: {value} → {resolved}")
-                        else:
-                            print(f"    {key}: {value}")
-                print()
+        # Skip the prompt for calls covered by a plan approval, session grant or allow-rule
+        request_id = current_request_id(state["messages"])
+        classification = APPROVAL_GRANTS.filter(session_id, request_id, classification, policy, base)
+        if not classification.needs_approval:
+            logger.info("approval.decision status=approved reason=granted")
+            return {"approval_status": "approved"}
         
-        print("="*50)
+        logger.info("approval.required %s", json.dumps(classification.summary()))
         
-        # Use Chainlit for UI approval
-        import chainlit as cl
+        # Overlap the wait for a human with the batch's read-only I/O
+        if speculation_enabled():
+            SPECULATIVE_RUNS.start(session_id, last_message.id,
+                                   speculative_calls(last_message.tool_calls, policy, base, classification),
+                                   tool_node.tools_by_name)
         
         try:
-            # Build approval message
-            approval_details = []
-            if outside_david_operations:
-                approval_details.append("**OPERATIONS OUTSIDE C:\\DAVID:**")
-                for tool_call, key, value in outside_david_operations:
-                    resolved = resolve_path(value)
-                    approval_details.append(f"• {tool_call.get('name', 'unknown')}: {key} = {value} → {resolved}")
-            
-            if dangerous_operations:
-                approval_details.append("**HIGH RISK OPERATIONS:**")
-                for tool_call in dangerous_operations:
-                    tool_name = tool_call.get('name', 'unknown')
-                    if 'args' in tool_call:
-                        args_text = []
-                        for key, value in tool_call['args'].items():
-                            if isinstance(value, str) and key in ['path', 'source', 'destination', 'command']:
-                                resolved = resolve_path(value) if key != 'command' else value
-                                args_text.append(f"{key}: {resolved}")
-                            else:
-                                args_text.append(f"{key}: {value}")
-                        approval_details.append(f"• **{tool_name}** - {', '.join(args_text)}")
-                    else:
-                        approval_details.append(f"• **{tool_name}**")
-            
-            if medium_risk_operations:
-                approval_details.append("**MEDIUM RISK OPERATIONS:**")
-                for tool_call in medium_risk_operations:
-                    tool_name = tool_call.get('name', 'unknown')
-                    if 'args' in tool_call:
-                        args_text = []
-                        for key, value in tool_call['args'].items():
-                            if isinstance(value, str) and key in ['path', 'source', 'destination']:
-                                resolved = resolve_path(value)
-                                args_text.append(f"{key}: {resolved}")
-                            else:
-                                args_text.append(f"{key}: {value}")
-                        approval_details.append(f"• **{tool_name}** - {', '.join(args_text)}")
-                    else:
-                        approval_details.append(f"• **{tool_name}**")
-            
-            approval_message = "⚠️ **APPROVAL REQUIRED** ⚠️\n\n" + "\n".join(approval_details) + "\n\n**Approve these operations?**"
-            
-            # Get approval via UI
+            # Get approval via UI - one prompt for the whole batch of tool calls
             response = await cl.AskUserMessage(
-                content=approval_message,
+                content=format_approval_message(classification, base, policy.root) + "\n\n" + APPROVAL_HELP,
                 timeout=60
             ).send()
             
             if response and response.get('output'):
-                user_input = response['output'].strip().lower()
-                if user_input in ['y', 'yes']:
-                    print("✅ Operations APPROVED")
+                user_input = response['output']
+                if APPROVAL_GRANTS.apply_answer(user_input, session_id, request_id, classification, policy, base):
+                    logger.info("approval.decision status=approved answer=%s", user_input.strip().lower())
                     return {"approval_status": "approved"}
                 else:
-                    print("❌ Operations REJECTED")
+                    logger.info("approval.decision status=rejected reason=user")
+                    SPECULATIVE_RUNS.discard(session_id, last_message.id)
                     return {"approval_status": "rejected"}
             else:
-                print("❌ Operations REJECTED (no response)")
+                logger.info("approval.decision status=rejected reason=no_response")
+                SPECULATIVE_RUNS.discard(session_id, last_message.id)
                 return {"approval_status": "rejected"}
                 
         except Exception as e:
-            print(f"❌ Operations REJECTED (error: {e})")
+            logger.warning("approval.decision status=rejected reason=error error=%s", e)
+            SPECULATIVE_RUNS.discard(session_id, last_message.id)
             return {"approval_status": "rejected"}
 
+    async def tools_node(state: DavidState, config: RunnableConfig):
+        """Run the approved tool calls against this session's working directory and environment"""
+        session_id = session_id_from_config(config)
+        last_message = state["messages"][-1]
+        ready = await SPECULATIVE_RUNS.take(session_id, last_message.id)
+        remaining = [c for c in last_message.tool_calls if c.get("id") not in ready]
+        output = {"messages": []}
+        if remaining:
+            if ready:
+                # Only run what speculation didn't already cover
+                state = {**state, "messages": state["messages"][:-1] + [
+                    last_message.model_copy(update={"tool_calls": remaining})]}
+            with session_scope(session_id):
+                output = await tool_node.ainvoke(state, config)
+        if ready:
+            ran = {m.tool_call_id: m for m in output["messages"] if isinstance(m, ToolMessage)}
+            ran.update(ready)
+            output = {"messages": [ran[c["id"]] for c in last_message.tool_calls if c.get("id") in ran]}
+        # Hold results to their token budgets before they reach the state (and every later prompt)
+        return compact_tool_output(output, session_id)
+
     def should_use_tools(state: DavidState) -> Literal["tools", "rejected", "__end__"]:
         """Route based on approval status and tool calls"""
         approval_status = state.get("approval_status", "")
@@ -256,13 +252,15 @@ def create_agent_executor():
 
     # Build simple workflow with approval
     workflow = StateGraph(DavidState)
+    workflow.add_node("router", router_node)
     workflow.add_node("agent", david_agent)
     workflow.add_node("approval", approval_node)
     workflow.add_node("rejected", rejection_node)
-    workflow.add_node("tools", tool_node)
+    workflow.add_node("tools", tools_node)
 
-    # Simple flow: START → agent → approval → [tools OR rejected OR end]
-    workflow.add_edge(START, "agent")
+    # Simple flow: START → router → agent → approval → [tools OR rejected OR end]
+    workflow.add_edge(START, "router")
+    workflow.add_edge("router", "agent")
     workflow.add_edge("agent", "approval")
     workflow.add_conditional_edges("approval", should_use_tools, ["tools", "rejected", "__end__"])
     workflow.add_edge("tools", "agent")
@@ -273,33 +271,68 @@ def create_agent_executor():
     
     return david_graph, llm
 
-# Legacy compatibility functions for conversation_logger
-class LegacySessionHistory:
-    """Wrapper to maintain compatibility with existing conversation logger."""
-    def __init__(self, graph, session_id):
-        self.graph = graph
+def prune_thread(thread_id: str) -> None:
+    """Drop a thread's checkpoints, message log and the spilled tool outputs it referenced."""
+    checkpointer.delete_thread(thread_id)
+    THREAD_STORE.delete(thread_id)
+    release_thread(thread_id)
+
+def get_thread_messages(thread_id: str, start: int = 0, stop: int = None) -> list:
+    """Messages [start, stop) of a thread from the persistent log - negative indexes count from the end."""
+    return THREAD_STORE.page(thread_id, start, stop)
+
+# Conversation history for conversation_logger - fed with each step's new messages
+# instead of re-reading the whole thread state after every turn
+MAX_SESSION_HISTORIES = int(os.getenv("DAVID_MAX_SESSION_HISTORIES", "256"))
+
+class SessionHistory:
+    """Messages of one session that the conversation logger hasn't written yet."""
+    def __init__(self, session_id: str):
         self.session_id = session_id
-        self.messages = []
-    
-    def update_from_graph(self):
-        """Update messages from LangGraph state."""
-        try:
-            config = {"configurable": {"thread_id": self.session_id}}
-            # Get the current state
-            state = self.graph.get_state(config)
-            if state and state.values.get("messages"):
-                self.messages = state.values["messages"]
-        except Exception:
-            # If we can't get state, keep existing messages
-            pass
+        self.pending = []
+        self.logged = 0
+        self.last_message = None
+        self.log_path = None
+
+    def record(self, messages: list) -> None:
+        self.pending.extend(messages)
+        if messages:
+            self.last_message = messages[-1]
 
-# Global storage for compatibility
-session_histories = {}
+    def take_new(self) -> list:
+        """Hand the unlogged messages to the logger."""
+        new, self.pending = self.pending, []
+        self.logged += len(new)
+        return new
 
-def get_or_create_session_history(session_id: str, graph):
-    """Get or create session history for compatibility."""
-    if session_id not in session_histories:
-        session_histories[session_id] = LegacySessionHistory(graph, session_id)
+# session_id -> SessionHistory, least recently used first
+session_histories: "OrderedDict[str, SessionHistory]" = OrderedDict()
+
+def get_or_create_session_history(session_id: str) -> SessionHistory:
+    """Get or create a session's history, evicting the least recently used beyond the cap."""
+    history = session_histories.get(session_id)
+    if history is None:
+        history = session_histories[session_id] = SessionHistory(session_id)
+        while len(session_histories) > MAX_SESSION_HISTORIES:
+            session_histories.popitem(last=False)
     else:
-        session_histories[session_id].update_from_graph()
-    return session_histories[session_id]
+        session_histories.move_to_end(session_id)
+    return history
+
+def drop_session_history(session_id: str) -> None:
+    session_histories.pop(session_id, None)
+
+async def astream_turn(graph, graph_input: dict, config: dict, on_messages) -> Any:
+    """Run one turn, passing every message it adds to `on_messages` as each node finishes.
+
+    Returns the last message of the turn.
+    """
+    on_messages(list(graph_input.get("messages", [])))
+    last_message = None
+    async for update in graph.astream(graph_input, config=config, stream_mode="updates"):
+        for node_output in update.values():
+            new_messages = (node_output or {}).get("messages") if isinstance(node_output, dict) else None
+            if new_messages:
+                on_messages(list(new_messages))
+                last_message = new_messages[-1]
+    return last_message
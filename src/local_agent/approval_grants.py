@@ -0,0 +1,273 @@
+# C:\David\src\local_agent\approval_grants.py
+# Remembered approvals - session grants, plan-wide approval and persisted allow-rules
+#
+# A remembered approval is scoped to the folders the approved calls touched - or, for high-risk
+# and destructive tools, to the exact paths and their subtrees, so approving `delete_directory
+# build` never approves deleting its parent or a sibling. Arguments that aren't paths (a shell command, a registry value, text to type) can't be scoped by folder, so
+# for high-risk tools, and for any tool called without a path, the grant also pins those
+# arguments exactly - "always" on `execute_command git status` never allows another command.
+
+import fnmatch
+import json
+import logging
+import posixpath
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .approval_policy import Classification, RiskPolicy, iter_path_args, normalize_path
+from .storage import data_path
+
+logger = logging.getLogger(__name__)
+
+RULES_FILE = "approval_rules.json"
+DEFAULT_GRANT_MINUTES = 15
+ANY_PATH = "*"
+DESTRUCTIVE_TOOLS = frozenset({"delete_file", "delete_directory", "move_file", "move_directory", "batch_file_ops"})
+
+APPROVAL_HELP = (
+    "Reply **y** to approve once, **n** to reject, "
+    "**plan** to approve these steps for the rest of this request, "
+    "**s [minutes]** to allow these tools on these folders (exact paths for destructive tools) "
+    f"for this session (default {DEFAULT_GRANT_MINUTES} min), "
+    "or **always** to remember the permission."
+)
+
+
+Scope = Tuple[str, str, Optional[str]]  # (tool, path prefix, pinned non-path args or None for any)
+
+
+class Grant:
+    """Allow `tool` on paths under `prefix` (with exactly `args`, if set) until `expires` (monotonic seconds)."""
+
+    __slots__ = ("tool", "prefix", "args", "expires")
+
+    def __init__(self, tool: str, prefix: str, args: Optional[str], expires: float):
+        self.tool = tool
+        self.prefix = prefix
+        self.args = args
+        self.expires = expires
+
+    def covers(self, tool: str, path: Optional[str], args: str) -> bool:
+        if tool != self.tool or (self.args is not None and args != self.args):
+            return False
+        if self.prefix == ANY_PATH:
+            return True
+        return path is not None and (path == self.prefix or path.startswith(self.prefix.rstrip("/") + "/"))
+
+
+def _call_paths(tool_call: dict, policy: RiskPolicy, base: str) -> List[str]:
+    return [normalize_path(v, base) for _, v in iter_path_args(tool_call.get("args"), policy.path_args)]
+
+
+def _without_paths(value: Any, path_args) -> Any:
+    if isinstance(value, dict):
+        return {k: _without_paths(v, path_args) for k, v in value.items()
+                if not (k in path_args and isinstance(v, str))}
+    if isinstance(value, list):
+        return [_without_paths(v, path_args) for v in value]
+    return value.strip() if isinstance(value, str) else value
+
+
+def args_key(tool_call: dict, policy: RiskPolicy, paths: bool = False) -> str:
+    """Canonical JSON of a call's arguments - without the path arguments unless `paths`."""
+    args = tool_call.get("args") or {}
+    if not paths:
+        args = _without_paths(args, policy.path_args)
+    return json.dumps(args, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def grant_scope(tool_call: dict, policy: RiskPolicy, base: str) -> List[Scope]:
+    """Scopes a "remember this" answer grants for one call - the parent folder of each path (the path
+    itself for high-risk and destructive tools), with the non-path arguments pinned for high-risk tools
+    and for calls that take no path."""
+    name = tool_call.get("name", "")
+    paths = _call_paths(tool_call, policy, base)
+    high = policy.risk_of(name) == "high"
+    pinned = args_key(tool_call, policy) if not paths or high else None
+    if not paths:
+        return [(name, ANY_PATH, pinned)]
+    if high or name in DESTRUCTIVE_TOOLS:
+        return [(name, p, pinned) for p in paths]
+    return [(name, posixpath.dirname(p) or p, pinned) for p in paths]
+
+
+class _Plan:
+    """Calls approved with "plan" for one request: high-risk calls exactly as shown, others by scope."""
+
+    __slots__ = ("request_id", "exact", "grants")
+
+    def __init__(self, request_id: str, exact: Set[Tuple[str, str]], grants: List[Grant]):
+        self.request_id = request_id
+        self.exact = exact
+        self.grants = grants
+
+
+class ApprovalGrants:
+    """Session grants, per-request plan approvals and persisted allow-rules."""
+
+    def __init__(self, rules_path=None):
+        self._rules_path = rules_path
+        self._lock = threading.Lock()
+        self._session_grants: Dict[str, List[Grant]] = {}
+        self._plans: Dict[str, _Plan] = {}  # session_id -> approved plan of the latest human message
+        self._rules: Optional[List[dict]] = None
+        self._rules_mtime: Optional[float] = None
+
+    # -- persisted rules ----------------------------------------------------
+
+    @property
+    def rules_path(self):
+        return self._rules_path or data_path(RULES_FILE)
+
+    def rules(self) -> List[dict]:
+        """Allow-rules from disk: [{"tool": "write_file", "pattern": "c:/david/src/*"},
+        {"tool": "execute_command", "pattern": "*", "args": "{\"command\":\"git status\"}"}, ...]"""
+        path = self.rules_path
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            mtime = None
+        if self._rules is None or mtime != self._rules_mtime:
+            rules = []
+            if mtime is not None:
+                try:
+                    with path.open("r", encoding="utf-8") as f:
+                        rules = [r for r in json.load(f) if isinstance(r, dict) and r.get("tool")]
+                except Exception as e:
+                    logger.error("approval_grants.rules_load_failed file=%s error=%s", path, e)
+            self._rules, self._rules_mtime = rules, mtime
+        return self._rules
+
+    def add_rule(self, tool: str, pattern: str, args: Optional[str] = None) -> None:
+        rules = list(self.rules())
+        rule = {"tool": tool, "pattern": pattern.casefold()}
+        if args is not None:
+            rule["args"] = args
+        if rule in rules:
+            return
+        rules.append(rule)
+        path = self.rules_path
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(rules, f, indent=2)
+        self._rules, self._rules_mtime = rules, path.stat().st_mtime
+        logger.info("approval_grants.rule_added tool=%s pattern=%s", tool, rule["pattern"])
+
+    def _rule_covers(self, tool: str, path: Optional[str], args: str) -> bool:
+        for rule in self.rules():
+            if rule["tool"] not in (tool, "*") or rule.get("args", args) != args:
+                continue
+            pattern = rule.get("pattern", ANY_PATH)
+            if pattern == ANY_PATH or (path is not None and (fnmatch.fnmatchcase(path, pattern)
+                                                             or (pattern.endswith("/*") and path == pattern[:-2]))):
+                return True
+        return False
+
+    # -- session grants and plans -------------------------------------------
+
+    def grant(self, session_id: str, scopes: List[Scope], minutes: float = DEFAULT_GRANT_MINUTES) -> None:
+        expires = time.monotonic() + minutes * 60
+        with self._lock:
+            grants = self._session_grants.setdefault(session_id, [])
+            grants.extend(Grant(tool, prefix, args, expires) for tool, prefix, args in scopes)
+        logger.info("approval_grants.session_grant session=%s scopes=%s minutes=%s", session_id, scopes, minutes)
+
+    def approve_plan(self, session_id: str, request_id: str, calls: List[dict], policy: RiskPolicy,
+                     base: str) -> None:
+        """Approve `calls` - the ones shown in the prompt - for the rest of request `request_id`."""
+        exact, grants = set(), []
+        for call in calls:
+            name = call.get("name", "")
+            if policy.risk_of(name) == "high":
+                exact.add((name, args_key(call, policy, paths=True)))
+            else:
+                grants.extend(Grant(tool, prefix, args, float("inf"))
+                              for tool, prefix, args in grant_scope(call, policy, base))
+        with self._lock:
+            self._plans[session_id] = _Plan(request_id, exact, grants)
+
+    def clear_session(self, session_id: str) -> None:
+        with self._lock:
+            self._session_grants.pop(session_id, None)
+            self._plans.pop(session_id, None)
+
+    def _session_grants_for(self, session_id: str) -> List[Grant]:
+        now = time.monotonic()
+        with self._lock:
+            grants = [g for g in self._session_grants.get(session_id, []) if g.expires > now]
+            self._session_grants[session_id] = grants
+        return grants
+
+    # -- filtering ----------------------------------------------------------
+
+    def _plan_for(self, session_id: str, request_id: Optional[str]) -> Optional[_Plan]:
+        plan = self._plans.get(session_id)
+        return plan if plan is not None and request_id is not None and plan.request_id == request_id else None
+
+    def covers(self, session_id: str, tool_call: dict, policy: RiskPolicy, base: str,
+               request_id: Optional[str] = None) -> bool:
+        """Every path of the call (or the bare tool, if it takes none) must be granted or allowed."""
+        tool = tool_call.get("name", "")
+        plan = self._plan_for(session_id, request_id)
+        if plan is not None and (tool, args_key(tool_call, policy, paths=True)) in plan.exact:
+            return True
+        grants = self._session_grants_for(session_id)
+        if plan is not None and policy.risk_of(tool) != "high":
+            grants = grants + plan.grants
+        args = args_key(tool_call, policy)
+        paths = _call_paths(tool_call, policy, base) or [None]
+        return all(any(g.covers(tool, p, args) for g in grants) or self._rule_covers(tool, p, args) for p in paths)
+
+    def filter(self, session_id: str, request_id: Optional[str], classification: Classification,
+               policy: RiskPolicy, base: str) -> Classification:
+        """Drop calls that are already covered by a plan approval, session grant or allow-rule."""
+        remaining = Classification()
+        covered = {}
+        for bucket in ("high", "medium"):
+            for call in getattr(classification, bucket):
+                key = id(call)
+                if key not in covered:
+                    covered[key] = self.covers(session_id, call, policy, base, request_id)
+                if not covered[key]:
+                    getattr(remaining, bucket).append(call)
+        for call, key, value in classification.outside:
+            if id(call) not in covered:
+                covered[id(call)] = self.covers(session_id, call, policy, base, request_id)
+            if not covered[id(call)]:
+                remaining.outside.append((call, key, value))
+        return remaining
+
+    def apply_answer(self, answer: str, session_id: str, request_id: Optional[str],
+                     classification: Classification, policy: RiskPolicy, base: str) -> bool:
+        """Interpret an approval reply, recording any grant it asks for. Returns True if approved."""
+        words = answer.strip().lower().split()
+        if not words:
+            return False
+        verb = words[0]
+        if verb in ("y", "yes"):
+            return True
+        calls = {id(c): c for c in classification.high + classification.medium}
+        calls.update({id(c): c for c, _, _ in classification.outside})
+        scopes = sorted({scope for call in calls.values() for scope in grant_scope(call, policy, base)},
+                        key=lambda scope: (scope[0], scope[1], scope[2] or ""))
+        if verb in ("p", "plan"):
+            if request_id is not None:
+                self.approve_plan(session_id, request_id, list(calls.values()), policy, base)
+            return True
+        if verb in ("s", "session"):
+            minutes = DEFAULT_GRANT_MINUTES
+            if len(words) > 1:
+                try:
+                    minutes = max(1.0, float(words[1]))
+                except ValueError:
+                    pass
+            self.grant(session_id, scopes, minutes)
+            return True
+        if verb in ("a", "always"):
+            for tool, prefix, args in scopes:
+                self.add_rule(tool, ANY_PATH if prefix == ANY_PATH else prefix.rstrip("/") + "/*", args)
+            return True
+        return False
+
+
+APPROVAL_GRANTS = ApprovalGrants()
@@ -0,0 +1,259 @@
+# C:\David\src\local_agent\approval_policy.py
+# Declarative risk policy for the approval node - precompiled once, reloadable at runtime
+#
+# The built-in policy can be extended or overridden with a JSON file pointed to by
+# DAVID_APPROVAL_POLICY, e.g.
+#   {"root": "D:\\David", "trusted_paths": ["D:\\Scratch"], "medium_risk": ["+create_directory"]}
+# List entries starting with "+" / "-" add to / remove from the built-in list; a plain list replaces it.
+
+import json
+import logging
+import os
+import posixpath
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .session_context import DEFAULT_ROOT
+
+logger = logging.getLogger(__name__)
+
+POLICY_FILE_ENV = "DAVID_APPROVAL_POLICY"
+
+DEFAULT_POLICY = {
+    "root": DEFAULT_ROOT,
+    "trusted_paths": [],
+    "path_args": ["path", "source", "destination", "working_dir"],
+    "high_risk": [
+        "delete_file", "execute_command", "execute_command_confirmed",
+        "kill_process", "start_process", "execute_powershell", "execute_batch",
+        "delete_directory", "registry_write", "start_service", "stop_service",
+        "restart_service", "set_environment_variable", "click_coordinates",
+        "type_text", "key_combination", "create_scheduled_task",
+        "delete_scheduled_task", "batch_file_ops",
+    ],
+    "medium_risk": [
+        "write_file", "append_file", "edit_line", "find_replace",
+        "file_permissions", "copy_file", "move_file", "copy_directory",
+        "move_directory", "screenshot", "sqlite_query", "sqlite_create_table",
+        "create_zip", "extract_zip",
+    ],
+    # No side effects - safe to run speculatively while a batch waits for approval
+    "read_only": [
+        "read_file", "file_info", "list_directory", "directory_tree", "file_search",
+        "directory_size", "get_current_directory", "system_info", "disk_list", "changes_since",
+        "log_analyze",
+    ],
+}
+
+_DRIVE_RE = re.compile(r"^[a-z]:/")
+
+
+def _is_absolute(path: str) -> bool:
+    """Absolute on either Windows or POSIX - expects forward slashes."""
+    return path.startswith("/") or bool(_DRIVE_RE.match(path.lower()))
+
+
+def normalize_path(path: str, base: str) -> str:
+    """Normalized, case-insensitive, forward-slash form of `path` resolved against `base`."""
+    p = path.strip().replace("\\", "/")
+    if not _is_absolute(p):
+        p = base.replace("\\", "/").rstrip("/") + "/" + p
+    return posixpath.normpath(p).casefold()
+
+
+def display_path(path: str, base: str) -> str:
+    """Path as shown to the user - relative paths joined onto `base`."""
+    if _is_absolute(path.strip().replace("\\", "/")):
+        return path
+    return os.path.join(base, path)
+
+
+def iter_path_args(args: Optional[Dict[str, Any]], path_args: Iterable[str]):
+    """(key, value) for every path argument of a call, including those inside manifest lists
+    such as batch_file_ops(operations=[{"source": ..., "destination": ...}, ...])."""
+    for key, value in (args or {}).items():
+        if key in path_args and isinstance(value, str):
+            yield key, value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    yield from iter_path_args(item, path_args)
+
+
+class PathMatcher:
+    """Precompiled set of normalized path prefixes."""
+
+    def __init__(self, prefixes: Iterable[str]):
+        self.prefixes = tuple(sorted({normalize_path(p, "/") for p in prefixes if p}))
+
+    def matches(self, normalized: str) -> bool:
+        for prefix in self.prefixes:
+            if normalized == prefix or normalized.startswith(prefix.rstrip("/") + "/"):
+                return True
+        return False
+
+
+class Classification:
+    """Result of classifying one batch of tool calls."""
+
+    __slots__ = ("high", "medium", "outside")
+
+    def __init__(self):
+        self.high: List[dict] = []
+        self.medium: List[dict] = []
+        self.outside: List[Tuple[dict, str, str]] = []
+
+    @property
+    def needs_approval(self) -> bool:
+        return bool(self.high or self.medium or self.outside)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "high": [c.get("name", "unknown") for c in self.high],
+            "medium": [c.get("name", "unknown") for c in self.medium],
+            "outside": [f"{c.get('name', 'unknown')}:{key}" for c, key, _ in self.outside],
+        }
+
+
+class RiskPolicy:
+    """Compiled policy - risk lookups are a dict probe, path checks a handful of prefix tests."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.root = spec["root"]
+        self.path_args = frozenset(spec["path_args"])
+        self.high_risk = frozenset(spec["high_risk"])
+        self.medium_risk = frozenset(spec["medium_risk"]) - self.high_risk
+        self._risk = dict.fromkeys(self.medium_risk, "medium")
+        self._risk.update(dict.fromkeys(self.high_risk, "high"))
+        self.read_only = frozenset(spec.get("read_only", [])) - self.high_risk - self.medium_risk
+        self.allowed_paths = PathMatcher([self.root] + list(spec.get("trusted_paths", [])))
+
+    def risk_of(self, tool_name: str) -> Optional[str]:
+        return self._risk.get(tool_name)
+
+    def is_read_only(self, tool_name: str) -> bool:
+        return tool_name in self.read_only
+
+    def is_outside_root(self, path: str, base: Optional[str] = None) -> bool:
+        return not self.allowed_paths.matches(normalize_path(path, base or self.root))
+
+    def classify(self, tool_calls: Iterable[dict], base: Optional[str] = None) -> Classification:
+        """Single pass over the tool calls: risk tier plus out-of-root path arguments."""
+        base = base or self.root
+        result = Classification()
+        for tool_call in tool_calls:
+            for key, value in iter_path_args(tool_call.get("args"), self.path_args):
+                if self.is_outside_root(value, base):
+                    result.outside.append((tool_call, key, value))
+            risk = self._risk.get(tool_call.get("name", ""))
+            if risk == "high":
+                result.high.append(tool_call)
+            elif risk == "medium":
+                result.medium.append(tool_call)
+        return result
+
+
+def _merge_list(base: List[str], override: Any) -> List[str]:
+    if not isinstance(override, list):
+        return base
+    if override and all(isinstance(x, str) and x[:1] in "+-" for x in override):
+        merged = list(base)
+        for item in override:
+            name = item[1:]
+            if item[0] == "+" and name not in merged:
+                merged.append(name)
+            elif item[0] == "-" and name in merged:
+                merged.remove(name)
+        return merged
+    return list(override)
+
+
+def build_policy(overrides: Optional[Dict[str, Any]] = None) -> RiskPolicy:
+    spec = {key: (list(value) if isinstance(value, list) else value) for key, value in DEFAULT_POLICY.items()}
+    for key, value in (overrides or {}).items():
+        spec[key] = _merge_list(spec.get(key, []), value) if isinstance(spec.get(key), list) else value
+    return RiskPolicy(spec)
+
+
+# -- active policy ------------------------------------------------------------
+
+_lock = threading.Lock()
+_policy: Optional[RiskPolicy] = None
+_policy_mtime: Optional[float] = None
+
+
+def _policy_file() -> Optional[str]:
+    return os.getenv(POLICY_FILE_ENV) or None
+
+
+def reload_policy() -> RiskPolicy:
+    """(Re)load the policy from DAVID_APPROVAL_POLICY, falling back to the built-in one."""
+    global _policy, _policy_mtime
+    path = _policy_file()
+    overrides, mtime = None, None
+    if path and os.path.exists(path):
+        try:
+            mtime = os.path.getmtime(path)
+            with open(path, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+        except Exception as e:
+            logger.error("approval_policy.load_failed file=%s error=%s", path, e)
+            if _policy is not None:
+                _policy_mtime = mtime  # keep the last good policy until the file changes again
+                return _policy
+    policy = build_policy(overrides)
+    with _lock:
+        _policy, _policy_mtime = policy, mtime
+    logger.info("approval_policy.loaded file=%s high=%d medium=%d trusted=%d",
+                path or "<builtin>", len(policy.high_risk), len(policy.medium_risk),
+                len(policy.allowed_paths.prefixes))
+    return policy
+
+
+def get_policy() -> RiskPolicy:
+    """Current policy; picks up edits to the policy file without a restart."""
+    policy = _policy
+    if policy is None:
+        return reload_policy()
+    path = _policy_file()
+    if path:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        if mtime != _policy_mtime:
+            return reload_policy()
+    elif _policy_mtime is not None:
+        return reload_policy()
+    return policy
+
+
+def format_approval_message(classification: Classification, base: str, root: Optional[str] = None) -> str:
+    """Markdown prompt shown in Chainlit for a batch needing approval. `root` defaults to the active policy's."""
+    details = []
+    if classification.outside:
+        details.append(f"**OPERATIONS OUTSIDE {root or get_policy().root}:**")
+        for tool_call, key, value in classification.outside:
+            details.append(f"• {tool_call.get('name', 'unknown')}: {key} = {value} → {display_path(value, base)}")
+
+    for title, calls in (("**HIGH RISK OPERATIONS:**", classification.high),
+                         ("**MEDIUM RISK OPERATIONS:**", classification.medium)):
+        if not calls:
+            continue
+        details.append(title)
+        for tool_call in calls:
+            tool_name = tool_call.get("name", "unknown")
+            if "args" in tool_call:
+                args_text = []
+                for key, value in tool_call["args"].items():
+                    if isinstance(value, str) and key in ("path", "source", "destination"):
+                        args_text.append(f"{key}: {display_path(value, base)}")
+                    else:
+                        args_text.append(f"{key}: {value}")
+                details.append(f"• **{tool_name}** - {', '.join(args_text)}")
+            else:
+                details.append(f"• **{tool_name}**")
+
+    return "⚠️ **APPROVAL REQUIRED** ⚠️\n\n" + "\n".join(details) + "\n\n**Approve these operations?**"
@@ -0,0 +1,115 @@
+# C:\David\src\local_agent\capabilities.py
+# Capability probe - which binaries, libraries and OS features a tool needs, checked once and cached on disk
+#
+# Requirements are strings such as "bin:wmic", "mod:psutil" or "os:Windows";
+# "bin:tracert|traceroute" is satisfied by either alternative.
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from .storage import data_path
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "capabilities.json"
+CACHE_TTL = 24 * 3600
+
+
+def _fingerprint() -> str:
+    """Changes when the things probes depend on change - platform, interpreter, PATH."""
+    raw = "|".join([platform.system(), platform.release(), sys.executable, os.environ.get("PATH", "")])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _check_one(requirement: str) -> bool:
+    kind, _, name = requirement.partition(":")
+    if kind == "bin":
+        return shutil.which(name) is not None
+    if kind == "mod":
+        try:
+            return importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            return False
+    if kind == "os":
+        return platform.system().lower() == name.lower()
+    logger.warning("capabilities.unknown_requirement requirement=%s", requirement)
+    return False
+
+
+class CapabilityProbe:
+    """Answers "is this requirement met?" from a disk cache, probing each requirement at most once."""
+
+    def __init__(self, cache_path=None, ttl: float = CACHE_TTL):
+        self._cache_path = cache_path
+        self.ttl = ttl
+        self._results: Optional[Dict[str, bool]] = None
+        self._created: Optional[float] = None  # when the cached results were first probed - the TTL counts from here
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @property
+    def cache_path(self):
+        return self._cache_path or data_path(CACHE_FILE)
+
+    def _load(self) -> Dict[str, bool]:
+        if self._results is None:
+            results, created = {}, None
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("fingerprint") == _fingerprint() and time.time() - cached.get("created", 0) < self.ttl:
+                    results, created = dict(cached.get("results", {})), cached.get("created")
+            except (OSError, ValueError):
+                pass
+            self._results, self._created = results, created
+        return self._results
+
+    def check(self, requirement: str) -> bool:
+        """True if any of the |-separated alternatives is available."""
+        with self._lock:
+            results = self._load()
+            if requirement not in results:
+                results[requirement] = any(_check_one(alt if ":" in alt else requirement.split(":")[0] + ":" + alt)
+                                           for alt in requirement.split("|"))
+                self._dirty = True
+            return results[requirement]
+
+    def satisfied(self, requirements: Iterable[str]) -> bool:
+        return all(self.check(r) for r in requirements)
+
+    def save(self) -> None:
+        """Persist newly probed results."""
+        with self._lock:
+            if not self._dirty or self._results is None:
+                return
+            if self._created is None:
+                self._created = time.time()
+            try:
+                with open(self.cache_path, "w", encoding="utf-8") as f:
+                    json.dump({"fingerprint": _fingerprint(), "created": self._created,
+                               "platform": platform.system(), "results": self._results}, f, indent=2)
+                self._dirty = False
+            except OSError as e:
+                logger.warning("capabilities.save_failed file=%s error=%s", self.cache_path, e)
+
+    def refresh(self) -> None:
+        """Forget cached results - the next checks probe again."""
+        with self._lock:
+            self._results, self._created = {}, None
+            self._dirty = True
+
+    def snapshot(self) -> Dict[str, bool]:
+        with self._lock:
+            return dict(self._load())
+
+
+PROBE = CapabilityProbe()
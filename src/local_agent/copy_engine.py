@@ -0,0 +1,232 @@
+# C:\David\src\local_agent\copy_engine.py
+# File and tree copying for the copy tools - zero-copy where the OS has it, parallel for trees
+#
+# copy_one() moves data with os.copy_file_range on Linux (in-kernel, and a reflink or
+# server-side copy where the filesystem supports it) and falls back to shutil.copyfile, which
+# uses sendfile / fcopyfile / CopyFile2 on its own. copy_tree() creates directories on the
+# calling thread, parents before children, and hands file copies to a worker pool in batches
+# (a task per file costs more than copying a small file). Directory timestamps are applied
+# last, deepest first, so copying into them doesn't disturb them.
+# With sync=True, files whose size and mtime already match the destination are skipped.
+
+import errno
+import os
+import shutil
+import stat
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Optional
+
+DEFAULT_WORKERS = 8
+MAX_WORKERS = 32
+MTIME_TOLERANCE_NS = 2_000_000_000  # FAT/exFAT store mtimes with 2 s resolution
+CHUNK_BYTES = 64 * 1024 * 1024
+# Below this, shutil's sendfile path is as fast and copy_file_range's extra open/probe costs more
+COPY_FILE_RANGE_MIN_BYTES = 1024 * 1024
+FILES_PER_TASK = 64                 # files per pool task - one future per file costs more than a small copy
+_MAX_PENDING_PER_WORKER = 4         # queued tasks per worker before the walk waits
+
+# errno values meaning "copy_file_range can't do this pair of files" rather than a real failure
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.EPERM,
+                    errno.ETXTBSY}
+_copy_file_range_ok = hasattr(os, "copy_file_range")
+
+
+class CopyStats:
+    """Counters for one copy; safe to update from worker threads."""
+
+    def __init__(self):
+        self.files = 0
+        self.skipped = 0
+        self.dirs = 0
+        self.bytes = 0
+        self.errors: List[str] = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def add_file(self, size: int) -> None:
+        with self._lock:
+            self.files += 1
+            self.bytes += size
+
+    def add_skipped(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def add_error(self, message: str) -> None:
+        with self._lock:
+            self.errors.append(message)
+
+    def finish(self) -> "CopyStats":
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second actually copied."""
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        parts = [f"{self.files} file(s), {_format_bytes(self.bytes)} in {self.elapsed:.2f}s "
+                 f"({_format_bytes(self.throughput)}/s, {self.files / self.elapsed if self.elapsed > 0 else 0:.0f} files/s)"]
+        if self.dirs:
+            parts.append(f"{self.dirs} folder(s)")
+        if self.skipped:
+            parts.append(f"{self.skipped} unchanged skipped")
+        if self.errors:
+            parts.append(f"{len(self.errors)} error(s)")
+        return ", ".join(parts)
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.1f} {unit}" if unit != "B" else f"{int(n)} B"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def unchanged(source_stat: os.stat_result, destination: str) -> bool:
+    """rsync's quick check - same size and same mtime (within filesystem resolution)."""
+    try:
+        dest_stat = os.stat(destination)
+    except OSError:
+        return False
+    return (stat.S_ISREG(dest_stat.st_mode) and dest_stat.st_size == source_stat.st_size
+            and abs(dest_stat.st_mtime_ns - source_stat.st_mtime_ns) <= MTIME_TOLERANCE_NS)
+
+
+def _copy_file_range(source: str, destination: str) -> bool:
+    """Copy with os.copy_file_range. False if the kernel/filesystem can't, before anything was written."""
+    global _copy_file_range_ok
+    with open(source, "rb") as fsrc, open(destination, "wb") as fdst:
+        copied = 0
+        while True:
+            try:
+                n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), CHUNK_BYTES)
+            except OSError as e:
+                if copied == 0 and e.errno in _FALLBACK_ERRNOS:
+                    if e.errno == errno.ENOSYS:
+                        _copy_file_range_ok = False
+                    return False
+                raise
+            if n == 0:
+                break
+            copied += n
+    return True
+
+
+def copy_one(source: str, destination: str, sync: bool = False, stats: Optional[CopyStats] = None,
+             source_stat: Optional[os.stat_result] = None) -> bool:
+    """Copy one file with its metadata. Returns False if sync=True found it unchanged.
+
+    A destination that is an existing folder gets the file inside it, like shutil.copy2.
+    """
+    if source_stat is None:
+        source_stat = os.stat(source)
+        if os.path.isdir(destination):
+            destination = os.path.join(destination, os.path.basename(source))
+    if sync and unchanged(source_stat, destination):
+        if stats:
+            stats.add_skipped()
+        return False
+    # Small files go through shutil - as are procfs/sysfs files, which report size 0 but have content
+    if not (_copy_file_range_ok and stat.S_ISREG(source_stat.st_mode)
+            and source_stat.st_size >= COPY_FILE_RANGE_MIN_BYTES and _copy_file_range(source, destination)):
+        shutil.copyfile(source, destination)
+    shutil.copystat(source, destination)
+    if stats:
+        stats.add_file(source_stat.st_size)
+    return True
+
+
+def _copy_entry(entry: os.DirEntry, destination: str, symlinks: bool, sync: bool, stats: CopyStats) -> None:
+    try:
+        if symlinks and entry.is_symlink():
+            target = os.readlink(entry.path)
+            if os.path.lexists(destination):
+                if sync and os.path.islink(destination) and os.readlink(destination) == target:
+                    stats.add_skipped()
+                    return
+                os.remove(destination)
+            os.symlink(target, destination)
+            stats.add_file(0)
+            return
+        copy_one(entry.path, destination, sync=sync, stats=stats, source_stat=entry.stat())
+    except OSError as e:
+        stats.add_error(f"{entry.path}: {e}")
+
+
+def _copy_entries(batch: List[tuple], symlinks: bool, sync: bool, stats: CopyStats) -> None:
+    for entry, destination in batch:
+        _copy_entry(entry, destination, symlinks, sync, stats)
+
+
+def copy_tree(source: str, destination: str, workers: int = DEFAULT_WORKERS, sync: bool = False,
+              symlinks: bool = False) -> CopyStats:
+    """Copy a directory tree. The destination must not exist unless sync=True.
+
+    Per-file errors are collected in stats.errors rather than stopping the copy, like
+    shutil.copytree's shutil.Error.
+    """
+    if not os.path.isdir(source):
+        raise NotADirectoryError(f"Not a directory: {source}")
+    if not sync and os.path.lexists(destination):
+        raise FileExistsError(f"Destination already exists: {destination}")
+    stats = CopyStats()
+    workers = max(1, min(workers, MAX_WORKERS))
+    created: List[tuple] = []  # (source dir, destination dir) in creation order
+    pending = set()
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def submit(batch: List[tuple]) -> None:
+        nonlocal pending
+        if pool is None:
+            _copy_entries(batch, symlinks, sync, stats)
+            return
+        if len(pending) >= workers * _MAX_PENDING_PER_WORKER:
+            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+        pending.add(pool.submit(_copy_entries, batch, symlinks, sync, stats))
+
+    try:
+        stack = [(source, destination)]
+        while stack:
+            src_dir, dst_dir = stack.pop()
+            try:
+                os.makedirs(dst_dir, exist_ok=True)
+                entries = list(os.scandir(src_dir))
+            except OSError as e:
+                stats.add_error(f"{src_dir}: {e}")
+                continue
+            created.append((src_dir, dst_dir))
+            stats.dirs += 1
+            subdirs, batch = [], []
+            for entry in entries:
+                target = os.path.join(dst_dir, entry.name)
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=not symlinks)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    subdirs.append((entry.path, target))
+                    continue
+                batch.append((entry, target))
+                if len(batch) >= FILES_PER_TASK:
+                    submit(batch)
+                    batch = []
+            if batch:
+                submit(batch)
+            # Reversed so the pop() order walks subfolders alphabetically, like os.walk
+            stack.extend(reversed(subdirs))
+        wait(pending)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+    for src_dir, dst_dir in reversed(created):
+        try:
+            shutil.copystat(src_dir, dst_dir)
+        except OSError as e:
+            stats.add_error(f"{dst_dir}: {e}")
+    return stats.finish()
@@ -0,0 +1,403 @@
+# C:\David\src\local_agent\data_profile.py
+# Column profiles of CSV / JSON Lines files - chunked, vectorized, cached by content hash
+#
+# profile_file() reads CHUNK_ROWS rows at a time and folds each chunk into per-column
+# accumulators, so memory depends on the chunk size, not the file size:
+#   - numeric columns: count, min, max, and mean/std merged chunk by chunk (Chan et al.)
+#   - quantiles from a uniform sample of up to SAMPLE_SIZE values (exact for smaller columns),
+#     kept by giving every value a random key and keeping the smallest keys
+#   - top values from a counter that drops its rarer half past MAX_DISTINCT (then approximate)
+# With NumPy (optional_import) conversion, moments and sampling run on whole chunks; without
+# it the same accumulators use plain Python.
+#
+# Profiles are stored in .david/profiles.sqlite keyed by the file's SHA-256, so asking again
+# about the same data - even a renamed copy - is a lookup. A (path, size, mtime) -> hash table
+# avoids re-hashing files that haven't changed.
+
+import csv
+import hashlib
+import heapq
+import json
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .storage import data_path
+from .tool_registry import optional_import
+
+PROFILE_FILE = "profiles.sqlite"
+PROFILE_VERSION = 1            # bump when the profile layout changes
+CHUNK_ROWS = 50_000
+SAMPLE_SIZE = 100_000
+MAX_DISTINCT = 50_000
+TOP_KEPT = 20                  # top values stored per column; the tool shows fewer
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+NUMERIC_SHARE = 0.95           # share of non-null values that must parse for a numeric column
+MAX_CACHED_PROFILES = 500
+HASH_BLOCK = 1024 * 1024
+NULL_TOKENS = frozenset(["", "null", "none", "na", "n/a", "nan", "nil", "-"])
+
+
+# -- reading -------------------------------------------------------------------
+
+
+def sniff_format(path: str) -> str:
+    """"jsonl" if the first non-blank character opens an object, else "csv"."""
+    with open(path, "rb") as f:
+        head = f.read(4096).lstrip(b"\xef\xbb\xbf \t\r\n")
+    return "jsonl" if head.startswith(b"{") else "csv"
+
+
+def _csv_chunks(path: str, chunk_rows: int):
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        sample = f.read(65536)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [h.strip() or f"column_{i + 1}" for i, h in enumerate(header)]
+        width = len(header)
+        rows: List[list] = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != width:
+                row = (row + [""] * width)[:width]
+            rows.append(row)
+            if len(rows) >= chunk_rows:
+                yield header, [list(col) for col in zip(*rows)]
+                rows = []
+        if rows:
+            yield header, [list(col) for col in zip(*rows)]
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+def _jsonl_chunks(path: str, chunk_rows: int):
+    header: List[str] = []
+    index: Dict[str, int] = {}
+    records: List[dict] = []
+
+    def emit():
+        return header[:], [[_json_value(r.get(name)) for r in records] for name in header]
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict):
+                record = {"value": record}
+            for key in record:
+                if key not in index:
+                    index[key] = len(header)
+                    header.append(key)
+            records.append(record)
+            if len(records) >= chunk_rows:
+                yield emit()
+                records = []
+    if records:
+        yield emit()
+
+
+# -- accumulators --------------------------------------------------------------
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or isinstance(value, str) and value.strip().lower() in NULL_TOKENS
+
+
+def _mostly_text(values: list, probe: int = 256) -> bool:
+    """True when most of the first `probe` values don't parse as numbers."""
+    failed = 0
+    for v in values[:probe]:
+        try:
+            float(v)
+        except (TypeError, ValueError):
+            failed += 1
+    return failed * 2 > min(len(values), probe)
+
+
+class _Column:
+    """Running statistics for one column."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+        self.nulls = 0
+        self.non_numeric = 0
+        self.text_only = False
+        self.n = 0               # numeric values
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.text_min: Optional[str] = None
+        self.text_max: Optional[str] = None
+        self.counts: Counter = Counter()
+        self.counts_exact = True
+        self.sample_keys: Any = None     # numpy arrays or a list of (-key, value) heap entries
+        self.sample_values: Any = None
+
+    # numeric ------------------------------------------------------------------
+
+    def _merge_moments(self, n: int, mean: float, m2: float, lo: float, hi: float) -> None:
+        if not n:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def _add_numbers_numpy(self, np, values: list) -> None:
+        try:
+            numbers = np.asarray(values, dtype=object).astype(np.float64)
+            failed = 0
+        except (TypeError, ValueError):
+            parsed = []
+            for v in values:
+                try:
+                    parsed.append(float(v))
+                except (TypeError, ValueError):
+                    parsed.append(np.nan)
+            numbers = np.asarray(parsed, dtype=np.float64)
+            failed = int(np.isnan(numbers).sum())
+        numbers = numbers[np.isfinite(numbers)]
+        self.non_numeric += failed
+        if not numbers.size:
+            return
+        mean = float(numbers.mean())
+        self._merge_moments(int(numbers.size), mean, float(((numbers - mean) ** 2).sum()),
+                            float(numbers.min()), float(numbers.max()))
+        keys = np.random.random(numbers.size)
+        if self.sample_keys is not None:
+            keys = np.concatenate([self.sample_keys, keys])
+            numbers = np.concatenate([self.sample_values, numbers])
+        if keys.size > SAMPLE_SIZE:
+            keep = np.argpartition(keys, SAMPLE_SIZE)[:SAMPLE_SIZE]
+            keys, numbers = keys[keep], numbers[keep]
+        self.sample_keys, self.sample_values = keys, numbers
+
+    def _add_numbers_python(self, values: list) -> None:
+        numbers = []
+        for v in values:
+            try:
+                x = float(v)
+            except (TypeError, ValueError):
+                self.non_numeric += 1
+                continue
+            if math.isfinite(x):
+                numbers.append(x)
+        if not numbers:
+            return
+        mean = sum(numbers) / len(numbers)
+        self._merge_moments(len(numbers), mean, sum((x - mean) ** 2 for x in numbers), min(numbers), max(numbers))
+        heap = self.sample_keys if self.sample_keys is not None else []
+        for x in numbers:  # max-heap on -key keeps the SAMPLE_SIZE smallest random keys
+            key = random.random()
+            if len(heap) < SAMPLE_SIZE:
+                heapq.heappush(heap, (-key, x))
+            elif key < -heap[0][0]:
+                heapq.heapreplace(heap, (-key, x))
+        self.sample_keys = heap
+
+    # all values ---------------------------------------------------------------
+
+    def add(self, values: list, np, strings: bool = False) -> None:
+        """Fold one chunk of raw values in; `strings` says they are all str (CSV)."""
+        self.rows += len(values)
+        if strings:
+            present = [v for v in values if v.strip().lower() not in NULL_TOKENS]
+        else:
+            present = [v for v in values if not _is_null(v)]
+        self.nulls += len(values) - len(present)
+        if not present:
+            return
+        # Once text outnumbers numbers the column stays text - skip the costly failed parses
+        if not self.text_only and not self.n and _mostly_text(present):
+            self.text_only = True
+        if not self.text_only:
+            if np is not None:
+                self._add_numbers_numpy(np, present)
+            else:
+                self._add_numbers_python(present)
+            self.text_only = self.non_numeric > max(self.n, CHUNK_ROWS // 10)
+        texts = present if strings else [v if isinstance(v, str) else repr(v) if isinstance(v, float) else str(v)
+                                         for v in present]
+        lo, hi = min(texts), max(texts)
+        self.text_min = lo if self.text_min is None else min(self.text_min, lo)
+        self.text_max = hi if self.text_max is None else max(self.text_max, hi)
+        self.counts.update(texts)
+        if len(self.counts) > MAX_DISTINCT:
+            self.counts = Counter(dict(self.counts.most_common(MAX_DISTINCT // 2)))
+            self.counts_exact = False
+
+    def _sample(self, np) -> List[float]:
+        if self.sample_keys is None:
+            return []
+        if np is not None and not isinstance(self.sample_keys, list):
+            return self.sample_values
+        return [x for _, x in self.sample_keys]
+
+    def result(self, np) -> Dict[str, Any]:
+        present = self.rows - self.nulls
+        numeric = present > 0 and not self.text_only and self.n >= NUMERIC_SHARE * present
+        profile: Dict[str, Any] = {
+            "name": self.name,
+            "type": "numeric" if numeric else "text",
+            "count": present,
+            "nulls": self.nulls,
+            "distinct": len(self.counts),
+            "distinct_exact": self.counts_exact,
+            "top": [[value, count] for value, count in self.counts.most_common(TOP_KEPT)],
+        }
+        if numeric:
+            sample = self._sample(np)
+            if np is not None:
+                quantiles = [float(q) for q in np.quantile(np.asarray(sample), QUANTILES)]
+            else:
+                ordered = sorted(sample)
+                quantiles = [ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] for q in QUANTILES]
+            profile.update({
+                "min": self.min, "max": self.max, "mean": self.mean,
+                "std": math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0,
+                "quantiles": dict(zip([f"p{int(q * 100):02d}" for q in QUANTILES], quantiles)),
+                "quantiles_exact": self.n <= SAMPLE_SIZE,
+                "non_numeric": present - self.n,
+            })
+        else:
+            profile.update({"min": self.text_min, "max": self.text_max})
+        return profile
+
+
+def profile_file(path: str, chunk_rows: int = CHUNK_ROWS, use_numpy: bool = True) -> Dict[str, Any]:
+    """Profile every column of a CSV or JSON Lines file."""
+    np = optional_import("numpy") if use_numpy else None
+    fmt = sniff_format(path)
+    chunks = _jsonl_chunks(path, chunk_rows) if fmt == "jsonl" else _csv_chunks(path, chunk_rows)
+    columns: Dict[str, _Column] = {}
+    rows = 0
+    start = time.perf_counter()
+    for header, data in chunks:
+        chunk_len = len(data[0]) if data else 0
+        for name, values in zip(header, data):
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = _Column(name)
+                column.rows = column.nulls = rows  # a JSONL key first seen late was null before
+            column.add(values, np, strings=fmt == "csv")
+        rows += chunk_len
+    return {
+        "version": PROFILE_VERSION,
+        "format": fmt,
+        "rows": rows,
+        "columns": [c.result(np) for c in columns.values()],
+        "engine": "numpy" if np is not None else "python",
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+# -- cache ---------------------------------------------------------------------
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ProfileCache:
+    """Profiles by content hash, plus a stat -> hash table so unchanged files aren't re-hashed."""
+
+    def __init__(self, path=None, max_entries: int = MAX_CACHED_PROFILES):
+        self._path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path or data_path(PROFILE_FILE)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("CREATE TABLE IF NOT EXISTS hashes (path TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                     "mtime_ns INTEGER NOT NULL, sha256 TEXT NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS profiles (sha256 TEXT PRIMARY KEY, profile TEXT NOT NULL, "
+                     "created REAL NOT NULL, last_used REAL NOT NULL)")
+        return conn
+
+    def file_hash(self, path: str) -> str:
+        st = os.stat(path)
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT sha256 FROM hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+                               (path, st.st_size, st.st_mtime_ns)).fetchone()
+        if row:
+            return row[0]
+        sha = _sha256(path)
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                         (path, st.st_size, st.st_mtime_ns, sha))
+        return sha
+
+    def get(self, sha: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT profile FROM profiles WHERE sha256 = ?", (sha,)).fetchone()
+            if row is None:
+                return None
+            profile = json.loads(row[0])
+            if profile.get("version") != PROFILE_VERSION:
+                return None
+            conn.execute("UPDATE profiles SET last_used = ? WHERE sha256 = ?", (time.time(), sha))
+        return profile
+
+    def put(self, sha: str, profile: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO profiles (sha256, profile, created, last_used) VALUES (?, ?, ?, ?)",
+                         (sha, json.dumps(profile, default=str), now, now))
+            count = conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute("DELETE FROM profiles WHERE sha256 IN (SELECT sha256 FROM profiles "
+                             "ORDER BY last_used ASC LIMIT ?)", (count - self.max_entries,))
+
+
+PROFILE_CACHE = ProfileCache()
+
+
+def cached_profile(path: str, refresh: bool = False, cache: ProfileCache = PROFILE_CACHE) -> Tuple[Dict[str, Any], str, bool]:
+    """(profile, sha256, came from cache) for `path`."""
+    sha = cache.file_hash(path)
+    if not refresh:
+        profile = cache.get(sha)
+        if profile is not None:
+            return profile, sha, True
+    profile = profile_file(path)
+    cache.put(sha, profile)
+    return profile, sha, False
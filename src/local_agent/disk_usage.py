@@ -0,0 +1,179 @@
+# C:\David\src\local_agent\disk_usage.py
+# Directory sizing for directory_size - one scandir pass, hard links counted once
+#
+# Sizes come from os.scandir's DirEntry.stat(), which on Windows is already in the directory
+# listing and on POSIX is a single lstat per entry - there is no second stat per file as with
+# os.walk + getsize. Symlinks are counted as links, never followed. Files with more than one
+# hard link are counted once per (st_dev, st_ino). Each top-level subfolder is walked as its own
+# task on a thread pool; scandir releases the GIL, so subtrees on different disks or a slow
+# share overlap. Unreadable entries are counted and reported instead of aborting the walk.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple
+
+DEFAULT_WORKERS = 8
+MAX_WORKERS = 32
+MAX_ERRORS_KEPT = 20
+
+
+class _Tally:
+    """Counts for one subtree."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.files = 0
+        self.dirs = 0
+        self.error_count = 0
+        self.errors: List[str] = []
+
+    def error(self, path: str, e: OSError) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS_KEPT:
+            self.errors.append(f"{path}: {e.strerror or e}")
+
+
+class DiskUsage:
+    """Result of measure(): totals, per-child sizes and the errors that were skipped."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bytes = 0
+        self.files = 0
+        self.dirs = 0
+        self.hardlinks_skipped = 0
+        self.error_count = 0
+        self.errors: List[str] = []
+        self.children: List[Tuple[str, int, bool]] = []  # (name, bytes, is_dir)
+        self.elapsed = 0.0
+
+    def _merge(self, tally: _Tally) -> None:
+        self.bytes += tally.bytes
+        self.files += tally.files
+        self.dirs += tally.dirs
+        self.error_count += tally.error_count
+        self.errors.extend(tally.errors[:MAX_ERRORS_KEPT - len(self.errors)])
+
+    def largest(self, n: int) -> List[Tuple[str, int, bool]]:
+        return sorted(self.children, key=lambda c: c[1], reverse=True)[:n]
+
+
+class _LinkSet:
+    """(st_dev, st_ino) of multiply-linked files already counted, shared by all walkers."""
+
+    def __init__(self):
+        self._seen: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    def first_sighting(self, st: os.stat_result) -> bool:
+        key = (st.st_dev, st.st_ino)
+        with self._lock:
+            if key in self._seen:
+                self.skipped += 1
+                return False
+            self._seen.add(key)
+            return True
+
+
+def _size_of(entry: os.DirEntry, links: _LinkSet) -> int:
+    st = entry.stat(follow_symlinks=False)
+    # Windows scandir results carry no link count or inode (both 0) - nothing to deduplicate
+    if st.st_nlink > 1 and st.st_ino and not links.first_sighting(st):
+        return 0
+    return st.st_size
+
+
+def _walk(root: str, links: _LinkSet) -> _Tally:
+    tally = _Tally()
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError as e:
+            tally.error(path, e)
+            continue
+        tally.dirs += 1
+        try:
+            with it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            tally.bytes += _size_of(entry, links)
+                            tally.files += 1
+                    except OSError as e:
+                        tally.error(entry.path, e)
+        except OSError as e:  # the listing itself failed part-way (folder removed, share dropped)
+            tally.error(path, e)
+    return tally
+
+
+def measure(path: str, workers: int = DEFAULT_WORKERS) -> DiskUsage:
+    """Total size of `path` with a size for each direct child."""
+    start = time.perf_counter()
+    usage = DiskUsage(path)
+    links = _LinkSet()
+    root = _Tally()
+    subdirs = []
+    with os.scandir(path) as it:
+        root.dirs += 1
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry)
+                    continue
+                size = _size_of(entry, links)
+            except OSError as e:
+                root.error(entry.path, e)
+                continue
+            root.bytes += size
+            root.files += 1
+            usage.children.append((entry.name, size, False))
+    usage._merge(root)
+
+    workers = max(1, min(workers, MAX_WORKERS, len(subdirs) or 1))
+    if workers == 1:
+        tallies = [_walk(entry.path, links) for entry in subdirs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            tallies = list(pool.map(lambda entry: _walk(entry.path, links), subdirs))
+    for entry, tally in zip(subdirs, tallies):
+        usage._merge(tally)
+        usage.children.append((entry.name, tally.bytes, True))
+
+    usage.hardlinks_skipped = links.skipped
+    usage.elapsed = time.perf_counter() - start
+    return usage
+
+
+def format_size(n: float) -> str:
+    if n < 1024:
+        return f"{n:,.0f} bytes"
+    for unit in ("KB", "MB", "GB"):
+        n /= 1024
+        if n < 1024:
+            return f"{n:,.2f} {unit}"
+    return f"{n / 1024:,.2f} TB"
+
+
+def report(usage: DiskUsage, top: Optional[int] = 10) -> str:
+    lines = [f"Directory size of {usage.path}: {usage.bytes:,} bytes ({usage.bytes / (1024**2):.2f} MB) - "
+             f"{usage.files:,} files, {usage.dirs:,} folders ({usage.elapsed:.2f}s)"]
+    if usage.hardlinks_skipped:
+        lines.append(f"Hard links counted once: {usage.hardlinks_skipped:,} duplicate links not added")
+    if top and usage.children:
+        lines.append("Largest entries:")
+        for name, size, is_dir in usage.largest(top):
+            share = size / usage.bytes * 100 if usage.bytes else 0
+            lines.append(f"  {name}{os.sep if is_dir else ''}  {format_size(size)} ({share:.1f}%)")
+    if usage.error_count:
+        lines.append(f"Skipped {usage.error_count:,} unreadable entries (sizes exclude them):")
+        lines += [f"  {e}" for e in usage.errors]
+        if usage.error_count > len(usage.errors):
+            lines.append(f"  ... and {usage.error_count - len(usage.errors):,} more")
+    return "\n".join(lines)
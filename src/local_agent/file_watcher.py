@@ -0,0 +1,306 @@
+# C:\David\src\local_agent\file_watcher.py
+# Background file watching - a coalesced change feed instead of re-listing folders
+#
+# watch() registers a folder (or file) with a backend:
+#   watchdog  - OS notifications (inotify, ReadDirectoryChangesW, FSEvents) when the watchdog
+#               package is installed
+#   polling   - one daemon thread re-stats watched trees every DAVID_WATCH_POLL_SECONDS
+# DAVID_WATCH_BACKEND=watchdog|polling forces one; the default picks watchdog when available.
+#
+# A single file is watched through its folder, non-recursively, with events for other entries
+# dropped. A polled tree cut off at MAX_POLLED_FILES doesn't count as covered.
+#
+# Every change gets a sequence number in a bounded in-memory feed. changes_since(cursor)
+# folds the events after `cursor` into one net change per path (created then deleted is
+# nothing, deleted then created is a modification). Subscribers - the tool result cache -
+# are told about each changed path as it happens.
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .tool_registry import optional_import
+
+logger = logging.getLogger(__name__)
+
+CREATED, MODIFIED, DELETED = "created", "modified", "deleted"
+MAX_EVENTS = int(os.getenv("DAVID_WATCH_MAX_EVENTS", "20000"))
+MAX_WATCHES = int(os.getenv("DAVID_MAX_WATCHES", "32"))
+POLL_SECONDS = float(os.getenv("DAVID_WATCH_POLL_SECONDS", "2"))
+MAX_POLLED_FILES = 200_000  # per watch - beyond this a polling scan costs more than it saves
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def _under(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+class Watch:
+    def __init__(self, watch_id: int, path: str, recursive: bool, backend: str):
+        self.id = watch_id
+        self.path = path
+        self.key = _norm(path)
+        self.recursive = recursive
+        self.backend = backend
+        self.handle = None                                   # watchdog ObservedWatch
+        self.handler = None                                  # watchdog event handler
+        self.snapshot: Optional[Dict[str, Tuple[int, int]]] = None  # polling: path -> (mtime_ns, size)
+        self.truncated = False
+
+
+def _coalesce(previous: Optional[str], kind: str) -> Optional[str]:
+    """Net change after `previous` then `kind`; None means the two cancel out."""
+    if previous is None:
+        return kind
+    if previous == CREATED:
+        return None if kind == DELETED else CREATED
+    if previous == DELETED:
+        return MODIFIED if kind == CREATED else DELETED
+    return DELETED if kind == DELETED else MODIFIED
+
+
+def _scan(watch: Watch) -> Dict[str, Tuple[int, int]]:
+    """(mtime_ns, size) of every file under a polled watch."""
+    snapshot: Dict[str, Tuple[int, int]] = {}
+    if not os.path.isdir(watch.path):
+        try:
+            st = os.stat(watch.path)
+            snapshot[watch.path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return snapshot
+    stack = [watch.path]
+    watch.truncated = False
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if watch.recursive:
+                                stack.append(entry.path)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+                    if len(snapshot) >= MAX_POLLED_FILES:
+                        watch.truncated = True
+                        return snapshot
+        except OSError:
+            continue
+    return snapshot
+
+
+class FileWatcher:
+    """Owns the watches, the backends and the sequence-numbered change feed."""
+
+    def __init__(self, max_events: int = MAX_EVENTS, poll_seconds: float = POLL_SECONDS,
+                 backend: Optional[str] = None):
+        self.poll_seconds = poll_seconds
+        self.preferred = backend or os.getenv("DAVID_WATCH_BACKEND", "auto")
+        self._events: "deque[Tuple[int, float, str, str]]" = deque(maxlen=max_events)  # (seq, time, kind, path)
+        self._seq = 0
+        self._watches: Dict[int, Watch] = {}
+        self._next_id = 1
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[List[str]], None]] = []
+        self._observer = None
+        self._poller: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # -- feed -----------------------------------------------------------------
+
+    @property
+    def cursor(self) -> int:
+        return self._seq
+
+    def subscribe(self, callback: Callable[[List[str]], None]) -> None:
+        """Call `callback(paths)` with every batch of changed paths."""
+        self._listeners.append(callback)
+
+    def record(self, changes: List[Tuple[str, str]]) -> None:
+        """Append (kind, path) changes to the feed and notify subscribers."""
+        if not changes:
+            return
+        now = time.time()
+        with self._lock:
+            for kind, path in changes:
+                self._seq += 1
+                self._events.append((self._seq, now, kind, path))
+        paths = [path for _, path in changes]
+        for callback in list(self._listeners):
+            try:
+                callback(paths)
+            except Exception as e:
+                logger.warning("file_watcher.listener_failed error=%s", e)
+
+    def changes_since(self, cursor: int = 0, path: Optional[str] = None):
+        """Net changes after `cursor`: (changes, new cursor, missed).
+
+        changes is [(kind, path, events)] oldest first; missed is True when the feed has
+        already dropped events after `cursor`, so the caller should re-list instead.
+        """
+        prefix = _norm(path) if path else None
+        with self._lock:
+            events = list(self._events)
+            latest = self._seq
+        missed = bool(events) and cursor < events[0][0] - 1
+        net: Dict[str, List] = {}
+        for seq, _, kind, changed in events:
+            if seq <= cursor or (prefix and not _under(_norm(changed), prefix)):
+                continue
+            state = net.pop(changed, [None, 0])
+            state[0] = _coalesce(state[0], kind)
+            state[1] += 1
+            net[changed] = state  # re-inserted so the dict stays ordered by last change
+        changes = [(kind, changed, count) for changed, (kind, count) in net.items() if kind is not None]
+        return changes, latest, missed
+
+    # -- watches --------------------------------------------------------------
+
+    def covers(self, path: str) -> bool:
+        """True if every change under `path` (a normalized path) reaches the feed. A
+        non-recursive watch only covers the files directly inside it - a folder's contents
+        (including its own) can change below what it reports."""
+        with self._lock:
+            watches = [w for w in self._watches.values() if not w.truncated and _under(path, w.key)]
+        if any(w.recursive for w in watches):
+            return True
+        return any((path == w.key or os.path.dirname(path) == w.key) for w in watches) and not os.path.isdir(path)
+
+    def watches(self) -> List[Watch]:
+        with self._lock:
+            return list(self._watches.values())
+
+    def watch(self, path: str, recursive: bool = True) -> Watch:
+        path = os.path.abspath(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No such file or directory: {path}")
+        with self._lock:
+            for existing in self._watches.values():
+                if existing.key == _norm(path) and existing.recursive == recursive:
+                    return existing
+            if len(self._watches) >= MAX_WATCHES:
+                raise RuntimeError(f"Already watching {MAX_WATCHES} paths - unwatch one first")
+            watch = Watch(self._next_id, path, recursive, self._backend_name())
+            self._next_id += 1
+            if watch.backend == "watchdog":
+                self._start_watchdog(watch)
+            else:
+                watch.snapshot = _scan(watch)
+                self._start_poller()
+            self._watches[watch.id] = watch
+        logger.info("file_watcher.watch id=%d path=%s backend=%s", watch.id, path, watch.backend)
+        return watch
+
+    def unwatch(self, watch_id: int) -> bool:
+        with self._lock:
+            watch = self._watches.pop(watch_id, None)
+            if watch is None:
+                return False
+            if watch.handle is not None and self._observer is not None:
+                shared = any(w.handle is watch.handle for w in self._watches.values())
+                try:
+                    if shared:  # another watch uses the same folder schedule - drop only our handler
+                        self._observer.remove_handler_for_watch(watch.handler, watch.handle)
+                    else:
+                        self._observer.unschedule(watch.handle)
+                except (KeyError, ValueError):
+                    pass
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            self._watches.clear()
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"watches": len(self._watches), "cursor": self._seq, "buffered_events": len(self._events),
+                    "backends": sorted({w.backend for w in self._watches.values()})}
+
+    # -- backends -------------------------------------------------------------
+
+    def _backend_name(self) -> str:
+        if self.preferred == "polling":
+            return "polling"
+        if optional_import("watchdog.observers") is not None:
+            return "watchdog"
+        if self.preferred == "watchdog":
+            logger.warning("file_watcher.watchdog_missing falling back to polling")
+        return "polling"
+
+    def _start_watchdog(self, watch: Watch) -> None:
+        observers = optional_import("watchdog.observers")
+        events = optional_import("watchdog.events")
+        if self._observer is None:
+            self._observer = observers.Observer()
+            self._observer.daemon = True
+            self._observer.start()
+        watcher = self
+        is_dir = os.path.isdir(watch.path)
+        only = None if is_dir else watch.key  # a single file: drop events for its siblings
+
+        class _Handler(events.FileSystemEventHandler):
+            def on_any_event(self, event):
+                kind = {"created": CREATED, "modified": MODIFIED, "deleted": DELETED}.get(event.event_type)
+                if event.event_type == "moved":
+                    changes = [(DELETED, event.src_path), (CREATED, event.dest_path)]
+                # A folder's "modified" only says its listing changed - the child events cover that
+                elif kind and not (kind == MODIFIED and event.is_directory):
+                    changes = [(kind, event.src_path)]
+                else:
+                    return
+                if only is not None:
+                    changes = [(k, p) for k, p in changes if _norm(p) == only]
+                watcher.record(changes)
+
+        watch.handler = _Handler()
+        if is_dir:
+            watch.handle = self._observer.schedule(watch.handler, watch.path, recursive=watch.recursive)
+        else:
+            watch.handle = self._observer.schedule(watch.handler, os.path.dirname(watch.path), recursive=False)
+
+    def _start_poller(self) -> None:
+        if self._poller is not None and self._poller.is_alive():
+            return
+        self._stop.clear()
+        self._poller = threading.Thread(target=self._poll_loop, name="file-watcher-poll", daemon=True)
+        self._poller.start()
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            for watch in self.watches():
+                if watch.backend == "polling":
+                    self.poll(watch)
+
+    def poll(self, watch: Watch) -> None:
+        """Diff a polled watch against its last scan and record what changed."""
+        current = _scan(watch)
+        previous = watch.snapshot or {}
+        changes = [(DELETED, p) for p in previous.keys() - current.keys()]
+        for p, signature in current.items():
+            old = previous.get(p)
+            if old is None:
+                changes.append((CREATED, p))
+            elif old != signature:
+                changes.append((MODIFIED, p))
+        watch.snapshot = current
+        with self._lock:
+            still_watched = watch.id in self._watches
+        if still_watched:
+            self.record(changes)
+
+
+FILE_WATCHER = FileWatcher()
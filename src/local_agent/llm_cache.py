@@ -0,0 +1,175 @@
+# C:\David\src\local_agent\llm_cache.py
+# On-disk cache of model responses for deterministic requests
+#
+# Opt-in with DAVID_LLM_CACHE=1. Sits below the tool-bound model: the key is a SHA-256 of
+# the model(s), sampling params, bound tool set and the normalized message list (ids and
+# metadata ignored; text is kept exactly - indentation can be the whole question). Entries live in .david/llm_cache.sqlite with a TTL
+# (DAVID_LLM_CACHE_TTL seconds) and LRU eviction beyond DAVID_LLM_CACHE_ENTRIES rows.
+#
+# A request is only cached when its answer is reproducible:
+#   - temperature is 0, or a fixed seed is set (DAVID_LLM_SEED)
+#   - no tool result in the history came from a side-effecting tool - replaying an answer
+#     about a write or a command would hide that the world has changed since
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain_core.messages import BaseMessage, ToolMessage, message_to_dict, messages_from_dict
+
+from .storage import data_path
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "llm_cache.sqlite"
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 2000
+
+
+def llm_cache_enabled() -> bool:
+    return os.getenv("DAVID_LLM_CACHE", "0") == "1"
+
+
+def is_deterministic(params: Dict[str, Any]) -> bool:
+    return not params.get("temperature") or params.get("seed") is not None
+
+
+def normalize_messages(messages: Iterable[BaseMessage]) -> List[dict]:
+    """What the model sees of each message - no ids or metadata."""
+    normalized = []
+    for m in messages:
+        entry = {"type": m.type, "content": m.content}
+        tool_calls = getattr(m, "tool_calls", None)
+        if tool_calls:
+            entry["tool_calls"] = [{"name": c.get("name"), "args": c.get("args")} for c in tool_calls]
+        if isinstance(m, ToolMessage):
+            entry["name"] = m.name
+        normalized.append(entry)
+    return normalized
+
+
+def tool_signature(tools: Iterable[Any]) -> List[List[str]]:
+    """Bound tools by name and argument schema - rebinding a changed tool changes the key."""
+    signature = []
+    for t in tools:
+        schema = t.tool_call_schema.model_json_schema() if hasattr(t, "tool_call_schema") else {}
+        digest = hashlib.sha256(json.dumps(schema, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+        signature.append([t.name, digest])
+    return sorted(signature)
+
+
+class LLMResponseCache:
+    """SQLite key -> serialized AIMessage store with TTL and LRU eviction."""
+
+    def __init__(self, path=None, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self._path = path
+        self.ttl = ttl if ttl is not None else float(os.getenv("DAVID_LLM_CACHE_TTL", DEFAULT_TTL))
+        self.max_entries = max_entries or int(os.getenv("DAVID_LLM_CACHE_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    @property
+    def path(self):
+        return self._path or data_path(CACHE_FILE)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                     "created REAL NOT NULL, last_used REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)")
+        return conn
+
+    @staticmethod
+    def make_key(models: List[str], params: Dict[str, Any], tools: List[List[str]], messages: List[BaseMessage]) -> str:
+        payload = {"models": sorted(models), "params": params, "tools": tools,
+                   "messages": normalize_messages(messages)}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[BaseMessage]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        self.hits += 1
+        return messages_from_dict([json.loads(row[0])])[0]
+
+    def put(self, key: str, message: BaseMessage) -> None:
+        now = time.time()
+        data = json.dumps(message_to_dict(message))
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses (key, response, created, last_used, hits) "
+                         "VALUES (?, ?, ?, ?, 0)", (key, data, now, now))
+            conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                             "ORDER BY last_used ASC LIMIT ?)", (count - self.max_entries,))
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock, self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {"entries": entries, "hits": self.hits, "misses": self.misses, "skipped": self.skipped,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+LLM_CACHE = LLMResponseCache()
+
+
+def _fresh_copy(message: BaseMessage) -> BaseMessage:
+    """A cached answer as a new message - new id and tool-call ids, so threads never share them."""
+    update: Dict[str, Any] = {"id": None}
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        update["tool_calls"] = [{**c, "id": f"call_{uuid.uuid4().hex[:24]}"} for c in tool_calls]
+    return message.model_copy(update=update)
+
+
+class CachedModel:
+    """Wraps a tool-bound model (anything with ainvoke) with LLM_CACHE lookups."""
+
+    def __init__(self, inner, models: List[str], params: Dict[str, Any], tools: List[Any],
+                 side_effect_check, cache: LLMResponseCache = LLM_CACHE):
+        self.inner = inner
+        self.models = list(models)
+        self.params = dict(params)
+        self.tools = tool_signature(tools)
+        self.side_effect_check = side_effect_check
+        self.cache = cache
+
+    def _cacheable(self, messages: List[BaseMessage]) -> bool:
+        if not is_deterministic(self.params):
+            return False
+        return not any(isinstance(m, ToolMessage) and self.side_effect_check(m.name) for m in messages)
+
+    async def ainvoke(self, messages: List[BaseMessage], **kwargs):
+        if not self._cacheable(messages):
+            self.cache.skipped += 1
+            return await self.inner.ainvoke(messages, **kwargs)
+        key = self.cache.make_key(self.models, self.params, self.tools, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("llm_cache.hit key=%s", key[:12])
+            return _fresh_copy(cached)
+        response = await self.inner.ainvoke(messages, **kwargs)
+        try:
+            self.cache.put(key, response)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("llm_cache.put_failed error=%s", e)
+        return response
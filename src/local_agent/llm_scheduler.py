@@ -0,0 +1,181 @@
+# C:\David\src\local_agent\llm_scheduler.py
+# Fair scheduler for LLM requests - every session shares one local Ollama
+#
+# At most OLLAMA_NUM_PARALLEL requests run at once (Ollama queues the rest itself, with no
+# notion of sessions). Waiting requests are served by priority, then round-robin across
+# sessions, so one session's long tool loop can't starve other users' chat turns:
+#   INTERACTIVE - the first model call of a user turn, or a short prompt
+#   BACKGROUND  - tool-loop continuations with a long context
+# A request that has waited longer than DAVID_LLM_MAX_WAIT seconds is served as interactive.
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, List, Optional
+
+from langchain_core.messages import HumanMessage
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+CHARS_PER_TOKEN = 4
+SHORT_PROMPT_TOKENS = int(os.getenv("DAVID_SHORT_PROMPT_TOKENS", "1500"))
+MAX_WAIT_SECONDS = float(os.getenv("DAVID_LLM_MAX_WAIT", "30"))
+WAIT_SAMPLES = 500
+
+
+def request_priority(messages: list) -> int:
+    """INTERACTIVE for the start of a user turn or a short prompt, BACKGROUND otherwise."""
+    if messages and isinstance(messages[-1], HumanMessage):
+        return INTERACTIVE
+    chars = sum(len(m.content) if isinstance(m.content, str) else len(str(m.content)) for m in messages)
+    return INTERACTIVE if chars // CHARS_PER_TOKEN <= SHORT_PROMPT_TOKENS else BACKGROUND
+
+
+class _Request:
+    __slots__ = ("session_id", "priority", "enqueued", "future")
+
+    def __init__(self, session_id: str, priority: int):
+        self.session_id = session_id
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class LLMScheduler:
+    """Admission control for model calls. Must be used from a single event loop."""
+
+    def __init__(self, max_in_flight: Optional[int] = None, max_wait: float = MAX_WAIT_SECONDS):
+        self.max_in_flight = max(1, max_in_flight or int(os.getenv("OLLAMA_NUM_PARALLEL", "1") or 1))
+        self.max_wait = max_wait
+        # priority -> session -> FIFO of waiting requests; session order is the round-robin order
+        self._queues: Dict[int, "OrderedDict[str, Deque[_Request]]"] = {
+            INTERACTIVE: OrderedDict(), BACKGROUND: OrderedDict()}
+        self._in_flight: Dict[asyncio.Task, str] = {}
+        self._running = 0
+        self._waits: Dict[int, Deque[float]] = {p: deque(maxlen=WAIT_SAMPLES) for p in PRIORITY_NAMES}
+        self._granted = 0
+        self._cancelled = 0
+
+    # -- queueing -----------------------------------------------------------
+
+    def _queued(self) -> int:
+        return sum(len(q) for queues in self._queues.values() for q in queues.values())
+
+    def _pop_session(self, queues: "OrderedDict[str, Deque[_Request]]", session_id: str) -> _Request:
+        queue = queues.pop(session_id)
+        request = queue.popleft()
+        if queue:
+            queues[session_id] = queue  # back of the round-robin order
+        return request
+
+    def _next_request(self) -> Optional[_Request]:
+        now = time.monotonic()
+        # Starvation guard: the oldest background request jumps the line once it has waited too long
+        background = self._queues[BACKGROUND]
+        for session_id, queue in background.items():
+            if now - queue[0].enqueued >= self.max_wait:
+                return self._pop_session(background, session_id)
+        for priority in (INTERACTIVE, BACKGROUND):
+            queues = self._queues[priority]
+            if queues:
+                return self._pop_session(queues, next(iter(queues)))
+        return None
+
+    def _dispatch(self) -> None:
+        while self._running < self.max_in_flight:
+            request = self._next_request()
+            if request is None:
+                return
+            if request.future.done():  # cancelled while queued
+                continue
+            self._running += 1
+            request.future.set_result(None)
+
+    def _remove(self, request: _Request) -> None:
+        queues = self._queues[request.priority]
+        queue = queues.get(request.session_id)
+        if queue is not None and request in queue:
+            queue.remove(request)
+            if not queue:
+                del queues[request.session_id]
+
+    # -- public API ---------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self, session_id: Optional[str], priority: int = INTERACTIVE):
+        """Hold one of the in-flight slots for the duration of a model call."""
+        session_id = session_id or ""
+        request = _Request(session_id, priority)
+        queues = self._queues[priority]
+        queues.setdefault(session_id, deque()).append(request)
+        self._dispatch()
+        try:
+            await request.future
+        except asyncio.CancelledError:
+            if request.future.done() and not request.future.cancelled():
+                self._running -= 1  # granted in the same tick we were cancelled
+                self._dispatch()
+            else:
+                self._remove(request)
+            self._cancelled += 1
+            raise
+        wait = time.monotonic() - request.enqueued
+        self._waits[priority].append(wait)
+        self._granted += 1
+        if wait > 1:
+            logger.info("llm_scheduler.waited session=%s priority=%s seconds=%.2f",
+                        session_id, PRIORITY_NAMES[priority], wait)
+        task = asyncio.current_task()
+        self._in_flight[task] = session_id
+        try:
+            yield
+        finally:
+            self._in_flight.pop(task, None)
+            self._running -= 1
+            self._dispatch()
+
+    def cancel_session(self, session_id: str) -> int:
+        """Drop a disconnected session's queued requests and cancel its running ones."""
+        cancelled = 0
+        for queues in self._queues.values():
+            for request in queues.pop(session_id, ()):
+                request.future.cancel()
+                cancelled += 1
+        for task, owner in list(self._in_flight.items()):
+            if owner == session_id and not task.done():
+                task.cancel()
+                cancelled += 1
+        if cancelled:
+            logger.info("llm_scheduler.cancel_session session=%s requests=%d", session_id, cancelled)
+        return cancelled
+
+    def stats(self) -> dict:
+        def summary(samples: List[float]) -> dict:
+            if not samples:
+                return {"count": 0}
+            ordered = sorted(samples)
+            return {
+                "count": len(ordered),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._running,
+            "queued": self._queued(),
+            "sessions_waiting": len({s for queues in self._queues.values() for s in queues}),
+            "granted": self._granted,
+            "cancelled": self._cancelled,
+            "queue_wait": {PRIORITY_NAMES[p]: summary(list(w)) for p, w in self._waits.items()},
+        }
+
+
+LLM_SCHEDULER = LLMScheduler()
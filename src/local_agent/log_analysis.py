@@ -0,0 +1,317 @@
+# C:\David\src\local_agent\log_analysis.py
+# Streaming log reading for log_analyze - backward tail, follow from an offset, template summaries
+#
+# Nothing here loads a whole log. tail reads fixed-size blocks backwards from the end until
+# it has enough matching lines; follow reads forward from a saved byte offset and returns the
+# offset to continue from (only whole lines are consumed, so a line being written is picked up
+# next time); summary streams every line once and folds it into a template - the line with
+# its timestamp removed and numbers, ids, hashes and addresses masked - with a count, first
+# and last time seen, and a per-time-bucket histogram.
+#
+# Memory stays bounded however large the log: at most MAX_TEMPLATES templates (the rarer half
+# is dropped and counted as "other" when full) and about MAX_BUCKETS histogram buckets
+# (minutes are merged into hours, hours into days when there are too many).
+#
+# The systemd journal is read the same way through `journalctl -o json` on a pipe; its
+# cursor plays the role of the byte offset.
+
+import json
+import os
+import re
+import subprocess
+import time
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+BLOCK_BYTES = 64 * 1024
+MAX_LINE_CHARS = 2000          # longer lines are cut when shown or templated
+MAX_TEMPLATES = 4000
+MAX_BUCKETS = 240
+BUCKET_LEVELS = ("minute", "hour", "day")
+JOURNAL = "journal"
+
+# Leading timestamps: ISO 8601 / RFC 3339, syslog ("Oct 19 12:34:56"), Apache/nginx ("[19/Oct/2026:12:34:56")
+_TIME_PATTERNS = [
+    re.compile(r"(?P<date>\d{4}-\d{2}-\d{2})[T ](?P<hh>\d{2}):(?P<mm>\d{2}):\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"),
+    re.compile(r"(?P<date>[A-Z][a-z]{2}\s+\d{1,2}) (?P<hh>\d{2}):(?P<mm>\d{2}):\d{2}"),
+    re.compile(r"\[(?P<date>\d{2}/[A-Z][a-z]{2}/\d{4}):(?P<hh>\d{2}):(?P<mm>\d{2}):\d{2}(?: [+-]\d{4})?\]"),
+]
+_LEVEL_RE = re.compile(r"\b(FATAL|CRITICAL|ERROR|ERR|WARNING|WARN|INFO|NOTICE|DEBUG|TRACE)\b", re.IGNORECASE)
+_LEVELS = {"FATAL": "ERROR", "CRITICAL": "ERROR", "ERR": "ERROR", "WARNING": "WARN", "NOTICE": "INFO"}
+# Masks run in order; digits go last, after the patterns that contain them. Each pass is
+# guarded by a cheap substring check - masking is most of the cost of a summary.
+_UUID_RE = re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b")
+_EMAIL_RE = re.compile(r"\b[\w.+-]+@[\w-]+\.[\w.-]+\b")
+_HEX_RE = re.compile(r"\b(?:0x[0-9a-fA-F]+|[0-9a-fA-F]{8,})\b")
+_DIGITS_RE = re.compile(r"\d+")  # inside words too: user123, req-8812
+_IP_MASKED = "<n>.<n>.<n>.<n>"
+_SPACES = re.compile(r"\s+")
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="replace").rstrip("\r\n")[:MAX_LINE_CHARS]
+
+
+def _matches(line: str, regex: Optional[Pattern]) -> bool:
+    return regex is None or regex.search(line) is not None
+
+
+def compile_filter(pattern: Optional[str]) -> Optional[Pattern]:
+    return re.compile(pattern, re.IGNORECASE) if pattern else None
+
+
+# -- files ---------------------------------------------------------------------
+
+
+def iter_lines_backward(path: str, block: int = BLOCK_BYTES) -> Iterator[bytes]:
+    """Lines of `path` from last to first, reading `block` bytes at a time from the end."""
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            size = min(block, position)
+            position -= size
+            f.seek(position)
+            chunk = f.read(size) + remainder
+            lines = chunk.split(b"\n")
+            remainder = lines.pop(0)  # may continue in the previous block
+            for line in reversed(lines):
+                yield line
+        yield remainder
+
+
+def tail_file(path: str, count: int, regex: Optional[Pattern] = None) -> Tuple[List[str], int]:
+    """Last `count` matching lines, oldest first, and the offset just past the last whole line."""
+    size = os.path.getsize(path)
+    found: List[str] = []
+    first = True
+    end_offset = size
+    for raw in iter_lines_backward(path):
+        if first:
+            first = False
+            if raw == b"":          # the file ends with a newline
+                continue
+            end_offset = size - len(raw)  # a partial last line is read again by follow
+        line = _decode(raw)
+        if _matches(line, regex):
+            found.append(line)
+            if len(found) >= count:
+                break
+    found.reverse()
+    return found, end_offset
+
+
+def follow_file(path: str, offset: int, count: int, regex: Optional[Pattern] = None):
+    """Whole lines appended after `offset`: (lines, next offset, rotated, more).
+
+    Stops after `count` matching lines (more=True). rotated=True means the file is now shorter
+    than `offset` - it was truncated or replaced - and reading restarted at the beginning.
+    """
+    size = os.path.getsize(path)
+    rotated = offset > size
+    if rotated:
+        offset = 0
+    found: List[str] = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            raw = f.readline()
+            if not raw.endswith(b"\n"):
+                break  # EOF, or a line still being written
+            offset += len(raw)
+            line = _decode(raw)
+            if _matches(line, regex):
+                found.append(line)
+                if len(found) >= count:
+                    return found, offset, rotated, offset < size
+    return found, offset, rotated, False
+
+
+def iter_file(path: str, offset: int = 0) -> Iterator[Tuple[str, int]]:
+    """(line, offset after it) for every whole line from `offset`."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            yield _decode(raw), offset
+
+
+# -- journal -------------------------------------------------------------------
+
+_JOURNAL_LEVELS = {0: "ERROR", 1: "ERROR", 2: "ERROR", 3: "ERROR", 4: "WARN", 5: "INFO", 6: "INFO", 7: "DEBUG"}
+
+
+def journal_unit(source: Optional[str]) -> Optional[str]:
+    """Unit of a "journal" / "journal:<unit>" source; None for plain files."""
+    if source is None or not (source == JOURNAL or source.startswith(JOURNAL + ":")):
+        return None
+    return source[len(JOURNAL) + 1:] if ":" in source else ""
+
+
+def iter_journal(unit: str = "", reverse: bool = False, after_cursor: Optional[str] = None,
+                 since: Optional[str] = None) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """(line, cursor, level) for journal entries, streamed from journalctl on a pipe."""
+    cmd = ["journalctl", "-o", "json", "--no-pager"]
+    if unit:
+        cmd += ["-u", unit]
+    if reverse:
+        cmd.append("-r")
+    if after_cursor:
+        cmd += ["--after-cursor", after_cursor]
+    if since:
+        cmd += ["--since", since]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        for raw in proc.stdout:
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                continue
+            message = entry.get("MESSAGE")
+            if isinstance(message, list):  # binary messages arrive as byte arrays
+                message = bytes(message).decode("utf-8", errors="replace")
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S",
+                                  time.localtime(int(entry.get("__REALTIME_TIMESTAMP", 0)) / 1e6))
+            ident = entry.get("SYSLOG_IDENTIFIER") or entry.get("_COMM") or "-"
+            pid = entry.get("_PID")
+            line = f"{stamp} {ident}{f'[{pid}]' if pid else ''}: {message or ''}"[:MAX_LINE_CHARS]
+            try:
+                level = _JOURNAL_LEVELS.get(int(entry.get("PRIORITY", 6)))
+            except ValueError:
+                level = None
+            yield line, entry.get("__CURSOR"), level
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+# -- templates -----------------------------------------------------------------
+
+
+def time_key(line: str) -> Tuple[Optional[Tuple[str, str, str]], str]:
+    """((date, hh, mm) of a leading timestamp or None, the line with that timestamp removed)."""
+    head = line[:64]
+    for pattern in _TIME_PATTERNS:
+        match = pattern.search(head)
+        if match:
+            rest = line[:match.start()] + line[match.end():]
+            return (match.group("date"), match.group("hh"), match.group("mm")), rest
+    return None, line
+
+
+def _hex(match) -> str:
+    text = match.group()
+    # Hashes and addresses mix digits and letters; plain numbers and words are left alone
+    return text if text.isdigit() or text.isalpha() else "<hex>"
+
+
+def template_of(message: str) -> str:
+    if message.count("-") >= 4:
+        message = _UUID_RE.sub("<uuid>", message)
+    if "@" in message:
+        message = _EMAIL_RE.sub("<email>", message)
+    message = _DIGITS_RE.sub("<n>", _HEX_RE.sub(_hex, message))
+    if _IP_MASKED in message:
+        message = message.replace(_IP_MASKED + ":<n>", "<ip>").replace(_IP_MASKED, "<ip>")
+    if "  " in message or "\t" in message:
+        message = _SPACES.sub(" ", message)
+    return message.strip()
+
+
+def level_of(message: str) -> Optional[str]:
+    match = _LEVEL_RE.search(message[:200])
+    if not match:
+        return None
+    word = match.group(1).upper()
+    return _LEVELS.get(word, word)
+
+
+def _bucket(stamp: Tuple[str, str, str], level: str) -> str:
+    date, hh, mm = stamp
+    if level == "day":
+        return date
+    if level == "hour":
+        return f"{date} {hh}:00"
+    return f"{date} {hh}:{mm}"
+
+
+class LogSummary:
+    """Bounded-memory aggregation of log lines into templates and time buckets."""
+
+    def __init__(self, bucket: str = "hour"):
+        if bucket not in BUCKET_LEVELS:
+            raise ValueError(f"bucket must be one of {', '.join(BUCKET_LEVELS)}")
+        self.bucket_level = bucket
+        self.lines = 0
+        self.matched = 0
+        self.other = 0                 # lines whose rare template was evicted
+        self.evicted_templates = 0
+        self.levels: Dict[str, int] = {}
+        self.templates: Dict[str, list] = {}   # template -> [count, first time, last time, example, level]
+        self.buckets: Dict[str, List[int]] = {}  # bucket -> [lines, errors]
+        self._stamps: Dict[str, Tuple[str, str, str]] = {}  # bucket -> a stamp in it, for coarsening
+
+    def add(self, line: str, level: Optional[str] = None) -> None:
+        self.matched += 1
+        stamp, message = time_key(line)
+        level = level or level_of(message)
+        if level:
+            self.levels[level] = self.levels.get(level, 0) + 1
+        when = None
+        if stamp:
+            key = _bucket(stamp, self.bucket_level)
+            counts = self.buckets.get(key)
+            if counts is None:
+                counts = self.buckets[key] = [0, 0]
+                self._stamps[key] = stamp
+                if len(self.buckets) > MAX_BUCKETS:
+                    self._coarsen()
+                    key = _bucket(stamp, self.bucket_level)
+                    counts = self.buckets[key]
+            counts[0] += 1
+            if level == "ERROR":
+                counts[1] += 1
+            when = f"{stamp[0]} {stamp[1]}:{stamp[2]}"
+        template = template_of(message)
+        entry = self.templates.get(template)
+        if entry is None:
+            if len(self.templates) >= MAX_TEMPLATES:
+                self._evict()
+            self.templates[template] = [1, when, when, line, level]
+        else:
+            entry[0] += 1
+            if when:
+                entry[1] = entry[1] or when
+                entry[2] = when
+
+    def _coarsen(self) -> None:
+        """Too many buckets - merge them into the next larger unit."""
+        index = BUCKET_LEVELS.index(self.bucket_level)
+        if index + 1 >= len(BUCKET_LEVELS):
+            return  # one bucket per day is small enough for any log
+        self.bucket_level = BUCKET_LEVELS[index + 1]
+        merged: Dict[str, List[int]] = {}
+        stamps: Dict[str, Tuple[str, str, str]] = {}
+        for key, (count, errors) in self.buckets.items():
+            stamp = self._stamps[key]
+            new_key = _bucket(stamp, self.bucket_level)
+            slot = merged.setdefault(new_key, [0, 0])
+            slot[0] += count
+            slot[1] += errors
+            stamps.setdefault(new_key, stamp)
+        self.buckets, self._stamps = merged, stamps
+        if len(self.buckets) > MAX_BUCKETS:
+            self._coarsen()
+
+    def _evict(self) -> None:
+        """Drop the rarer half of the templates; their lines are counted as "other"."""
+        ranked = sorted(self.templates.items(), key=lambda item: item[1][0], reverse=True)
+        keep = MAX_TEMPLATES // 2
+        for _, entry in ranked[keep:]:
+            self.other += entry[0]
+        self.evicted_templates += len(ranked) - keep
+        self.templates = dict(ranked[:keep])
+
+    def top(self, n: int) -> List[Tuple[str, list]]:
+        return sorted(self.templates.items(), key=lambda item: item[1][0], reverse=True)[:n]
@@ -0,0 +1,219 @@
+# C:\David\src\local_agent\model_pool.py
+# Pool of Ollama backends - health checks, load-balanced routing and failover
+#
+# Backends come from DAVID_OLLAMA_BACKENDS, either comma-separated "url[=model]" entries
+#   DAVID_OLLAMA_BACKENDS=http://box1:11434=qwen3:14b,http://box2:11434
+# or a JSON list [{"url": ..., "model": ..., "parallel": 2}, ...]. Without it the pool has a
+# single backend at OLLAMA_HOST, so nothing changes for a one-box setup.
+#
+# Routing (DAVID_POOL_STRATEGY):
+#   least_outstanding - fewest requests in flight, faster backend on ties (default)
+#   throughput        - lowest expected finish time: (outstanding + 1) / EWMA tokens-per-second
+# A backend that errors is taken out of rotation and re-checked via /api/tags after a backoff;
+# the request fails over to the next backend.
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "http://127.0.0.1:11434"
+HEALTH_INTERVAL = float(os.getenv("DAVID_POOL_HEALTH_INTERVAL", "30"))
+HEALTH_TIMEOUT = 3.0
+RETRY_BACKOFF = (5, 15, 60)  # seconds out of rotation after 1, 2, 3+ consecutive failures
+EWMA_ALPHA = 0.3
+
+
+def backend_specs(default_model: str) -> List[Dict[str, Any]]:
+    """Backend list from DAVID_OLLAMA_BACKENDS (or the single OLLAMA_HOST backend)."""
+    parallel = int(os.getenv("OLLAMA_NUM_PARALLEL", "1") or 1)
+    raw = os.getenv("DAVID_OLLAMA_BACKENDS", "").strip()
+    if not raw:
+        host = os.getenv("OLLAMA_HOST") or DEFAULT_HOST
+        if "://" not in host:
+            host = "http://" + host
+        return [{"url": host, "model": default_model, "parallel": parallel}]
+    if raw.startswith("["):
+        entries = json.loads(raw)
+        return [{"url": e["url"].rstrip("/"), "model": e.get("model") or default_model,
+                 "parallel": int(e.get("parallel", parallel))} for e in entries]
+    specs = []
+    for entry in filter(None, (e.strip() for e in raw.split(","))):
+        url, _, model = entry.partition("=")
+        specs.append({"url": url.rstrip("/"), "model": model or default_model, "parallel": parallel})
+    return specs
+
+
+class Backend:
+    """One Ollama endpoint serving one model, with its load and health bookkeeping."""
+
+    def __init__(self, url: str, model: str, parallel: int, llm):
+        self.url = url
+        self.model = model
+        self.parallel = max(1, parallel)
+        self.llm = llm
+        self.outstanding = 0
+        self.tokens_per_second: Optional[float] = None
+        self.healthy = True
+        self.failures = 0
+        self.retry_at = 0.0
+        self.last_check = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}@{self.url}"
+
+    def available(self, now: float) -> bool:
+        return self.healthy or now >= self.retry_at
+
+    def record_success(self, elapsed: float, output_tokens: Optional[int]) -> None:
+        self.healthy, self.failures = True, 0
+        if output_tokens and elapsed > 0:
+            rate = output_tokens / elapsed
+            self.tokens_per_second = rate if self.tokens_per_second is None else (
+                EWMA_ALPHA * rate + (1 - EWMA_ALPHA) * self.tokens_per_second)
+
+    def record_failure(self, now: float) -> None:
+        self.errors += 1
+        self.failures += 1
+        self.healthy = False
+        self.retry_at = now + RETRY_BACKOFF[min(self.failures, len(RETRY_BACKOFF)) - 1]
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url, "model": self.model, "healthy": self.healthy,
+            "outstanding": self.outstanding, "parallel": self.parallel,
+            "tokens_per_second": round(self.tokens_per_second, 1) if self.tokens_per_second else None,
+            "requests": self.requests, "errors": self.errors,
+        }
+
+
+def _output_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage.get("output_tokens"):
+        return usage["output_tokens"]
+    return (getattr(response, "response_metadata", None) or {}).get("eval_count")
+
+
+class ModelPool:
+    """Routes each model call to one healthy backend, failing over to the others on error."""
+
+    def __init__(self, backends: List[Backend], strategy: Optional[str] = None,
+                 runnables: Optional[Dict[int, Any]] = None):
+        if not backends:
+            raise ValueError("ModelPool needs at least one backend")
+        self.backends = backends
+        self.strategy = strategy or os.getenv("DAVID_POOL_STRATEGY", "least_outstanding")
+        self._runnables = runnables or {}  # id(backend) -> what to invoke instead of backend.llm
+
+    @classmethod
+    def from_env(cls, default_model: str, model: Optional[str] = None, **llm_kwargs) -> "ModelPool":
+        """Pool over the configured backends; `model` serves the same model on all of them."""
+        from langchain_ollama import ChatOllama
+        backends = [Backend(s["url"], model or s["model"], s["parallel"],
+                            ChatOllama(model=model or s["model"], base_url=s["url"], **llm_kwargs))
+                    for s in backend_specs(default_model)]
+        return cls(backends)
+
+    @property
+    def capacity(self) -> int:
+        """Requests the pool can run at once - the scheduler's in-flight limit."""
+        return sum(b.parallel for b in self.backends)
+
+    def bind_tools(self, tools: list, **kwargs) -> "ModelPool":
+        """A pool over the same backends - sharing their load and health - that calls them with
+        `tools` bound. This pool is left as it was, like ChatOllama.bind_tools."""
+        runnables = {id(b): b.llm.bind_tools(tools, **kwargs) for b in self.backends}
+        return ModelPool(self.backends, self.strategy, runnables)
+
+    # -- routing ------------------------------------------------------------
+
+    def _score(self, backend: Backend):
+        if self.strategy == "throughput":
+            # Unmeasured backends look fast so they get tried (and measured)
+            return (backend.outstanding + 1) / (backend.tokens_per_second or 1e9), 0
+        return backend.outstanding / backend.parallel, -(backend.tokens_per_second or 0)
+
+    def ranked(self) -> List[Backend]:
+        """Backends in the order a request should try them - healthy first, best score first."""
+        now = time.monotonic()
+        candidates = [b for b in self.backends if b.available(now)] or list(self.backends)
+        return sorted(candidates, key=lambda b: (not b.healthy, self._score(b)))
+
+    async def ainvoke(self, messages, **kwargs):
+        last_error = None
+        for backend in self.ranked():
+            backend.outstanding += 1
+            backend.requests += 1
+            start = time.perf_counter()
+            try:
+                runnable = self._runnables.get(id(backend), backend.llm)
+                response = await runnable.ainvoke(messages, **kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                backend.record_failure(time.monotonic())
+                logger.warning("model_pool.backend_failed backend=%s failures=%d error=%s",
+                               backend.name, backend.failures, e)
+                last_error = e
+                continue
+            finally:
+                backend.outstanding -= 1
+            elapsed = time.perf_counter() - start
+            backend.record_success(elapsed, _output_tokens(response))
+            logger.debug("model_pool.routed backend=%s seconds=%.2f", backend.name, elapsed)
+            return response
+        raise last_error
+
+    # -- health -------------------------------------------------------------
+
+    async def check_backend(self, backend: Backend) -> bool:
+        """GET /api/tags - healthy if the server answers and has the backend's model."""
+        import httpx
+
+        try:
+            async with httpx.AsyncClient(timeout=HEALTH_TIMEOUT) as client:
+                response = await client.get(f"{backend.url}/api/tags")
+                response.raise_for_status()
+                names = {m.get("name") for m in response.json().get("models", [])}
+            healthy = backend.model in names or f"{backend.model}:latest" in names
+        except Exception as e:
+            logger.info("model_pool.health_failed backend=%s error=%s", backend.name, e)
+            healthy = False
+        backend.last_check = time.monotonic()
+        if healthy:
+            backend.healthy, backend.failures = True, 0
+        elif backend.healthy or backend.retry_at <= backend.last_check:
+            backend.record_failure(backend.last_check)
+        return healthy
+
+    async def check_health(self) -> Dict[str, bool]:
+        results = await asyncio.gather(*(self.check_backend(b) for b in self.backends))
+        return {b.name: ok for b, ok in zip(self.backends, results)}
+
+    async def monitor(self, interval: float = HEALTH_INTERVAL) -> None:
+        """Re-check every backend periodically; run as a background task."""
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        return {"strategy": self.strategy, "backends": [b.stats() for b in self.backends]}
+
+
+_active_pool: Optional[ModelPool] = None
+
+
+def set_active_pool(pool: ModelPool) -> None:
+    global _active_pool
+    _active_pool = pool
+
+
+def get_active_pool() -> Optional[ModelPool]:
+    return _active_pool
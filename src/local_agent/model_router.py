@@ -0,0 +1,140 @@
+# C:\David\src\local_agent\model_router.py
+# Tiered model routing - trivial chat goes to a small model without tools, real work to the big one
+#
+# Enabled by setting DAVID_SMALL_MODEL (e.g. qwen3:1.7b). The router runs once per user turn:
+#   - a cheap heuristic picks "small" for greetings, thanks and short small talk, and "large"
+#     for anything mentioning files, commands, code, paths or other tool work. Affirmations
+#     ("yes", "ok, do it") are never small talk - they usually confirm a proposed action - and
+#     nothing goes small while the last assistant message asked a question or called tools
+#   - with DAVID_ROUTER_MODE=model, turns the heuristic can't decide are classified by the
+#     small model itself; otherwise they go to the large model
+# Tool-loop continuations always stay on the large model.
+
+import logging
+import os
+import re
+import time
+from collections import Counter
+from typing import Optional, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from .llm_scheduler import INTERACTIVE, LLM_SCHEDULER
+
+logger = logging.getLogger(__name__)
+
+SMALL = "small"
+LARGE = "large"
+
+SHORT_TURN_CHARS = 80
+
+_TRIVIAL_RE = re.compile(
+    r"^\s*(hi|hello|hey|yo|hiya|howdy|good (morning|afternoon|evening|night)|thanks?( you)?|thx|ty|"
+    r"cheers|bye|goodbye|see you|how are you( doing)?|what'?s up|who are you|lol)\b[\s!.?,:)]*(david)?[\s!.?]*$",
+    re.IGNORECASE,
+)
+_TASK_RE = re.compile(
+    r"(\b(file|folder|director(y|ies)|path|read|write|edit|delete|copy|move|rename|create|list|find|"
+    r"search|run|execute|install|command|script|code|python|java|node|powershell|bash|cmd|function|"
+    r"class|bug|error|fix|debug|compile|build|test|process|service|registry|network|ping|disk|cpu|"
+    r"memory|port|database|sql|zip|log|download|open|screenshot|check|show|status)\b"
+    r"|[\\/]|\.\w{1,4}\b|`|[{}();=<>])",
+    re.IGNORECASE,
+)
+
+ROUTER_PROMPT = (
+    "Classify the user's message. Answer with exactly one word: CHAT if it is greeting, thanks "
+    "or small talk that needs no tools, files, commands or code; TASK otherwise, including any "
+    "confirmation or go-ahead such as yes, ok or do it."
+)
+
+
+def router_mode() -> str:
+    return os.getenv("DAVID_ROUTER_MODE", "heuristic")
+
+
+def _awaits_reply(messages: list) -> bool:
+    """True if the latest assistant message proposed something - a question or tool calls."""
+    for msg in reversed(messages[:-1]):
+        if isinstance(msg, AIMessage):
+            content = msg.content if isinstance(msg.content, str) else str(msg.content)
+            return bool(getattr(msg, "tool_calls", None)) or "?" in content
+    return False
+
+
+def heuristic_route(text: str) -> Tuple[Optional[str], str]:
+    """(tier, reason) - tier is None when the heuristic can't tell."""
+    if _TRIVIAL_RE.match(text):
+        return SMALL, "smalltalk"
+    if _TASK_RE.search(text):
+        return LARGE, "task_keywords"
+    if len(text) > SHORT_TURN_CHARS:
+        return LARGE, "long_turn"
+    return None, "undecided"
+
+
+class RouterStats:
+    """Routing decisions and per-tier model latency, to show what the small tier saves."""
+
+    def __init__(self):
+        self.decisions = Counter()
+        self.reasons = Counter()
+        self._latency = {SMALL: [0, 0.0], LARGE: [0, 0.0]}  # tier -> [calls, total seconds]
+        self.fallbacks = 0
+
+    def record_decision(self, tier: str, reason: str) -> None:
+        self.decisions[tier] += 1
+        self.reasons[reason] += 1
+
+    def record_latency(self, tier: str, seconds: float) -> None:
+        entry = self._latency[tier]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def mean_latency(self, tier: str) -> Optional[float]:
+        calls, total = self._latency[tier]
+        return total / calls if calls else None
+
+    def stats(self) -> dict:
+        small, large = self.mean_latency(SMALL), self.mean_latency(LARGE)
+        saved = None
+        if small is not None and large is not None:
+            # Estimate: each small-tier call would have cost a mean large-tier call instead
+            saved = round(self._latency[SMALL][0] * max(0.0, large - small), 2)
+        return {
+            "decisions": dict(self.decisions),
+            "reasons": dict(self.reasons),
+            "mean_latency_s": {SMALL: small and round(small, 3), LARGE: large and round(large, 3)},
+            "estimated_seconds_saved": saved,
+            "fallbacks": self.fallbacks,
+        }
+
+
+ROUTER_STATS = RouterStats()
+
+
+async def route_turn(messages: list, small_llm=None, session_id: Optional[str] = None) -> str:
+    """Tier for the next model call of this turn."""
+    if small_llm is None or not messages or not isinstance(messages[-1], HumanMessage):
+        return LARGE
+    content = messages[-1].content
+    text = content if isinstance(content, str) else str(content)
+    tier, reason = heuristic_route(text)
+    if tier != LARGE and _awaits_reply(messages):
+        tier, reason = LARGE, "reply_to_proposal"
+    if tier is None:
+        tier, reason = LARGE, "undecided"
+        if router_mode() == "model":
+            start = time.perf_counter()
+            try:
+                async with LLM_SCHEDULER.slot(session_id, INTERACTIVE):
+                    verdict = await small_llm.ainvoke([SystemMessage(content=ROUTER_PROMPT),
+                                                       HumanMessage(content=text)])
+                answer = str(verdict.content).strip().upper()
+                tier, reason = (SMALL, "model_chat") if "CHAT" in answer and "TASK" not in answer else (LARGE, "model_task")
+            except Exception as e:
+                logger.warning("router.classify_failed error=%s", e)
+            logger.debug("router.classified seconds=%.2f", time.perf_counter() - start)
+    ROUTER_STATS.record_decision(tier, reason)
+    logger.info("router.decision tier=%s reason=%s chars=%d", tier, reason, len(text))
+    return tier
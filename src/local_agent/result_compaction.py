@@ -0,0 +1,99 @@
+# C:\David\src\local_agent\result_compaction.py
+# Token-aware compaction of tool results before they enter the conversation state
+#
+# Every ToolMessage is held to a per-tool token budget. Oversized results keep their head
+# and tail as a preview; the full text goes to the content-addressed spill store, which the
+# model can page through with read_spill. The message only carries the handle
+# (additional_kwargs["spill"]), so checkpoints never hold the full payload.
+
+import logging
+import os
+from typing import Optional, Tuple
+
+from langchain_core.messages import ToolMessage
+
+from .spill_store import spill
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4          # rough average for English text and code
+HEAD_FRACTION = 0.7          # share of the budget kept from the start of the output
+DEFAULT_TOKEN_BUDGET = int(os.getenv("DAVID_TOOL_TOKEN_BUDGET", "1500"))
+
+# Per-tool budgets in tokens; None disables compaction for that tool
+TOOL_TOKEN_BUDGETS = {
+    "read_file": 3000,
+    "execute_command": 2000,
+    "python_execute": 2000,
+    "execute_powershell": 2000,
+    "execute_batch": 2000,
+    "node_execute": 2000,
+    "java_execute": 2000,
+    "directory_tree": 1500,
+    "file_search": 1200,
+    "environment_variables": 800,
+    "netstat": 1000,
+    "list_processes": 1000,
+    "log_analyze": 2500,
+    "profile_data": 2500,
+    "read_spill": None,       # already paged by the caller
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def budget_for(tool_name: Optional[str]) -> Optional[int]:
+    return TOOL_TOKEN_BUDGETS.get(tool_name, DEFAULT_TOKEN_BUDGET)
+
+
+def compact_text(text: str, budget_tokens: int, thread_id: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """Head/tail preview of `text` within `budget_tokens` and the spill handle of the full text."""
+    max_chars = budget_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text, None
+
+    head_chars = int(max_chars * HEAD_FRACTION)
+    tail_chars = max_chars - head_chars
+    head = text[:head_chars]
+    tail = text[-tail_chars:] if tail_chars > 0 else ""
+    # Prefer whole lines when a line break is close to the cut
+    newline = head.rfind("\n")
+    if newline > head_chars * 0.8:
+        head = head[:newline + 1]
+    newline = tail.find("\n")
+    if 0 <= newline < tail_chars * 0.2:
+        tail = tail[newline + 1:]
+
+    handle = spill(text, thread_id)
+    omitted = len(text) - len(head) - len(tail)
+    marker = (f"\n[... {omitted:,} chars (~{omitted // CHARS_PER_TOKEN:,} tokens) omitted - "
+              f"full output ({len(text):,} chars) saved as spill handle {handle}. "
+              f"Use read_spill(handle=\"{handle}\", offset={len(head)}) to page through it ...]\n")
+    return head + marker + tail, handle
+
+
+def compact_message(message, thread_id: Optional[str] = None):
+    """Compacted copy of a ToolMessage (same id, so add_messages replaces it); other messages pass through."""
+    if not isinstance(message, ToolMessage) or not isinstance(message.content, str):
+        return message
+    budget = budget_for(message.name)
+    if budget is None or estimate_tokens(message.content) <= budget:
+        return message
+    compacted, handle = compact_text(message.content, budget, thread_id)
+    logger.info("compaction.tool_result tool=%s chars=%d compacted=%d spill=%s", message.name,
+                len(message.content), len(compacted), handle)
+    additional_kwargs = {**message.additional_kwargs, "spill": {"handle": handle, "chars": len(message.content)}}
+    # Artifacts are never sent to the model but would still be checkpointed
+    return message.model_copy(update={"content": compacted, "additional_kwargs": additional_kwargs,
+                                      "artifact": None})
+
+
+def compact_tool_output(output, thread_id: Optional[str] = None):
+    """Apply compact_message to a tool node's output ({"messages": [...]} or a list)."""
+    if isinstance(output, dict) and "messages" in output:
+        return {**output, "messages": [compact_message(m, thread_id) for m in output["messages"]]}
+    if isinstance(output, list):
+        return [compact_message(m, thread_id) for m in output]
+    return output
@@ -0,0 +1,101 @@
+# C:\David\src\local_agent\session_context.py
+# Per-session execution context - working directory, env overrides and path root for tools
+#
+# change_directory / set_environment_variable used to mutate the process (os.chdir, os.environ),
+# which leaked between concurrent Chainlit sessions. Tools now read the context of the session
+# they run for, selected with session_scope() around each tool batch.
+
+import contextvars
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+def _default_root() -> str:
+    """DAVID_ROOT, else C:\\David where it exists, else the directory the app was started in."""
+    root = os.getenv("DAVID_ROOT")
+    if root:
+        return root
+    return "C:\\David" if os.path.isdir("C:\\David") else os.getcwd()
+
+
+DEFAULT_ROOT = _default_root()
+
+
+class SessionContext:
+    """Mutable per-session state the tools use instead of process globals."""
+
+    def __init__(self, session_id: str, root: str = DEFAULT_ROOT):
+        self.session_id = session_id
+        self.root = root
+        self.cwd = root
+        self.env_overrides: Dict[str, str] = {}
+
+    def resolve(self, path: str) -> str:
+        """Relative paths resolve against the session's working directory."""
+        if not os.path.isabs(path):
+            return os.path.normpath(os.path.join(self.cwd, path))
+        return path
+
+    def chdir(self, path: str) -> str:
+        resolved = os.path.normpath(self.resolve(path))
+        if not os.path.isdir(resolved):
+            raise FileNotFoundError(f"No such directory: '{resolved}'")
+        self.cwd = resolved
+        return resolved
+
+    def environ(self) -> Dict[str, str]:
+        """Process environment with this session's overrides applied - pass as env= to subprocesses."""
+        env = dict(os.environ)
+        env.update(self.env_overrides)
+        return env
+
+    def getenv(self, name: str) -> Optional[str]:
+        if name in self.env_overrides:
+            return self.env_overrides[name]
+        return os.environ.get(name)
+
+    def setenv(self, name: str, value: str) -> None:
+        self.env_overrides[name] = value
+
+
+_DEFAULT_CONTEXT = SessionContext("default")
+_current: contextvars.ContextVar = contextvars.ContextVar("david_session_context", default=None)
+_contexts: Dict[str, SessionContext] = {}
+_lock = threading.Lock()
+
+
+def get_session_context(session_id: Optional[str]) -> SessionContext:
+    """Context for `session_id`, created on first use. No id -> the shared default context."""
+    if not session_id:
+        return _DEFAULT_CONTEXT
+    with _lock:
+        ctx = _contexts.get(session_id)
+        if ctx is None:
+            ctx = _contexts[session_id] = SessionContext(session_id)
+        return ctx
+
+
+def drop_session_context(session_id: str) -> None:
+    with _lock:
+        _contexts.pop(session_id, None)
+
+
+def current_context() -> SessionContext:
+    """Context of the session the current tool call runs for."""
+    return _current.get() or _DEFAULT_CONTEXT
+
+
+def session_id_from_config(config) -> Optional[str]:
+    return (config or {}).get("configurable", {}).get("thread_id")
+
+
+@contextmanager
+def session_scope(session_id: Optional[str]):
+    """Run the enclosed code (and threads/tasks it spawns) against one session's context."""
+    token = _current.set(get_session_context(session_id))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
@@ -0,0 +1,205 @@
+# C:\David\src\local_agent\session_manager.py
+# Session lifecycle - idle eviction to disk, lazy rehydration on resume, cap on active sessions
+#
+# A session's in-memory state is its checkpointed thread, its SessionHistory and its
+# SessionContext. When a session goes idle (DAVID_SESSION_IDLE_MINUTES), is pushed out by
+# the active-session cap (DAVID_MAX_ACTIVE_SESSIONS) or its chat ends, the latest state is
+# written to .david/sessions/<id>.json and dropped from memory. The next message for that
+# session - including one after Chainlit's on_chat_resume - restores it first.
+# Snapshots older than DAVID_SESSION_RETENTION_DAYS are deleted with their spilled outputs.
+
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+from .agent import checkpointer, drop_session_history, get_or_create_session_history, prune_thread, session_histories
+from .session_context import drop_session_context, get_session_context
+from .storage import data_path
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_DIR = "sessions"
+IDLE_SECONDS = float(os.getenv("DAVID_SESSION_IDLE_MINUTES", "30")) * 60
+MAX_ACTIVE_SESSIONS = int(os.getenv("DAVID_MAX_ACTIVE_SESSIONS", "32"))
+RETENTION_SECONDS = float(os.getenv("DAVID_SESSION_RETENTION_DAYS", "7")) * 86400
+# Terminal node the restored state is attributed to, so the thread has no pending steps
+RESTORE_AS_NODE = "rejected"
+
+
+def _snapshot_path(session_id: str) -> Path:
+    safe = "".join(c for c in session_id if c.isalnum() or c in "-_")
+    return data_path(SESSIONS_DIR, f"{safe}.json")
+
+
+def _sessions_dir() -> Path:
+    path = data_path(SESSIONS_DIR)
+    path.mkdir(exist_ok=True)
+    return path
+
+
+class SessionManager:
+    """Tracks which sessions are in memory and moves idle ones to disk."""
+
+    def __init__(self, idle_seconds: float = IDLE_SECONDS, max_active: int = MAX_ACTIVE_SESSIONS,
+                 retention_seconds: float = RETENTION_SECONDS):
+        self.idle_seconds = idle_seconds
+        self.max_active = max_active
+        self.retention_seconds = retention_seconds
+        self._active: "OrderedDict[str, float]" = OrderedDict()  # session_id -> last activity, oldest first
+        self._busy: Dict[str, int] = {}
+        self.evictions = 0
+        self.rehydrations = 0
+
+    # -- snapshots ------------------------------------------------------------
+
+    def evict(self, session_id: str, graph) -> bool:
+        """Write the session's state to disk and drop it from memory. False if it was busy."""
+        if self._busy.get(session_id):
+            return False
+        self._active.pop(session_id, None)
+        config = {"configurable": {"thread_id": session_id}}
+        state = graph.get_state(config) if graph is not None else None
+        values = dict(state.values) if state and state.values else {}
+        history = session_histories.pop(session_id, None)
+        if values.get("messages"):
+            ctx = get_session_context(session_id)
+            snapshot = {
+                "session_id": session_id,
+                "saved": time.time(),
+                "values": {**values, "messages": messages_to_dict(values.get("messages", []))},
+                "context": {"cwd": ctx.cwd, "env_overrides": ctx.env_overrides},
+                "history": {"logged": history.logged,
+                            "log_path": str(history.log_path) if history.log_path else None} if history else None,
+            }
+            path = _snapshot_path(session_id)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, path)
+        checkpointer.delete_thread(session_id)
+        drop_session_context(session_id)
+        self.evictions += 1
+        logger.info("session_manager.evicted session=%s messages=%d", session_id, len(values.get("messages", [])))
+        return True
+
+    def rehydrate(self, session_id: str, graph) -> bool:
+        """Restore an evicted session from disk if it isn't in memory. True if state was restored."""
+        config = {"configurable": {"thread_id": session_id}}
+        state = graph.get_state(config)
+        if state and state.values:
+            return False
+        path = _snapshot_path(session_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.error("session_manager.rehydrate_failed session=%s error=%s", session_id, e)
+            return False
+        values = dict(snapshot.get("values") or {})
+        values["messages"] = messages_from_dict(values.get("messages", []))
+        if values["messages"]:
+            graph.update_state(config, values, as_node=RESTORE_AS_NODE)
+        ctx = get_session_context(session_id)
+        context = snapshot.get("context") or {}
+        if context.get("cwd") and os.path.isdir(context["cwd"]):
+            ctx.cwd = context["cwd"]
+        ctx.env_overrides.update(context.get("env_overrides") or {})
+        saved_history = snapshot.get("history")
+        if saved_history:
+            history = get_or_create_session_history(session_id)
+            history.logged = saved_history.get("logged", 0)
+            if saved_history.get("log_path"):
+                history.log_path = Path(saved_history["log_path"])
+        self.rehydrations += 1
+        logger.info("session_manager.rehydrated session=%s messages=%d", session_id, len(values["messages"]))
+        return True
+
+    def forget(self, session_id: str) -> None:
+        """Drop a session for good - checkpoints, spilled outputs and snapshot."""
+        self._active.pop(session_id, None)
+        drop_session_history(session_id)
+        drop_session_context(session_id)
+        prune_thread(session_id)
+        try:
+            os.remove(_snapshot_path(session_id))
+        except OSError:
+            pass
+
+    # -- activity -------------------------------------------------------------
+
+    def begin(self, session_id: str, graph) -> None:
+        """A turn is starting: restore the session if needed and mark it busy."""
+        self.rehydrate(session_id, graph)
+        self._busy[session_id] = self._busy.get(session_id, 0) + 1
+        self._touch(session_id)
+        self.enforce_cap(graph)
+
+    def end(self, session_id: str) -> None:
+        count = self._busy.get(session_id, 0) - 1
+        if count > 0:
+            self._busy[session_id] = count
+        else:
+            self._busy.pop(session_id, None)
+        self._touch(session_id)
+
+    def _touch(self, session_id: str) -> None:
+        self._active[session_id] = time.monotonic()
+        self._active.move_to_end(session_id)
+
+    def enforce_cap(self, graph) -> int:
+        """Evict the least recently active idle sessions beyond max_active."""
+        evicted = 0
+        for session_id in list(self._active):
+            if len(self._active) <= self.max_active:
+                break
+            if self.evict(session_id, graph):
+                evicted += 1
+        return evicted
+
+    def evict_idle(self, graph) -> int:
+        cutoff = time.monotonic() - self.idle_seconds
+        idle = [s for s, last in self._active.items() if last < cutoff]
+        return sum(1 for s in idle if self.evict(s, graph))
+
+    def purge_expired(self) -> int:
+        """Delete snapshots past the retention period, releasing their spilled outputs."""
+        cutoff = time.time() - self.retention_seconds
+        purged = 0
+        for entry in os.scandir(_sessions_dir()):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+                session_id = entry.name[:-5]
+                if session_id in self._active:
+                    continue
+                os.remove(entry.path)
+            except OSError:
+                continue
+            prune_thread(session_id)
+            purged += 1
+        if purged:
+            logger.info("session_manager.purged snapshots=%d", purged)
+        return purged
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": len(self._active),
+            "busy": len(self._busy),
+            "max_active": self.max_active,
+            "on_disk": sum(1 for e in os.scandir(_sessions_dir()) if e.name.endswith(".json")),
+            "evictions": self.evictions,
+            "rehydrations": self.rehydrations,
+        }
+
+
+SESSIONS = SessionManager()
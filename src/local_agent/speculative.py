@@ -0,0 +1,114 @@
+# C:\David\src\local_agent\speculative.py
+# Speculative execution - read-only tool calls start while the approval prompt is still open
+#
+# Opt-in with DAVID_SPECULATIVE=1. When a batch needs approval, its read-only calls (the
+# policy's "read_only" list) run in the background during the up-to-60s wait. If the batch
+# is approved, tools_node takes their results instead of running them again; if it is
+# rejected, they are cancelled and their results dropped, so nothing reaches the model.
+# Calls that read a path another call in the same batch writes are never speculated, and
+# neither are calls the prompt is asking about - a read outside the root waits for consent.
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.messages import ToolMessage
+
+from .approval_policy import Classification, RiskPolicy, iter_path_args, normalize_path
+from .session_context import session_scope
+
+logger = logging.getLogger(__name__)
+
+
+def speculation_enabled() -> bool:
+    return os.getenv("DAVID_SPECULATIVE", "0") == "1"
+
+
+def _paths(tool_call: dict, policy: RiskPolicy, base: str) -> List[str]:
+    return [normalize_path(v, base) for _, v in iter_path_args(tool_call.get("args"), policy.path_args)]
+
+
+def _overlaps(a: str, b: str) -> bool:
+    return a == b or a.startswith(b.rstrip("/") + "/") or b.startswith(a.rstrip("/") + "/")
+
+
+def speculative_calls(tool_calls: List[dict], policy: RiskPolicy, base: str,
+                      pending: Optional[Classification] = None) -> List[dict]:
+    """Read-only calls of the batch whose paths no other call in the batch touches, leaving out
+    any call `pending` (the calls awaiting approval) lists."""
+    awaiting = set()
+    if pending is not None:
+        awaiting = {c.get("id") for c in pending.high + pending.medium} | {c.get("id") for c, _, _ in pending.outside}
+    read_only = [c for c in tool_calls if policy.is_read_only(c.get("name", "")) and c.get("id") not in awaiting]
+    if not read_only:
+        return []
+    written = [p for c in tool_calls if not policy.is_read_only(c.get("name", ""))
+               for p in _paths(c, policy, base)]
+    return [c for c in read_only if c.get("id")
+            and not any(_overlaps(p, w) for p in _paths(c, policy, base) for w in written)]
+
+
+async def _run_call(tool, tool_call: dict) -> ToolMessage:
+    try:
+        return await tool.ainvoke({**tool_call, "type": "tool_call"})
+    except Exception as e:
+        # Same shape ToolNode produces for a failing tool
+        return ToolMessage(content=f"Error: {e!r}\n Please fix your mistakes.", name=tool_call.get("name"),
+                           tool_call_id=tool_call["id"], status="error")
+
+
+class SpeculativeRuns:
+    """Background runs per (session, AI message), waiting for the approval verdict."""
+
+    def __init__(self):
+        self._runs: Dict[Tuple[str, str], Dict[str, asyncio.Task]] = {}
+        self._started: Dict[Tuple[str, str], float] = {}
+
+    def start(self, session_id: Optional[str], message_id: Optional[str], tool_calls: List[dict],
+              tools_by_name: dict) -> int:
+        """Start the given calls in the background. Returns how many were started."""
+        if not message_id:
+            return 0
+        key = (session_id or "", message_id)
+        self.discard(session_id, message_id)
+        tasks = {}
+        with session_scope(session_id):  # tasks copy the session context at creation
+            for call in tool_calls:
+                tool = tools_by_name.get(call.get("name"))
+                if tool is not None:
+                    tasks[call["id"]] = asyncio.ensure_future(_run_call(tool, call))
+        if tasks:
+            self._runs[key] = tasks
+            self._started[key] = time.perf_counter()
+            logger.info("speculative.start session=%s calls=%s", session_id,
+                        [c.get("name") for c in tool_calls if c.get("id") in tasks])
+        return len(tasks)
+
+    async def take(self, session_id: Optional[str], message_id: Optional[str]) -> Dict[str, ToolMessage]:
+        """Results of an approved batch's speculative calls, by tool_call id."""
+        key = (session_id or "", message_id or "")
+        tasks = self._runs.pop(key, None)
+        started = self._started.pop(key, None)
+        if not tasks:
+            return {}
+        pending = sum(1 for t in tasks.values() if not t.done())
+        results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+        logger.info("speculative.commit session=%s calls=%d pending_at_approval=%d seconds=%.2f",
+                    session_id, len(results), pending, time.perf_counter() - started)
+        return results
+
+    def discard(self, session_id: Optional[str], message_id: Optional[str] = None) -> None:
+        """Cancel and forget speculative runs - one batch, or all of a session's if no message id."""
+        session = session_id or ""
+        keys = [k for k in self._runs if k[0] == session and (message_id is None or k[1] == message_id)]
+        for key in keys:
+            tasks = self._runs.pop(key)
+            self._started.pop(key, None)
+            for task in tasks.values():
+                task.cancel()
+            logger.info("speculative.discard session=%s calls=%d", session_id, len(tasks))
+
+
+SPECULATIVE_RUNS = SpeculativeRuns()
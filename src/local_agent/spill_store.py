@@ -0,0 +1,193 @@
+# C:\David\src\local_agent\spill_store.py
+# Content-addressed store for tool outputs too large to keep in the conversation state
+#
+# Blobs live under .david/spill/<aa>/<hash>.txt, named by the SHA-256 of their content, so
+# identical outputs are stored once. refs.sqlite records which threads reference which blob;
+# release_thread() drops a pruned thread's references and garbage-collects orphaned blobs, and
+# collect_garbage() (run at startup) catches blobs orphaned by a crash.
+#
+# Next to each blob, <hash>.idx holds its length in characters and the byte offset of every
+# INDEX_STRIDE-th character, so read_range() seeks straight to a page instead of decoding the
+# whole blob.
+
+import codecs
+import hashlib
+from array import array
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from .storage import data_path
+
+logger = logging.getLogger(__name__)
+
+SPILL_DIR = "spill"
+HANDLE_LENGTH = 16
+GC_GRACE_SECONDS = 3600  # unreferenced blobs younger than this survive GC (writes in flight)
+INDEX_STRIDE = 4096      # characters between byte-offset checkpoints
+MAX_CHAR_BYTES = 4       # UTF-8
+DEFAULT_THREAD = "default"  # owner of spills made outside a session - session_context's default id
+_HANDLE_RE = re.compile(r"^[0-9a-f]{%d}$" % HANDLE_LENGTH)
+
+_lock = threading.Lock()
+
+
+def _blob_path(handle: str):
+    if not _HANDLE_RE.match(handle or ""):
+        raise ValueError(f"Invalid spill handle: {handle!r}")
+    return data_path(SPILL_DIR, handle[:2], f"{handle}.txt")
+
+
+def _index_path(handle: str):
+    path = _blob_path(handle)
+    return path.with_suffix(".idx")
+
+
+def _write_index(text: str, path) -> None:
+    """[length, byte offset of char 0, of char INDEX_STRIDE, ...] as native uint64."""
+    index = array("Q", [len(text)])
+    offset = 0
+    for start in range(0, len(text), INDEX_STRIDE):
+        index.append(offset)
+        offset += len(text[start:start + INDEX_STRIDE].encode("utf-8"))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        index.tofile(f)
+    os.replace(tmp, path)
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(data_path(SPILL_DIR, "refs.sqlite"), timeout=10)
+    conn.execute("CREATE TABLE IF NOT EXISTS refs (handle TEXT NOT NULL, thread_id TEXT NOT NULL, "
+                 "created REAL NOT NULL, PRIMARY KEY (handle, thread_id))")
+    return conn
+
+
+def content_handle(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:HANDLE_LENGTH]
+
+
+def spill(text: str, thread_id: Optional[str] = None) -> str:
+    """Store `text` (once per distinct content) and reference it from `thread_id`. Returns its handle."""
+    handle = content_handle(text)
+    path = _blob_path(handle)
+    with _lock:
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        if not os.path.exists(_index_path(handle)):
+            _write_index(text, _index_path(handle))
+        with _connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO refs (handle, thread_id, created) VALUES (?, ?, ?)",
+                         (handle, thread_id or DEFAULT_THREAD, time.time()))
+    return handle
+
+
+def owns(handle: str, thread_id: Optional[str]) -> bool:
+    """True if `thread_id` references the blob - a session may only page through its own outputs."""
+    with _connect() as conn:
+        return conn.execute("SELECT 1 FROM refs WHERE handle = ? AND thread_id = ?",
+                            (handle, thread_id or DEFAULT_THREAD)).fetchone() is not None
+
+
+def _checkpoint(handle: str, offset: int) -> Tuple[int, int, int]:
+    """(total chars, char position, byte position) of the last checkpoint at or before `offset`."""
+    path = _index_path(handle)
+    if not os.path.exists(path):
+        # Spilled before blobs had an index - build it once
+        with open(_blob_path(handle), "r", encoding="utf-8", newline="") as f:
+            _write_index(f.read(), path)
+    entries = array("Q")
+    with open(path, "rb") as f:
+        entries.fromfile(f, 1)
+        total = entries[0]
+        slot = min(offset, max(total - 1, 0)) // INDEX_STRIDE
+        f.seek((1 + slot) * entries.itemsize)
+        try:
+            entries.fromfile(f, 1)
+        except EOFError:  # empty blob
+            return total, 0, 0
+    return total, slot * INDEX_STRIDE, entries[1]
+
+
+def read_range(handle: str, offset: int = 0, limit: int = 4000) -> Tuple[str, int]:
+    """Characters [offset, offset + limit) of a spilled output, plus its total length."""
+    path = _blob_path(handle)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No spilled output with handle {handle}")
+    total, char_pos, byte_pos = _checkpoint(handle, offset)
+    if offset >= total:
+        return "", total
+    skip = offset - char_pos
+    with open(path, "rb") as f:
+        f.seek(byte_pos)
+        data = f.read((skip + limit) * MAX_CHAR_BYTES)
+    # An incremental decoder drops a multi-byte character cut off at the end of the read
+    text = codecs.getincrementaldecoder("utf-8")().decode(data)
+    return text[skip:skip + limit], total
+
+
+def release_thread(thread_id: str) -> int:
+    """Forget every blob reference held by a pruned thread and delete blobs nothing else uses."""
+    removed = 0
+    with _lock:
+        with _connect() as conn:
+            handles = [row[0] for row in conn.execute("SELECT handle FROM refs WHERE thread_id = ?", (thread_id,))]
+            conn.execute("DELETE FROM refs WHERE thread_id = ?", (thread_id,))
+            still_used = {row[0] for row in conn.execute(
+                "SELECT DISTINCT handle FROM refs WHERE handle IN (%s)" % ",".join("?" * len(handles)), handles)
+            } if handles else set()
+        for handle in handles:
+            if handle in still_used:
+                continue
+            try:
+                os.remove(_blob_path(handle))
+                removed += 1
+            except OSError:
+                pass
+            try:
+                os.remove(_index_path(handle))
+            except OSError:
+                pass
+    if removed:
+        logger.info("spill_store.release thread=%s removed=%d", thread_id, removed)
+    return removed
+
+
+def collect_garbage(grace_seconds: float = GC_GRACE_SECONDS) -> int:
+    """Delete blobs no thread references any more."""
+    removed = 0
+    cutoff = time.time() - grace_seconds
+    root = data_path(SPILL_DIR, "refs.sqlite").parent
+    with _lock:
+        with _connect() as conn:
+            referenced = {row[0] for row in conn.execute("SELECT DISTINCT handle FROM refs")}
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                handle, ext = os.path.splitext(filename)
+                if ext not in (".txt", ".idx"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    if handle not in referenced and os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+    if removed:
+        logger.info("spill_store.gc removed=%d", removed)
+    return removed
+
+
+def stats() -> dict:
+    with _lock:
+        with _connect() as conn:
+            refs, handles, threads = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT handle), COUNT(DISTINCT thread_id) FROM refs").fetchone()
+    return {"refs": refs, "blobs": handles, "threads": threads}
@@ -0,0 +1,21 @@
+# C:\David\src\local_agent\storage.py
+# Location of David's on-disk state (approval rules, caches, spilled outputs...)
+
+import os
+from pathlib import Path
+
+DATA_DIR_ENV = "DAVID_DATA_DIR"
+
+
+def data_dir() -> Path:
+    """Root of David's local state - DAVID_DATA_DIR or .david next to the app."""
+    path = Path(os.getenv(DATA_DIR_ENV, ".david"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def data_path(*parts: str) -> Path:
+    """Path inside the data dir, with its parent directory created."""
+    path = data_dir().joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
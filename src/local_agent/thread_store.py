@@ -0,0 +1,206 @@
+# C:\David\src\local_agent\thread_store.py
+# Persistent, pageable message log per thread - read any index range without loading the state
+#
+# MessageLogSaver (the graph's checkpointer) mirrors every checkpoint's new messages into
+# .david/threads.sqlite, one row per message keyed by (thread_id, idx). Reading the last 20
+# messages of a long thread is an indexed range query plus decoding 20 rows, instead of
+# deserializing the whole checkpoint.
+#
+# Rows are msgpack-encoded tuples. Strings that repeat across messages - message types,
+# tool names - are stored once in a shared `strings` table and referenced by integer id.
+
+import logging
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import ormsgpack
+from langchain_core.messages import (
+    AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage, message_to_dict, messages_from_dict,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+from .storage import data_path
+
+logger = logging.getLogger(__name__)
+
+STORE_FILE = "threads.sqlite"
+_DICT_TYPE = "__dict__"  # fallback encoding for message classes without a compact form
+_CLASSES = {"human": HumanMessage, "ai": AIMessage, "system": SystemMessage, "tool": ToolMessage}
+
+
+class ThreadStore:
+    """SQLite message log with msgpack rows and a shared-string table."""
+
+    def __init__(self, path=None):
+        self._path = path
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._string_ids: Dict[str, int] = {}
+        self._strings: Dict[int, str] = {}
+        self._tails: Dict[str, Tuple[int, Optional[str]]] = {}  # thread_id -> (count, last message id)
+
+    @property
+    def path(self):
+        return self._path or data_path(STORE_FILE)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS strings (id INTEGER PRIMARY KEY, value TEXT UNIQUE NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS messages (thread_id TEXT NOT NULL, idx INTEGER NOT NULL, "
+                         "message_id TEXT, payload BLOB NOT NULL, PRIMARY KEY (thread_id, idx)) WITHOUT ROWID")
+            for sid, value in conn.execute("SELECT id, value FROM strings"):
+                self._string_ids[value] = sid
+                self._strings[sid] = value
+            self._conn = conn
+        return self._conn
+
+    # -- encoding -----------------------------------------------------------
+
+    def _sid(self, value: Optional[str]) -> int:
+        """Shared-string id of `value` (0 for None)."""
+        if value is None:
+            return 0
+        sid = self._string_ids.get(value)
+        if sid is None:
+            sid = self._db().execute("INSERT INTO strings (value) VALUES (?)", (value,)).lastrowid
+            self._string_ids[value] = sid
+            self._strings[sid] = value
+        return sid
+
+    def _str(self, sid: int) -> Optional[str]:
+        return self._strings.get(sid) if sid else None
+
+    def encode(self, message: BaseMessage) -> bytes:
+        cls = _CLASSES.get(message.type)
+        if cls is None or type(message) is not cls:
+            return ormsgpack.packb([self._sid(_DICT_TYPE), message_to_dict(message)])
+        tool_calls = [[self._sid(c.get("name")), c.get("args"), c.get("id")]
+                      for c in getattr(message, "tool_calls", None) or []]
+        return ormsgpack.packb([
+            self._sid(message.type), message.id, message.content, self._sid(getattr(message, "name", None)),
+            getattr(message, "tool_call_id", None), tool_calls, message.additional_kwargs or None,
+            getattr(message, "status", None),
+        ])
+
+    def decode(self, payload: bytes) -> BaseMessage:
+        row = ormsgpack.unpackb(payload)
+        kind = self._str(row[0])
+        if kind == _DICT_TYPE:
+            return messages_from_dict([row[1]])[0]
+        _, msg_id, content, name_sid, tool_call_id, tool_calls, additional_kwargs, status = row
+        fields = {"content": content, "id": msg_id, "additional_kwargs": additional_kwargs or {}}
+        if name_sid:
+            fields["name"] = self._str(name_sid)
+        if kind == "ai" and tool_calls:
+            fields["tool_calls"] = [{"name": self._str(n), "args": args, "id": cid, "type": "tool_call"}
+                                    for n, args, cid in tool_calls]
+        if kind == "tool":
+            fields["tool_call_id"] = tool_call_id
+            if status:
+                fields["status"] = status
+        return _CLASSES[kind](**fields)
+
+    # -- writes -------------------------------------------------------------
+
+    def _tail(self, thread_id: str) -> Tuple[int, Optional[str]]:
+        tail = self._tails.get(thread_id)
+        if tail is None:
+            row = self._db().execute("SELECT idx, message_id FROM messages WHERE thread_id = ? "
+                                     "ORDER BY idx DESC LIMIT 1", (thread_id,)).fetchone()
+            tail = self._tails[thread_id] = (row[0] + 1, row[1]) if row else (0, None)
+        return tail
+
+    def append(self, thread_id: str, messages: List[BaseMessage], start: Optional[int] = None) -> None:
+        """Store `messages` at indexes start, start+1, ... (default: after the last stored one)."""
+        if not messages:
+            return
+        with self._lock:
+            start = self._tail(thread_id)[0] if start is None else start
+            rows = [(thread_id, start + i, m.id, self.encode(m)) for i, m in enumerate(messages)]
+            db = self._db()
+            db.execute("BEGIN")
+            try:
+                db.executemany("INSERT OR REPLACE INTO messages (thread_id, idx, message_id, payload) "
+                               "VALUES (?, ?, ?, ?)", rows)
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            self._tails[thread_id] = (start + len(messages), messages[-1].id)
+
+    def sync(self, thread_id: str, messages: List[BaseMessage]) -> None:
+        """Bring the log in line with a thread's full message list - O(new messages) when only appended."""
+        with self._lock:
+            count, last_id = self._tail(thread_id)
+            if len(messages) == count and (count == 0 or messages[-1].id == last_id):
+                return
+            if len(messages) > count and (count == 0 or messages[count - 1].id == last_id):
+                self.append(thread_id, messages[count:], start=count)
+                return
+            # History was rewritten (restored, trimmed, edited) - store it again from scratch
+            logger.info("thread_store.resync thread=%s stored=%d state=%d", thread_id, count, len(messages))
+            self.delete(thread_id)
+            self.append(thread_id, messages, start=0)
+
+    def delete(self, thread_id: str) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM messages WHERE thread_id = ?", (thread_id,))
+            self._tails.pop(thread_id, None)
+
+    # -- reads --------------------------------------------------------------
+
+    def count(self, thread_id: str) -> int:
+        with self._lock:
+            return self._tail(thread_id)[0]
+
+    def page(self, thread_id: str, start: int = 0, stop: Optional[int] = None) -> List[BaseMessage]:
+        """Messages [start, stop) of a thread; negative indexes count from the end, like a slice."""
+        with self._lock:
+            total = self._tail(thread_id)[0]
+            start, stop, _ = slice(start, stop).indices(total)
+            if start >= stop:
+                return []
+            rows = self._db().execute("SELECT payload FROM messages WHERE thread_id = ? AND idx >= ? AND idx < ? "
+                                      "ORDER BY idx", (thread_id, start, stop)).fetchall()
+            return [self.decode(payload) for (payload,) in rows]
+
+    def tail(self, thread_id: str, n: int = 20) -> List[BaseMessage]:
+        return self.page(thread_id, -n) if n > 0 else []
+
+    def stats(self) -> dict:
+        with self._lock:
+            db = self._db()
+            threads, messages = db.execute("SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM messages").fetchone()
+            strings = db.execute("SELECT COUNT(*) FROM strings").fetchone()[0]
+        return {"threads": threads, "messages": messages, "shared_strings": strings}
+
+
+THREAD_STORE = ThreadStore()
+
+
+class MessageLogSaver(MemorySaver):
+    """In-memory checkpointer that also mirrors each thread's messages into a ThreadStore.
+
+    delete_thread() only frees memory; the log survives eviction and is removed with
+    ThreadStore.delete() when the thread is pruned.
+    """
+
+    def __init__(self, store: ThreadStore = THREAD_STORE, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        configurable = config.get("configurable", {})
+        if "messages" in new_versions and not configurable.get("checkpoint_ns"):
+            messages = checkpoint["channel_values"].get("messages")
+            if messages is not None:
+                try:
+                    self.store.sync(configurable["thread_id"], messages)
+                except sqlite3.Error as e:
+                    logger.warning("thread_store.sync_failed thread=%s error=%s", configurable.get("thread_id"), e)
+        return result
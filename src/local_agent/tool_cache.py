@@ -0,0 +1,318 @@
+# C:\David\src\local_agent\tool_cache.py
+# Result cache for idempotent read-only tools - TTL, mtime and mutation invalidation, LRU by size
+#
+# Changes reported by the file watcher (watch_path) invalidate entries too, including changes
+# made outside the agent. Tools whose results depend on a whole subtree are only cached while
+# such a watch covers their path, since the path's own mtime can't tell when they go stale.
+
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from langchain_core.tools import BaseTool, StructuredTool
+
+from .david_tools import resolve_path
+from .file_watcher import FILE_WATCHER
+
+# Seconds a cached result stays valid, per tool. Tools not listed are never cached.
+CACHE_TTLS = {
+    "system_info": 5,             # reports available memory - only dedupe bursts
+    "installed_programs": 1800,   # wmic is very slow
+    "windows_features": 1800,     # dism is very slow
+    "network_interfaces": 300,
+    "list_services": 60,
+    "list_directory": 30,
+    "file_info": 30,
+}
+
+# Cached only while a file watch covers every path argument (seconds, per tool)
+WATCHED_CACHE_TTLS = {
+    "directory_size": 600,
+    "directory_tree": 600,
+    "file_search": 300,
+    "find_directories": 300,
+}
+
+# Argument names that carry filesystem paths
+PATH_ARGS = ("path", "source", "destination", "directory", "root", "db_path",
+             "file_path", "zip_path", "working_dir")
+
+# Tools that change the filesystem - cached entries touching the same paths are dropped
+MUTATING_TOOLS = frozenset([
+    "write_file", "append_file", "delete_file", "copy_file", "move_file", "edit_line",
+    "find_replace", "file_permissions", "create_directory", "delete_directory",
+    "copy_directory", "move_directory", "create_zip", "extract_zip", "screenshot",
+    "sqlite_query", "sqlite_create_table",
+])
+
+# Tools whose effects can't be tied to a path - they flush whole tools from the cache
+BROAD_INVALIDATIONS = {
+    "execute_command": "paths",
+    "python_execute": "paths",
+    "execute_powershell": "paths",
+    "execute_batch": "paths",
+    "node_execute": "paths",
+    "java_execute": "paths",
+    "batch_file_ops": "paths",
+    "start_service": ("list_services",),
+    "stop_service": ("list_services",),
+    "restart_service": ("list_services",),
+}
+
+
+def _normalize_path(value: str) -> str:
+    """Normalized, case-insensitive form of a tool path argument."""
+    return os.path.normcase(os.path.normpath(resolve_path(value.strip())))
+
+
+def _stat_signature(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _related(a: str, b: str) -> bool:
+    """True if one path equals or contains the other."""
+    if a == b:
+        return True
+    a_dir = a.rstrip(os.sep) + os.sep
+    b_dir = b.rstrip(os.sep) + os.sep
+    return a.startswith(b_dir) or b.startswith(a_dir)
+
+
+class _Entry:
+    __slots__ = ("tool", "result", "size", "expires", "paths")
+
+    def __init__(self, tool: str, result: Any, size: int, expires: float, paths: Dict[str, Optional[tuple]]):
+        self.tool = tool
+        self.result = result
+        self.size = size
+        self.expires = expires
+        self.paths = paths
+
+
+class ToolResultCache:
+    """LRU cache of tool results bounded by total result size."""
+
+    def __init__(self, ttls: Dict[str, float] = None, max_bytes: int = 4 * 1024 * 1024, max_entries: int = 512,
+                 watched_ttls: Dict[str, float] = None, covers=None):
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self.watched_ttls = dict(WATCHED_CACHE_TTLS if watched_ttls is None else watched_ttls)
+        self.covers = covers  # callable(normalized path) -> bool: is a file watch reporting its changes
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self.evictions = 0
+        self.invalidations = 0
+
+    # -- keys ---------------------------------------------------------------
+
+    @staticmethod
+    def normalize_args(tool_obj: BaseTool, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in defaults and normalize path arguments so equivalent calls share a key."""
+        normalized = dict(args)
+        func = getattr(tool_obj, "func", None)
+        if func is not None:
+            try:
+                bound = inspect.signature(func).bind_partial(**args)
+                bound.apply_defaults()
+                normalized = dict(bound.arguments)
+            except TypeError:
+                pass
+        for key, value in normalized.items():
+            if key in PATH_ARGS and isinstance(value, str):
+                normalized[key] = _normalize_path(value)
+        return normalized
+
+    @staticmethod
+    def make_key(tool_name: str, normalized: Dict[str, Any]) -> str:
+        return tool_name + ":" + json.dumps(normalized, sort_keys=True, default=str)
+
+    # -- lookup / store -----------------------------------------------------
+
+    def get(self, tool_name: str, key: str):
+        """Return (hit, result)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                fresh = entry.expires > time.monotonic() and all(
+                    _stat_signature(p) == sig for p, sig in entry.paths.items()
+                ) and (entry.tool not in self.watched_ttls or self._watched(entry.paths))
+                if fresh:
+                    self._entries.move_to_end(key)
+                    self._hits[tool_name] = self._hits.get(tool_name, 0) + 1
+                    return True, entry.result
+                self._drop(key)
+            self._misses[tool_name] = self._misses.get(tool_name, 0) + 1
+            return False, None
+
+    def _watched(self, paths) -> bool:
+        return bool(paths) and self.covers is not None and all(self.covers(p) for p in paths)
+
+    def cacheable(self, tool_name: str) -> bool:
+        return tool_name in self.ttls or tool_name in self.watched_ttls
+
+    def put(self, tool_name: str, key: str, result: Any, paths: List[str]) -> None:
+        ttl = self.ttls.get(tool_name)
+        if not ttl and tool_name in self.watched_ttls and self._watched(paths):
+            ttl = self.watched_ttls[tool_name]
+        if not ttl:
+            return
+        size = len(result) if isinstance(result, str) else len(json.dumps(result, default=str))
+        if size > self.max_bytes:
+            return
+        entry = _Entry(tool_name, result, size, time.monotonic() + ttl,
+                       {p: _stat_signature(p) for p in paths})
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    # -- invalidation -------------------------------------------------------
+
+    def invalidate_paths(self, paths: List[str]) -> int:
+        """Drop entries whose path arguments equal, contain or sit under any of `paths`."""
+        if not paths:
+            return 0
+        with self._lock:
+            stale = [k for k, e in self._entries.items()
+                     if any(_related(p, q) for p in e.paths for q in paths)]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def invalidate_changed(self, paths: List[str]) -> int:
+        """File watcher callback - drop entries related to paths changed on disk."""
+        return self.invalidate_paths([os.path.normcase(os.path.normpath(p)) for p in paths])
+
+    def invalidate_tools(self, tool_names=None, path_based: bool = False) -> int:
+        """Drop every entry for the given tools (or every path-based entry)."""
+        with self._lock:
+            stale = [k for k, e in self._entries.items()
+                     if (tool_names and e.tool in tool_names) or (path_based and e.paths)]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def after_call(self, tool_name: str, normalized: Dict[str, Any]) -> None:
+        """Invalidate whatever a (potentially) mutating tool call may have changed."""
+        if tool_name in MUTATING_TOOLS:
+            self.invalidate_paths([v for k, v in normalized.items() if k in PATH_ARGS and isinstance(v, str)])
+        broad = BROAD_INVALIDATIONS.get(tool_name)
+        if broad == "paths":
+            self.invalidate_tools(path_based=True)
+        elif broad:
+            self.invalidate_tools(broad)
+
+    # -- reporting ----------------------------------------------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+            per_tool = {}
+            for name in sorted(set(self._hits) | set(self._misses)):
+                h, m = self._hits.get(name, 0), self._misses.get(name, 0)
+                per_tool[name] = f"{h}/{h + m} hits ({h / (h + m):.0%})"
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "per_tool": per_tool,
+            }
+
+
+TOOL_CACHE = ToolResultCache(
+    max_bytes=int(float(os.getenv("DAVID_TOOL_CACHE_MB", "4")) * 1024 * 1024),
+    covers=FILE_WATCHER.covers,
+)
+FILE_WATCHER.subscribe(TOOL_CACHE.invalidate_changed)
+
+
+def _explicit_args(tool_obj: BaseTool, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """`kwargs` without the arguments still at their default. The wrapper's own schema fills
+    defaults in, and passing an `x: str = None` default back explicitly fails validation."""
+    func = getattr(tool_obj, "func", None)
+    if func is None:
+        return kwargs
+    try:
+        parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return kwargs
+    explicit = {}
+    for key, value in kwargs.items():
+        default = parameters[key].default if key in parameters else inspect.Parameter.empty
+        if default is not inspect.Parameter.empty and type(value) is type(default) and value == default:
+            continue
+        explicit[key] = value
+    return explicit
+
+
+def _wrap(tool_obj: BaseTool, cache: ToolResultCache) -> BaseTool:
+    """Return a copy of `tool_obj` that reads from / invalidates the cache."""
+    name = tool_obj.name
+    cacheable = cache.cacheable(name)
+
+    def cached_call(**kwargs):
+        normalized = cache.normalize_args(tool_obj, kwargs)
+        if cacheable:
+            key = cache.make_key(name, normalized)
+            hit, result = cache.get(name, key)
+            if hit:
+                return result
+        result = tool_obj.invoke(_explicit_args(tool_obj, kwargs))
+        if cacheable and not (isinstance(result, str) and result.startswith("Error")):
+            paths = [v for k, v in normalized.items() if k in PATH_ARGS and isinstance(v, str)]
+            cache.put(name, key, result, paths)
+        cache.after_call(name, normalized)
+        return result
+
+    return StructuredTool.from_function(
+        func=cached_call,
+        name=name,
+        description=tool_obj.description,
+        args_schema=tool_obj.args_schema,
+    )
+
+
+def with_tool_cache(tools: List[BaseTool], cache: ToolResultCache = TOOL_CACHE) -> List[BaseTool]:
+    """Wrap cacheable and invalidating tools; everything else passes through untouched."""
+    if os.getenv("DAVID_TOOL_CACHE", "1") == "0":
+        return list(tools)
+    wrapped = []
+    for tool_obj in tools:
+        if cache.cacheable(tool_obj.name) or tool_obj.name in MUTATING_TOOLS or tool_obj.name in BROAD_INVALIDATIONS:
+            wrapped.append(_wrap(tool_obj, cache))
+        else:
+            wrapped.append(tool_obj)
+    return wrapped
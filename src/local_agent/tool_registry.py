@@ -0,0 +1,145 @@
+# C:\David\src\local_agent\tool_registry.py
+# Lazy tool registry - cheap metadata at import, LangChain tools and optional deps built on first use
+#
+# @lazy_tool records a tool's name, description and argument signature without touching
+# LangChain or Pydantic. The real StructuredTool (and its args schema) is built the first
+# time anything needs it - invoke(), args_schema, bind_tools()... - and optional third-party
+# modules (psutil, pyautogui, winreg...) are imported by the tools themselves via
+# optional_import() when they actually run.
+#
+# Tools declare what they need with requires=[...] (see capabilities.py); available()
+# only returns tools whose requirements are met on this machine, so the model never
+# sees e.g. the Windows service tools on Linux.
+
+import importlib
+import inspect
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+_optional_modules: Dict[str, Any] = {}
+_import_lock = threading.Lock()
+
+
+def optional_import(module_name: str):
+    """Import `module_name` on first use; returns None if it isn't installed or fails to load."""
+    module = _optional_modules.get(module_name, _MISSING)
+    if module is not _MISSING:
+        return module
+    with _import_lock:
+        module = _optional_modules.get(module_name, _MISSING)
+        if module is _MISSING:
+            try:
+                module = importlib.import_module(module_name)
+            except Exception as e:  # pyautogui raises more than ImportError without a display
+                logger.info("tool_registry.optional_missing module=%s error=%s", module_name, e)
+                module = None
+            _optional_modules[module_name] = module
+    return module
+
+
+class LazyTool:
+    """Stand-in for a LangChain tool until it is first used."""
+
+    def __init__(self, func: Callable, category: Optional[str] = None, requires: Optional[List[str]] = None):
+        self.func = func
+        self.name = func.__name__
+        self.description = inspect.getdoc(func) or ""
+        self.category = category
+        self.requires = tuple(requires or ())
+        self._tool = None
+        self._lock = threading.Lock()
+
+    @property
+    def arg_names(self) -> List[str]:
+        return list(inspect.signature(self.func).parameters)
+
+    @property
+    def is_built(self) -> bool:
+        return self._tool is not None
+
+    def build(self):
+        """The real StructuredTool, created (with its Pydantic schema) on first call."""
+        if self._tool is None:
+            with self._lock:
+                if self._tool is None:
+                    from langchain_core.tools import tool
+                    self._tool = tool(self.func)
+        return self._tool
+
+    def __getattr__(self, item):
+        # Only reached for attributes LazyTool doesn't define: invoke, ainvoke, args_schema, ...
+        if item.startswith("__"):
+            raise AttributeError(item)
+        return getattr(self.build(), item)
+
+    def __call__(self, *args, **kwargs):
+        return self.build()(*args, **kwargs)
+
+    def __repr__(self):
+        state = "built" if self._tool is not None else "lazy"
+        return f"<LazyTool {self.name} ({state})>"
+
+
+class ToolRegistry:
+    """Name -> LazyTool, in registration order."""
+
+    def __init__(self):
+        self._tools: Dict[str, LazyTool] = {}
+
+    def register(self, lazy: LazyTool) -> LazyTool:
+        self._tools[lazy.name] = lazy
+        return lazy
+
+    def names(self) -> List[str]:
+        return list(self._tools)
+
+    def get(self, name: str) -> Optional[LazyTool]:
+        return self._tools.get(name)
+
+    def all(self) -> List[LazyTool]:
+        return list(self._tools.values())
+
+    def available(self, probe=None) -> List[LazyTool]:
+        """Tools whose requirements are met (everything if DAVID_EXPOSE_ALL_TOOLS=1)."""
+        if os.getenv("DAVID_EXPOSE_ALL_TOOLS", "0") == "1":
+            return self.all()
+        if probe is None:
+            from .capabilities import PROBE as probe
+        tools = [t for t in self._tools.values() if probe.satisfied(t.requires)]
+        probe.save()
+        return tools
+
+    def unavailable_names(self, probe=None) -> List[str]:
+        available = {t.name for t in self.available(probe)}
+        return [name for name in self._tools if name not in available]
+
+    def metadata(self) -> List[dict]:
+        """Name, category, requirements, description and argument names - no LangChain objects built."""
+        return [{"name": t.name, "category": t.category, "requires": list(t.requires),
+                 "description": t.description, "args": t.arg_names}
+                for t in self._tools.values()]
+
+    def built_count(self) -> int:
+        return sum(1 for t in self._tools.values() if t.is_built)
+
+
+REGISTRY = ToolRegistry()
+
+
+def lazy_tool(func: Callable = None, *, category: Optional[str] = None, requires: Optional[List[str]] = None):
+    """Drop-in replacement for @tool that defers building the LangChain tool."""
+    def decorator(f: Callable) -> LazyTool:
+        return REGISTRY.register(LazyTool(f, category, requires))
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def materialize(tools: List[Any]) -> list:
+    """Turn a mixed list of LazyTool / BaseTool into real LangChain tools."""
+    return [t.build() if isinstance(t, LazyTool) else t for t in tools]
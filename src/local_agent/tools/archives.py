@@ -0,0 +1,40 @@
+# C:\David\src\local_agent\tools\archives.py
+# Compression & archives
+
+import os
+import zipfile
+
+from ..tool_registry import lazy_tool
+from .common import resolve_path
+
+@lazy_tool(category="archives")
+def create_zip(files: str, zip_path: str) -> str:
+    """Create ZIP archive."""
+    try:
+        resolved_zip = resolve_path(zip_path)
+        file_list = files.split(',')
+        
+        with zipfile.ZipFile(resolved_zip, 'w') as zipf:
+            for file in file_list:
+                file_path = resolve_path(file.strip())
+                if os.path.exists(file_path):
+                    zipf.write(file_path, os.path.basename(file_path))
+        
+        return f"ZIP archive created: {resolved_zip} with {len(file_list)} files"
+    except Exception as e:
+        return f"Error creating ZIP: {str(e)}"
+
+@lazy_tool(category="archives")
+def extract_zip(zip_path: str, destination: str) -> str:
+    """Extract ZIP archive."""
+    try:
+        resolved_zip = resolve_path(zip_path)
+        resolved_dest = resolve_path(destination)
+        
+        with zipfile.ZipFile(resolved_zip, 'r') as zipf:
+            zipf.extractall(resolved_dest)
+            file_count = len(zipf.namelist())
+        
+        return f"Extracted {file_count} files from {resolved_zip} to {resolved_dest}"
+    except Exception as e:
+        return f"Error extracting ZIP: {str(e)}"
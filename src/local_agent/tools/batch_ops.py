@@ -0,0 +1,312 @@
+# C:\David\src\local_agent\tools\batch_ops.py
+# Batched file operations - a whole manifest of copy/move/delete/mkdir in one tool call
+#
+# The manifest is validated before anything is touched (missing sources, existing
+# destinations, two operations claiming the same path, copying a folder into itself).
+# mkdir operations run first, the rest in parallel on a thread pool. Moves within one
+# filesystem are a single os.replace. With rollback=True, overwritten and deleted paths are
+# first renamed aside, and a failure undoes every completed operation and cleans up the partial
+# output of the failed ones.
+
+import json
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+from ..copy_engine import copy_one, copy_tree
+from ..tool_registry import lazy_tool
+from .common import resolve_path
+
+OPERATIONS = ("copy", "move", "delete", "mkdir")
+MAX_OPERATIONS = 1000
+MAX_WORKERS = 16
+MAX_REPORTED = 20
+
+
+class _Op:
+    """One validated manifest entry with absolute paths and what it takes to undo it."""
+
+    def __init__(self, index: int, op: str, source: Optional[str], destination: Optional[str]):
+        self.index = index
+        self.op = op
+        self.source = source
+        self.destination = destination
+        self.backup: Optional[str] = None   # renamed-aside original (overwrite or delete)
+        self.created = False                # mkdir created the directory
+        self.writing = False                # copy/move started writing its destination
+        self.copied = False                 # cross-device move: destination complete, source not yet removed
+        self.done = False
+        self.error: Optional[str] = None
+
+    def describe(self) -> str:
+        if self.op in ("copy", "move"):
+            return f"{self.op} {self.source} -> {self.destination}"
+        return f"{self.op} {self.source or self.destination}"
+
+
+def _within(path: str, parent: str) -> bool:
+    path, parent = os.path.normcase(path), os.path.normcase(parent)
+    return path == parent or path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
+def _claimed(path: str, claims: Dict[str, "_Op"], op: "_Op") -> Optional["_Op"]:
+    """Another op claiming `path` or one of its parent folders - a walk up the tree, not a scan."""
+    key = os.path.normcase(path)
+    while True:
+        other = claims.get(key)
+        if other is not None and other is not op:
+            return other
+        parent = os.path.dirname(key)
+        if parent == key:
+            return None
+        key = parent
+
+
+def _parse(operations: Union[str, List[Dict[str, Any]]]) -> List[_Op]:
+    if isinstance(operations, str):
+        operations = json.loads(operations)
+    if not isinstance(operations, list):
+        raise ValueError("operations must be a list of {op, source, destination} objects")
+    if len(operations) > MAX_OPERATIONS:
+        raise ValueError(f"at most {MAX_OPERATIONS} operations per batch")
+    ops = []
+    for i, entry in enumerate(operations, 1):
+        op = str(entry.get("op", "")).lower()
+        if op not in OPERATIONS:
+            raise ValueError(f"operation {i}: op must be one of {', '.join(OPERATIONS)}")
+        source = entry.get("source") or entry.get("path")
+        destination = entry.get("destination")
+        if op == "mkdir":
+            destination, source = destination or source, None
+        if op in ("copy", "move") and not (source and destination):
+            raise ValueError(f"operation {i}: {op} needs source and destination")
+        if op in ("delete",) and not source:
+            raise ValueError(f"operation {i}: delete needs source")
+        if op == "mkdir" and not destination:
+            raise ValueError(f"operation {i}: mkdir needs path")
+        ops.append(_Op(i, op, resolve_path(source) if source else None,
+                       resolve_path(destination) if destination else None))
+    return ops
+
+
+def _validate(ops: List[_Op], overwrite: bool) -> List[str]:
+    """Every problem with the manifest, found before any operation runs."""
+    problems = []
+    writes: Dict[str, _Op] = {}    # normcased path -> op that creates or replaces it
+    consumed: Dict[str, _Op] = {}  # normcased path -> op that moves or deletes it
+    for op in ops:
+        if op.source and not os.path.lexists(op.source):
+            problems.append(f"#{op.index} {op.describe()}: source does not exist")
+        if op.op in ("copy", "move"):
+            if os.path.lexists(op.destination) and not overwrite:
+                problems.append(f"#{op.index} {op.describe()}: destination exists (set overwrite=true)")
+            if os.path.isdir(op.source) and _within(op.destination, op.source):
+                problems.append(f"#{op.index} {op.describe()}: destination is inside the source")
+        if op.destination:
+            key = os.path.normcase(op.destination)
+            other = writes.get(key)
+            if other is not None and not (op.op == other.op == "mkdir"):
+                problems.append(f"#{op.index} {op.describe()}: also written by #{other.index}")
+            writes.setdefault(key, op)
+        if op.op in ("move", "delete"):
+            key = os.path.normcase(op.source)
+            if key in consumed:
+                problems.append(f"#{op.index} {op.describe()}: source also removed by #{consumed[key].index}")
+            consumed.setdefault(key, op)
+    # Operations run in parallel, so no operation may depend on another's effect
+    file_writes = {key: op for key, op in writes.items() if op.op != "mkdir"}
+    for op in ops:
+        for path in filter(None, (op.source, op.destination)):
+            other = _claimed(path, consumed, op)
+            if other is not None:
+                problems.append(f"#{op.index} {op.describe()}: uses a path removed by #{other.index}")
+                break
+        if op.source:
+            other = _claimed(op.source, file_writes, op)
+            if other is not None:
+                problems.append(f"#{op.index} {op.describe()}: reads a path written by #{other.index}")
+    # ...nor read a folder while another operation changes something inside it
+    sources = {os.path.normcase(op.source): op for op in ops if op.source}
+    for key, other in list(consumed.items()) + list(file_writes.items()):
+        reader = _claimed(os.path.dirname(key), sources, other)
+        if reader is not None and reader.op != "delete":
+            problems.append(f"#{reader.index} {reader.describe()}: folder is changed by #{other.index}")
+    return problems
+
+
+def _aside(path: str, batch_id: str) -> str:
+    """Rename `path` out of the way (same directory, so it's a cheap rename) and return where it went."""
+    backup = f"{path}.batch-{batch_id}.bak"
+    os.replace(path, backup)
+    return backup
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def _same_device(source: str, destination: str) -> bool:
+    try:
+        return os.stat(source).st_dev == os.stat(os.path.dirname(destination) or ".").st_dev
+    except OSError:
+        return False
+
+
+def _copy(source: str, destination: str, tree_workers: int) -> None:
+    if os.path.isdir(source) and not os.path.islink(source):
+        stats = copy_tree(source, destination, workers=tree_workers, symlinks=True)
+        if stats.errors:
+            raise OSError(f"{len(stats.errors)} file(s) failed, first: {stats.errors[0]}")
+    elif os.path.islink(source):
+        shutil.copy2(source, destination, follow_symlinks=False)
+    else:
+        copy_one(source, destination)
+
+
+def _run(op: _Op, overwrite: bool, keep_backups: bool, batch_id: str, tree_workers: int = 1) -> None:
+    try:
+        if op.op == "mkdir":
+            op.created = not os.path.isdir(op.destination)
+            os.makedirs(op.destination, exist_ok=True)
+        elif op.op == "delete":
+            if keep_backups:
+                op.backup = _aside(op.source, batch_id)
+            else:
+                _remove(op.source)
+        else:
+            os.makedirs(os.path.dirname(op.destination), exist_ok=True)
+            if overwrite and os.path.lexists(op.destination):
+                if keep_backups:
+                    op.backup = _aside(op.destination, batch_id)
+                else:
+                    _remove(op.destination)
+            op.writing = True
+            if op.op == "move" and _same_device(op.source, op.destination):
+                os.replace(op.source, op.destination)
+            elif op.op == "move":
+                # Copy then remove, so a failure can tell a partial copy from a partial removal
+                _copy(op.source, op.destination, tree_workers)
+                op.copied = True
+                _remove(op.source)
+            else:
+                _copy(op.source, op.destination, tree_workers)
+        op.done = True
+    except Exception as e:
+        op.error = str(e)
+
+
+def _undo(op: _Op) -> None:
+    if op.op == "mkdir":
+        if op.created:
+            os.rmdir(op.destination)
+    elif op.op == "delete":
+        if op.backup:
+            os.replace(op.backup, op.source)
+    else:
+        if op.op == "move":
+            shutil.move(op.destination, op.source)
+        else:
+            _remove(op.destination)
+        if op.backup:
+            os.replace(op.backup, op.destination)
+    op.backup = None
+
+
+def _undo_failed(op: _Op) -> None:
+    """Clean up after an operation that failed part-way and put back what it renamed aside."""
+    if op.op == "mkdir":
+        if op.created and os.path.isdir(op.destination):
+            os.rmdir(op.destination)
+    elif op.op == "delete":
+        if op.backup:
+            os.replace(op.backup, op.source)
+    elif op.writing:
+        if op.copied:
+            # The destination is complete but some of the source is already gone - move it back whole
+            _remove(op.source)
+            shutil.move(op.destination, op.source)
+        else:
+            _remove(op.destination)
+        if op.backup:
+            os.replace(op.backup, op.destination)
+    op.backup = None
+
+
+@lazy_tool(category="files")
+def batch_file_ops(operations: List[Dict[str, str]], overwrite: bool = False, rollback: bool = False,
+                   workers: int = 8) -> str:
+    """Run many file/folder operations in one call. operations: list of {"op": "copy"|"move"|"delete"|"mkdir", "source": ..., "destination": ...} (delete/mkdir take "path"). Validated up front; rollback=true undoes everything if any operation fails."""
+    start = time.perf_counter()
+    try:
+        ops = _parse(operations)
+    except Exception as e:
+        return f"Error in batch manifest: {str(e)}"
+    if not ops:
+        return "Batch is empty - nothing to do"
+
+    problems = _validate(ops, overwrite)
+    if problems:
+        lines = [f"Batch rejected - {len(problems)} problem(s), nothing was changed:"]
+        lines += problems[:MAX_REPORTED]
+        if len(problems) > MAX_REPORTED:
+            lines.append(f"... and {len(problems) - MAX_REPORTED} more")
+        return "\n".join(lines)
+
+    batch_id = uuid.uuid4().hex[:8]
+    for op in ops:
+        if op.op == "mkdir":
+            _run(op, overwrite, rollback, batch_id)
+    rest = [op for op in ops if op.op != "mkdir"]
+    if rest:
+        pool_size = max(1, min(workers, MAX_WORKERS, len(rest)))
+        # Folder copies share the worker budget, so a single big copy still runs in parallel
+        tree_workers = max(1, min(workers, MAX_WORKERS) // len(rest))
+        with ThreadPoolExecutor(max_workers=pool_size) as pool:
+            list(pool.map(lambda op: _run(op, overwrite, rollback, batch_id, tree_workers), rest))
+
+    failed = [op for op in ops if op.error]
+    rolled_back = False
+    undo_errors = []
+    if failed and rollback:
+        for op in reversed([op for op in ops if op.done or op.error]):
+            try:
+                if op.done:
+                    _undo(op)
+                else:
+                    _undo_failed(op)
+            except Exception as e:
+                undo_errors.append(f"#{op.index} {op.describe()}: undo failed: {e}")
+        rolled_back = True
+    elif rollback:
+        for op in ops:
+            if op.backup:
+                try:
+                    _remove(op.backup)
+                except OSError as e:
+                    undo_errors.append(f"#{op.index}: could not remove backup {op.backup}: {e}")
+
+    counts = {}
+    for op in ops:
+        if op.done:
+            counts[op.op] = counts.get(op.op, 0) + 1
+    done_text = ", ".join(f"{n} {name}" for name, n in counts.items()) or "none"
+    elapsed = time.perf_counter() - start
+    if not failed:
+        lines = [f"Batch complete: {len(ops)} operations ({done_text}) in {elapsed:.2f}s"]
+    elif rolled_back:
+        lines = [f"Batch failed and was rolled back: {len(failed)} of {len(ops)} operations failed "
+                 f"({elapsed:.2f}s)"]
+    else:
+        lines = [f"Batch partially applied: {len(ops) - len(failed)} ok ({done_text}), "
+                 f"{len(failed)} failed ({elapsed:.2f}s)"]
+    lines += [f"#{op.index} {op.describe()}: {op.error}" for op in failed[:MAX_REPORTED]]
+    if len(failed) > MAX_REPORTED:
+        lines.append(f"... and {len(failed) - MAX_REPORTED} more failures")
+    lines += undo_errors[:MAX_REPORTED]
+    return "\n".join(lines)
@@ -0,0 +1,14 @@
+# C:\David\src\local_agent\tools\common.py
+# Helpers shared by the tool modules
+
+from ..session_context import current_context
+
+
+def resolve_path(path: str) -> str:
+    """Resolve relative paths against the session's working directory (C:\\David by default)"""
+    return current_context().resolve(path)
+
+
+def session_env() -> dict:
+    """Environment for subprocesses, including the session's overrides"""
+    return current_context().environ()
@@ -0,0 +1,69 @@
+# C:\David\src\local_agent\tools\data.py
+# Data profiling - per-column statistics of CSV / JSON Lines files, cached by content hash
+
+from typing import Optional
+
+from ..data_profile import cached_profile
+from ..tool_registry import lazy_tool
+from .common import resolve_path
+from .tables import table_result
+
+COLUMNS = ("name", "type", "count", "nulls", "distinct", "distinct_exact", "min", "max", "mean", "std",
+           "p05", "p25", "p50", "p75", "p95", "top")
+MAX_TOP = 20
+
+
+def _short(value, width: int = 40) -> str:
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    text = str(value)
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def _rows(profile: dict, top: int) -> list:
+    rows = []
+    for column in profile["columns"]:
+        q = column.get("quantiles") or {}
+        rows.append((
+            column["name"], column["type"], column["count"], column["nulls"], column["distinct"],
+            column["distinct_exact"],
+            column.get("min"), column.get("max"), column.get("mean"), column.get("std"),
+            q.get("p05"), q.get("p25"), q.get("p50"), q.get("p75"), q.get("p95"),
+            [[value, count] for value, count in column["top"][:top]],
+        ))
+    return rows
+
+
+def _text(rows: list, total: int) -> str:
+    lines = []
+    for name, kind, count, nulls, distinct, exact, lo, hi, mean, std, p05, p25, p50, p75, p95, top in rows:
+        line = f"{name} ({kind}): {count:,} values, {nulls:,} null, {'' if exact else '>='}{distinct:,} distinct"
+        if kind == "numeric":
+            line += (f"\n    min {_short(lo)}  p25 {_short(p25)}  median {_short(p50)}  p75 {_short(p75)}  "
+                     f"max {_short(hi)}  mean {_short(mean)}  std {_short(std)}")
+        elif lo is not None:
+            line += f"\n    range {_short(lo)!r} .. {_short(hi)!r}"
+        if top:
+            line += "\n    top: " + ", ".join(f"{_short(value, 30)} ({count:,})" for value, count in top)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+@lazy_tool(category="data")
+def profile_data(path: str, top: int = 5, refresh: bool = False, format: str = "text",
+                 sort: Optional[str] = None, filter: Optional[str] = None, limit: Optional[int] = None,
+                 fields: Optional[str] = None) -> str:
+    """Profile the columns of a CSV or JSON Lines file: counts, nulls, distinct values, min/max, mean/std, quantiles and the `top` most common values. Results are cached by file content, so asking again is instant; refresh=True recomputes. format="json"/"tsv" returns a table (distinct is a lower bound where distinct_exact is false); sort="-nulls", filter="type=numeric,name~price", limit=N, fields="name,mean,p50"."""
+    try:
+        resolved_path = resolve_path(path)
+        profile, sha, cached = cached_profile(resolved_path, refresh=refresh)
+        top = max(0, min(top, MAX_TOP))
+        source = "cached" if cached else f"computed in {profile['seconds']:.2f}s ({profile['engine']})"
+        header = (f"Profile of {resolved_path} ({profile['format']}, {profile['rows']:,} rows, "
+                  f"{len(profile['columns'])} columns, {source}, sha256 {sha[:12]})")
+        rows = _rows(profile, top)
+        if (format or "text").lower() != "text" or fields:
+            return table_result(COLUMNS, rows, format=format, sort=sort, filter=filter, limit=limit, fields=fields)
+        return header + "\n" + table_result(COLUMNS, rows, sort=sort, filter=filter, limit=limit, text=_text)
+    except Exception as e:
+        return f"Error profiling data: {str(e)}"
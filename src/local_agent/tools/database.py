@@ -0,0 +1,59 @@
+# C:\David\src\local_agent\tools\database.py
+# Database operations
+
+import sqlite3
+from typing import Optional
+
+from ..tool_registry import lazy_tool
+from .common import resolve_path
+from .tables import table_result
+
+@lazy_tool(category="database")
+def sqlite_query(db_path: str, query: str, format: str = "text", sort: Optional[str] = None,
+                 filter: Optional[str] = None, limit: Optional[int] = None, fields: Optional[str] = None) -> str:
+    """Execute SQLite queries. For SELECT, format="json"/"tsv" returns a compact table; sort="-col", filter="col>value,col~text", limit=N, fields="a,b"."""
+    try:
+        resolved_path = resolve_path(db_path)
+        conn = sqlite3.connect(resolved_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(query)
+        
+        if query.strip().lower().startswith('select'):
+            results = cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description]
+
+            def text(rows, total):
+                output = [f"Query results ({total} rows):"]
+                output.append("Columns: " + ", ".join(columns))
+                for row in rows:
+                    output.append(str(row))
+                return "\n".join(output)
+
+            output = [table_result(columns, results, format, sort, filter, limit, fields, text)]
+        else:
+            conn.commit()
+            output = [f"Query executed successfully"]
+            if cursor.rowcount >= 0:
+                output.append(f"Rows affected: {cursor.rowcount}")
+        
+        conn.close()
+        return "\n".join(output)
+    except Exception as e:
+        return f"Error executing SQLite query: {str(e)}"
+
+@lazy_tool(category="database")
+def sqlite_create_table(db_path: str, table_name: str, schema: str) -> str:
+    """Create SQLite table."""
+    try:
+        resolved_path = resolve_path(db_path)
+        conn = sqlite3.connect(resolved_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({schema})")
+        conn.commit()
+        conn.close()
+        
+        return f"Table '{table_name}' created in {resolved_path}"
+    except Exception as e:
+        return f"Error creating SQLite table: {str(e)}"
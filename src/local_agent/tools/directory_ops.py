@@ -0,0 +1,177 @@
+# C:\David\src\local_agent\tools\directory_ops.py
+# Directory operations
+
+import os
+import shutil
+from datetime import datetime
+from typing import Optional
+
+from ..copy_engine import DEFAULT_WORKERS, copy_tree
+from ..disk_usage import measure, report
+from ..tool_registry import lazy_tool
+from .common import resolve_path, current_context
+from .tables import table_result
+
+MAX_REPORTED_ERRORS = 20
+LIST_DIRECTORY_COLUMNS = ("name", "type", "size", "modified")
+
+@lazy_tool(category="directories")
+def list_directory(path: str = ".", format: str = "text", sort: Optional[str] = None, filter: Optional[str] = None,
+                   limit: Optional[int] = None, fields: Optional[str] = None) -> str:
+    """List directory contents. Columns: name, type (dir/file/link), size, modified. format="json"/"tsv" returns a compact table; sort="-size", filter="type=file,name~log", limit=N, fields="name,size"."""
+    try:
+        resolved_path = resolve_path(path)
+        if not os.path.exists(resolved_path):
+            return f"Directory {resolved_path} does not exist"
+            
+        path = resolved_path
+        rows = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                    st = entry.stat()
+                    size = None if is_dir else st.st_size
+                    modified = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
+                except OSError:
+                    is_dir, size, modified = False, None, None
+                kind = "dir" if is_dir else "link" if entry.is_symlink() else "file"
+                rows.append((entry.name, kind, size, modified))
+        rows.sort(key=lambda r: r[0])
+
+        def text(rows, total):
+            if not rows:
+                return f"Directory {path} is empty" if not total else f"No entries in {path} match"
+            items = []
+            for name, kind, size, _ in rows:
+                if kind == "dir":
+                    items.append(f"📁 {name}/")
+                elif size is not None:
+                    items.append(f"📄 {name} ({size} bytes)")
+                else:
+                    items.append(f"📄 {name}")
+            return f"Contents of {path}:\n" + "\n".join(items)
+
+        return table_result(LIST_DIRECTORY_COLUMNS, rows, format, sort, filter, limit, fields, text)
+    except Exception as e:
+        return f"Error listing directory: {str(e)}"
+
+@lazy_tool(category="directories")
+def create_directory(path: str) -> str:
+    """Create directory."""
+    try:
+        path = resolve_path(path)
+        os.makedirs(path, exist_ok=True)
+        return f"Directory created: {path}"
+    except Exception as e:
+        return f"Error creating directory: {str(e)}"
+
+@lazy_tool(category="directories")
+def delete_directory(path: str, recursive: bool = False) -> str:
+    """Delete directory."""
+    try:
+        path = resolve_path(path)
+        if recursive:
+            shutil.rmtree(path)
+        else:
+            os.rmdir(path)
+        return f"Directory deleted: {path}"
+    except Exception as e:
+        return f"Error deleting directory: {str(e)}"
+
+@lazy_tool(category="directories")
+def copy_directory(source: str, destination: str, sync: bool = False, workers: int = DEFAULT_WORKERS) -> str:
+    """Copy entire directory. sync=True copies into an existing destination and skips files that are unchanged (same size and modified time)."""
+    try:
+        resolved_source = resolve_path(source)
+        resolved_dest = resolve_path(destination)
+        stats = copy_tree(resolved_source, resolved_dest, workers=workers, sync=sync)
+        result = f"Directory copied from {resolved_source} to {resolved_dest}: {stats.summary()}"
+        if stats.errors:
+            result += "\n" + "\n".join(stats.errors[:MAX_REPORTED_ERRORS])
+            if len(stats.errors) > MAX_REPORTED_ERRORS:
+                result += f"\n... and {len(stats.errors) - MAX_REPORTED_ERRORS} more errors"
+        return result
+    except Exception as e:
+        return f"Error copying directory: {str(e)}"
+
+@lazy_tool(category="directories")
+def move_directory(source: str, destination: str) -> str:
+    """Move directory."""
+    try:
+        resolved_source = resolve_path(source)
+        resolved_dest = resolve_path(destination)
+        shutil.move(resolved_source, resolved_dest)
+        return f"Directory moved from {resolved_source} to {resolved_dest}"
+    except Exception as e:
+        return f"Error moving directory: {str(e)}"
+
+@lazy_tool(category="directories")
+def directory_exists(path: str) -> str:
+    """Check if directory exists."""
+    resolved_path = resolve_path(path)
+    return f"Directory {resolved_path}: {'EXISTS' if os.path.isdir(resolved_path) else 'DOES NOT EXIST'}"
+
+@lazy_tool(category="directories")
+def directory_size(path: str, top: int = 10) -> str:
+    """Calculate directory size, with the `top` largest files/folders inside it. Hard links count once; unreadable entries are skipped and reported."""
+    try:
+        resolved_path = resolve_path(path)
+        return report(measure(resolved_path), top=top)
+    except Exception as e:
+        return f"Error calculating directory size: {str(e)}"
+
+@lazy_tool(category="directories")
+def find_directories(root: str, pattern: str) -> str:
+    """Find directories by pattern."""
+    try:
+        resolved_root = resolve_path(root)
+        matches = []
+        for dirpath, dirnames, filenames in os.walk(resolved_root):
+            for dirname in dirnames:
+                if pattern.lower() in dirname.lower():
+                    matches.append(os.path.join(dirpath, dirname))
+        
+        if not matches:
+            return f"No directories found matching '{pattern}' in {resolved_root}"
+        
+        return f"Found {len(matches)} directories:\n" + "\n".join(matches)
+    except Exception as e:
+        return f"Error finding directories: {str(e)}"
+
+@lazy_tool(category="directories")
+def directory_tree(path: str, max_depth: Optional[int] = None) -> str:
+    """Get directory tree structure."""
+    try:
+        resolved_path = resolve_path(path)
+        tree_lines = []
+        
+        for root, dirs, files in os.walk(resolved_path):
+            level = root.replace(resolved_path, '').count(os.sep)
+            if max_depth and level >= max_depth:
+                dirs.clear()
+                continue
+            
+            indent = ' ' * 2 * level
+            tree_lines.append(f"{indent}{os.path.basename(root)}/")
+            
+            subindent = ' ' * 2 * (level + 1)
+            for file in files:
+                tree_lines.append(f"{subindent}{file}")
+        
+        return f"Directory tree of {resolved_path}:\n" + "\n".join(tree_lines)
+    except Exception as e:
+        return f"Error generating directory tree: {str(e)}"
+
+@lazy_tool(category="directories")
+def get_current_directory() -> str:
+    """Get current working directory."""
+    return f"Current directory: {current_context().cwd}"
+
+@lazy_tool(category="directories")
+def change_directory(path: str) -> str:
+    """Change working directory."""
+    try:
+        return f"Changed directory to: {current_context().chdir(path)}"
+    except Exception as e:
+        return f"Error changing directory: {str(e)}"
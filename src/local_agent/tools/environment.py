@@ -0,0 +1,80 @@
+# C:\David\src\local_agent\tools\environment.py
+# Environment & system
+
+import subprocess
+import time
+from datetime import datetime
+from typing import Optional
+
+from ..tool_registry import lazy_tool, optional_import
+from .common import session_env, current_context
+from .tables import table_result
+
+ENVIRONMENT_COLUMNS = ("name", "value")
+
+@lazy_tool(category="environment")
+def environment_variables(format: str = "text", sort: Optional[str] = None, filter: Optional[str] = None,
+                          limit: Optional[int] = None, fields: Optional[str] = None) -> str:
+    """List environment variables. Columns: name, value. format="json"/"tsv" returns a compact table; sort="-col", filter="col>value,col~text", limit=N, fields="a,b"."""
+    try:
+        rows = sorted(session_env().items())
+
+        def text(rows, total):
+            env_vars = [f"{key}={value}" for key, value in rows]
+            return f"Environment variables ({total}):\n" + "\n".join(env_vars)
+
+        return table_result(ENVIRONMENT_COLUMNS, rows, format, sort, filter, limit, fields, text)
+    except Exception as e:
+        return f"Error listing environment variables: {str(e)}"
+
+@lazy_tool(category="environment")
+def set_environment_variable(name: str, value: str) -> str:
+    """Set environment variable."""
+    try:
+        current_context().setenv(name, value)
+        return f"Set environment variable {name}={value}"
+    except Exception as e:
+        return f"Error setting environment variable: {str(e)}"
+
+@lazy_tool(category="environment")
+def get_environment_variable(name: str) -> str:
+    """Get environment variable."""
+    try:
+        value = current_context().getenv(name)
+        return f"Environment variable {name}: {value if value else 'NOT SET'}"
+    except Exception as e:
+        return f"Error getting environment variable: {str(e)}"
+
+@lazy_tool(category="environment", requires=["mod:psutil"])
+def system_uptime() -> str:
+    """Get system uptime."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            boot_time = psutil.boot_time()
+            uptime = time.time() - boot_time
+            days = int(uptime // 86400)
+            hours = int((uptime % 86400) // 3600)
+            minutes = int((uptime % 3600) // 60)
+            return f"System uptime: {days} days, {hours} hours, {minutes} minutes"
+        else:
+            return "System uptime requires psutil"
+    except Exception as e:
+        return f"Error getting system uptime: {str(e)}"
+
+@lazy_tool(category="environment", requires=["mod:psutil|bin:query"])
+def logged_in_users() -> str:
+    """List logged in users."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            users = psutil.users()
+            user_list = []
+            for user in users:
+                user_list.append(f"{user.name} on {user.terminal} since {datetime.fromtimestamp(user.started)}")
+            return f"Logged in users:\n" + "\n".join(user_list)
+        else:
+            result = subprocess.run(['query', 'user'], capture_output=True, text=True)
+            return f"Logged in users:\n{result.stdout}"
+    except Exception as e:
+        return f"Error getting logged in users: {str(e)}"
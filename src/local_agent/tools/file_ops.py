@@ -0,0 +1,194 @@
+# C:\David\src\local_agent\tools\file_ops.py
+# File operations
+
+import os
+import shutil
+import subprocess
+import hashlib
+import platform
+from datetime import datetime
+
+from ..copy_engine import CopyStats, copy_one
+from ..tool_registry import lazy_tool
+from .common import resolve_path
+
+@lazy_tool(category="files")
+def read_file(path: str) -> str:
+    """Read any file content."""
+    try:
+        resolved_path = resolve_path(path)
+        with open(resolved_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        return f"File content ({len(content)} chars):\n{content}"
+    except Exception as e:
+        return f"Error reading file: {str(e)}"
+
+@lazy_tool(category="files")
+def write_file(path: str, content: str) -> str:
+    """Write/overwrite file content."""
+    try:
+        resolved_path = resolve_path(path)
+        os.makedirs(os.path.dirname(resolved_path), exist_ok=True)
+        with open(resolved_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return f"Successfully wrote {len(content)} characters to {resolved_path}"
+    except Exception as e:
+        return f"Error writing file: {str(e)}"
+
+@lazy_tool(category="files")
+def append_file(path: str, content: str) -> str:
+    """Append to existing file."""
+    try:
+        resolved_path = resolve_path(path)
+        with open(resolved_path, 'a', encoding='utf-8') as f:
+            f.write(content)
+        return f"Successfully appended {len(content)} characters to {resolved_path}"
+    except Exception as e:
+        return f"Error appending to file: {str(e)}"
+
+@lazy_tool(category="files")
+def delete_file(path: str) -> str:
+    """Delete file."""
+    try:
+        resolved_path = resolve_path(path)
+        os.remove(resolved_path)
+        return f"Successfully deleted {resolved_path}"
+    except Exception as e:
+        return f"Error deleting file: {str(e)}"
+
+@lazy_tool(category="files")
+def copy_file(source: str, destination: str, sync: bool = False) -> str:
+    """Copy file. sync=True skips the copy when the destination already has the same size and modified time."""
+    try:
+        resolved_source = resolve_path(source)
+        resolved_dest = resolve_path(destination)
+        os.makedirs(os.path.dirname(resolved_dest), exist_ok=True)
+        stats = CopyStats()
+        if not copy_one(resolved_source, resolved_dest, sync=sync, stats=stats):
+            return f"{resolved_dest} is already up to date with {resolved_source} - not copied"
+        return f"Successfully copied {resolved_source} to {resolved_dest} ({stats.finish().summary()})"
+    except Exception as e:
+        return f"Error copying file: {str(e)}"
+
+@lazy_tool(category="files")
+def move_file(source: str, destination: str) -> str:
+    """Move/rename file."""
+    try:
+        resolved_source = resolve_path(source)
+        resolved_dest = resolve_path(destination)
+        os.makedirs(os.path.dirname(resolved_dest), exist_ok=True)
+        shutil.move(resolved_source, resolved_dest)
+        return f"Successfully moved {resolved_source} to {resolved_dest}"
+    except Exception as e:
+        return f"Error moving file: {str(e)}"
+
+@lazy_tool(category="files")
+def file_exists(path: str) -> str:
+    """Check if file exists."""
+    resolved_path = resolve_path(path)
+    return f"File {resolved_path}: {'EXISTS' if os.path.exists(resolved_path) else 'DOES NOT EXIST'}"
+
+@lazy_tool(category="files")
+def file_info(path: str) -> str:
+    """Get file metadata."""
+    try:
+        path = resolve_path(path)
+        if not os.path.exists(path):
+            return f"Path {path} does not exist"
+            
+        stat = os.stat(path)
+        info = []
+        info.append(f"Path: {path}")
+        info.append(f"Size: {stat.st_size} bytes")
+        info.append(f"Modified: {datetime.fromtimestamp(stat.st_mtime)}")
+        info.append(f"Created: {datetime.fromtimestamp(stat.st_ctime)}")
+        info.append(f"Type: {'File' if os.path.isfile(path) else 'Directory'}")
+        return "\n".join(info)
+    except Exception as e:
+        return f"Error getting file info: {str(e)}"
+
+@lazy_tool(category="files")
+def edit_line(path: str, line_number: int, new_content: str) -> str:
+    """Edit specific line in file."""
+    try:
+        resolved_path = resolve_path(path)
+        with open(resolved_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        
+        if line_number < 1 or line_number > len(lines):
+            return f"Error: Line {line_number} out of range (1-{len(lines)})"
+        
+        lines[line_number - 1] = new_content + '\n'
+        
+        with open(resolved_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        
+        return f"Successfully edited line {line_number} in {resolved_path}"
+    except Exception as e:
+        return f"Error editing line: {str(e)}"
+
+@lazy_tool(category="files")
+def find_replace(path: str, find: str, replace: str, regex: bool = False) -> str:
+    """Find and replace text in file."""
+    try:
+        resolved_path = resolve_path(path)
+        with open(resolved_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        if regex:
+            import re
+            new_content = re.sub(find, replace, content)
+        else:
+            new_content = content.replace(find, replace)
+        
+        with open(resolved_path, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+        
+        return f"Find/replace completed in {resolved_path}"
+    except Exception as e:
+        return f"Error in find/replace: {str(e)}"
+
+@lazy_tool(category="files")
+def file_permissions(path: str, permissions: str) -> str:
+    """Change file permissions (Windows)."""
+    try:
+        resolved_path = resolve_path(path)
+        if platform.system() == "Windows":
+            subprocess.run(['icacls', resolved_path, '/grant', f'Everyone:{permissions}'], check=True)
+            return f"Permissions changed for {resolved_path}"
+        else:
+            os.chmod(resolved_path, int(permissions, 8))
+            return f"Permissions changed for {resolved_path}"
+    except Exception as e:
+        return f"Error changing permissions: {str(e)}"
+
+@lazy_tool(category="files")
+def file_search(directory: str, pattern: str) -> str:
+    """Search for files by pattern."""
+    try:
+        resolved_dir = resolve_path(directory)
+        import glob
+        search_pattern = os.path.join(resolved_dir, pattern)
+        matches = glob.glob(search_pattern, recursive=True)
+        
+        if not matches:
+            return f"No files found matching '{pattern}' in {resolved_dir}"
+        
+        return f"Found {len(matches)} files:\n" + "\n".join(matches)
+    except Exception as e:
+        return f"Error searching files: {str(e)}"
+
+@lazy_tool(category="files")
+def file_hash(path: str, algorithm: str = 'md5') -> str:
+    """Generate file hash."""
+    try:
+        resolved_path = resolve_path(path)
+        hash_obj = hashlib.new(algorithm)
+        
+        with open(resolved_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(4096), b""):
+                hash_obj.update(chunk)
+        
+        return f"{algorithm.upper()} hash of {resolved_path}: {hash_obj.hexdigest()}"
+    except Exception as e:
+        return f"Error generating hash: {str(e)}"
@@ -0,0 +1,79 @@
+# C:\David\src\local_agent\tools\hardware.py
+# Hardware access
+
+import shutil
+from typing import Optional
+
+from ..tool_registry import lazy_tool, optional_import
+from .tables import table_result
+
+DISK_LIST_COLUMNS = ("device", "mountpoint", "fstype", "total", "used", "free", "percent")
+
+@lazy_tool(category="hardware", requires=["mod:psutil"])
+def cpu_usage() -> str:
+    """Get CPU usage percentage."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            usage = psutil.cpu_percent(interval=1)
+            return f"CPU usage: {usage}%"
+        else:
+            return "CPU usage info requires psutil"
+    except Exception as e:
+        return f"Error getting CPU usage: {str(e)}"
+
+@lazy_tool(category="hardware", requires=["mod:psutil"])
+def memory_usage() -> str:
+    """Get RAM usage information."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            mem = psutil.virtual_memory()
+            return f"Memory: {mem.percent}% used ({mem.used // (1024**3)} GB / {mem.total // (1024**3)} GB)"
+        else:
+            return "Memory usage info requires psutil"
+    except Exception as e:
+        return f"Error getting memory usage: {str(e)}"
+
+@lazy_tool(category="hardware")
+def disk_usage(drive: str = 'C:') -> str:
+    """Get disk space information."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            usage = psutil.disk_usage(drive)
+            return f"Disk {drive}: {usage.percent}% used ({usage.used // (1024**3)} GB / {usage.total // (1024**3)} GB)"
+        else:
+            usage = shutil.disk_usage(drive)
+            return f"Disk {drive}: {usage.used // (1024**3)} GB used / {usage.total // (1024**3)} GB total"
+    except Exception as e:
+        return f"Error getting disk usage: {str(e)}"
+
+@lazy_tool(category="hardware", requires=["mod:psutil"])
+def disk_list(format: str = "text", sort: Optional[str] = None, filter: Optional[str] = None,
+              limit: Optional[int] = None, fields: Optional[str] = None) -> str:
+    """List all disk drives. Columns: device, mountpoint, fstype, total, used, free (bytes), percent. format="json"/"tsv" returns a compact table; sort="-col", filter="col>value,col~text", limit=N, fields="a,b"."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            partitions = psutil.disk_partitions()
+            rows = []
+            for partition in partitions:
+                try:
+                    usage = psutil.disk_usage(partition.mountpoint)
+                    rows.append((partition.device, partition.mountpoint, partition.fstype, usage.total, usage.used,
+                                 usage.free, usage.percent))
+                except:
+                    rows.append((partition.device, partition.mountpoint, partition.fstype, None, None, None, None))
+
+            def text(rows, total):
+                drives = [f"{device} ({fstype}) - {percent}% used" if percent is not None
+                          else f"{device} ({fstype}) - unavailable"
+                          for device, _, fstype, _, _, _, percent in rows]
+                return "Disk drives:\n" + "\n".join(drives)
+
+            return table_result(DISK_LIST_COLUMNS, rows, format, sort, filter, limit, fields, text)
+        else:
+            return "Disk list requires psutil"
+    except Exception as e:
+        return f"Error listing disks: {str(e)}"
@@ -0,0 +1,60 @@
+# C:\David\src\local_agent\tools\languages.py
+# Programming language execution
+
+import os
+import subprocess
+
+from ..tool_registry import lazy_tool
+from .common import resolve_path, session_env, current_context
+
+@lazy_tool(category="languages", requires=["bin:node"])
+def node_execute(code: str, file_path: str = '') -> str:
+    """Execute JavaScript/Node.js."""
+    try:
+        if file_path:
+            resolved_path = resolve_path(file_path)
+            if not os.path.exists(resolved_path):
+                return f"JavaScript file {resolved_path} does not exist"
+            result = subprocess.run(['node', resolved_path], cwd=current_context().cwd, env=session_env(),
+                                    timeout=30, capture_output=True, text=True)
+        else:
+            result = subprocess.run(['node', '-e', code], cwd=current_context().cwd, env=session_env(),
+                                    timeout=30, capture_output=True, text=True)
+        
+        output = [f"Node.js execution completed", f"Exit code: {result.returncode}"]
+        if result.stdout:
+            output.append(f"Output:\n{result.stdout}")
+        if result.stderr:
+            output.append(f"Error:\n{result.stderr}")
+        
+        return "\n".join(output)
+    except Exception as e:
+        return f"Error executing Node.js: {str(e)}"
+
+@lazy_tool(category="languages", requires=["bin:javac", "bin:java"])
+def java_execute(file_path: str, class_name: str) -> str:
+    """Execute Java programs."""
+    try:
+        resolved_path = resolve_path(file_path)
+        if not os.path.exists(resolved_path):
+            return f"Java file {resolved_path} does not exist"
+        
+        # Compile first
+        compile_result = subprocess.run(['javac', resolved_path], cwd=current_context().cwd, env=session_env(),
+                                        capture_output=True, text=True)
+        if compile_result.returncode != 0:
+            return f"Java compilation failed:\n{compile_result.stderr}"
+        
+        # Run
+        result = subprocess.run(['java', '-cp', os.path.dirname(resolved_path), class_name], cwd=current_context().cwd,
+                                env=session_env(), timeout=30, capture_output=True, text=True)
+        
+        output = [f"Java execution completed", f"Exit code: {result.returncode}"]
+        if result.stdout:
+            output.append(f"Output:\n{result.stdout}")
+        if result.stderr:
+            output.append(f"Error:\n{result.stderr}")
+        
+        return "\n".join(output)
+    except Exception as e:
+        return f"Error executing Java: {str(e)}"
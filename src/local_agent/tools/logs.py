@@ -0,0 +1,138 @@
+# C:\David\src\local_agent\tools\logs.py
+# Log analysis - tail, follow and template summaries of large log files and the systemd journal
+
+import os
+import time
+from typing import Union
+
+from ..log_analysis import (
+    LogSummary, compile_filter, follow_file, iter_file, iter_journal, journal_unit, tail_file,
+)
+from ..tool_registry import lazy_tool
+from .common import resolve_path
+
+MODES = ("tail", "follow", "summary")
+MAX_LINES = 1000
+MAX_SHOWN_BUCKETS = 48
+JOURNAL_SUMMARY_SINCE = "-24h"  # default window for summarizing the journal
+
+
+def _tail_journal(unit, count, regex):
+    found, newest = [], None
+    for line, cursor, _ in iter_journal(unit, reverse=True):
+        newest = newest or cursor
+        if regex is None or regex.search(line):
+            found.append(line)
+            if len(found) >= count:
+                break
+    found.reverse()
+    return found, newest
+
+
+def _follow_journal(unit, cursor, count, regex):
+    found = []
+    for line, entry_cursor, _ in iter_journal(unit, after_cursor=cursor):
+        if len(found) >= count:
+            return found, cursor, True
+        cursor = entry_cursor
+        if regex is None or regex.search(line):
+            found.append(line)
+    return found, cursor, False
+
+
+def _summary_report(summary: LogSummary, label: str, scanned: str, elapsed: float, top: int) -> str:
+    lines = [f"Log summary of {label}: {summary.matched:,} lines{scanned} in {elapsed:.1f}s, "
+             f"{len(summary.templates) + summary.evicted_templates:,} templates"]
+    if summary.levels:
+        lines.append("Levels: " + ", ".join(f"{name} {count:,}" for name, count in
+                                            sorted(summary.levels.items(), key=lambda kv: -kv[1])))
+    if summary.buckets:
+        shown = sorted(summary.buckets.items())[-MAX_SHOWN_BUCKETS:]
+        lines.append(f"Per {summary.bucket_level} (lines / errors)"
+                     + (f", last {len(shown)} of {len(summary.buckets)}:" if len(shown) < len(summary.buckets) else ":"))
+        lines += [f"  {key}  {count:,} / {errors:,}" for key, (count, errors) in shown]
+    lines.append("Top templates (count, level, first - last seen):")
+    for template, (count, first, last, example, level) in summary.top(top):
+        seen = f"{first} - {last}" if first else "no timestamp"
+        lines.append(f"  {count:>8,}  {level or '-':<5}  {seen}  {template[:300]}")
+    if summary.other:
+        lines.append(f"  {summary.other:>8,}  lines in {summary.evicted_templates:,} rarer templates not kept")
+    return "\n".join(lines)
+
+@lazy_tool(category="monitoring")
+def log_analyze(path: str, mode: str = "tail", lines: int = 50, pattern: str = None,
+                offset: Union[int, str] = None, bucket: str = "hour", top: int = 20, since: str = None) -> str:
+    """Analyze a large log without reading it whole. path: a log file, or "journal" / "journal:<unit>" for the systemd journal. mode: "tail" (last `lines` lines), "follow" (lines added after `offset` - use the offset/cursor returned by a previous call), "summary" (group lines into templates with numbers/ids masked, with counts, levels and a per-`bucket` (minute/hour/day) histogram). pattern: regex filter (case-insensitive). since: journal only, e.g. "-2h" or "2026-10-19 08:00"."""
+    try:
+        mode = (mode or "tail").lower()
+        if mode not in MODES:
+            return f"Error analyzing log: mode must be one of {', '.join(MODES)}"
+        count = max(1, min(lines, MAX_LINES))
+        regex = compile_filter(pattern)
+        matching = f" matching /{pattern}/" if pattern else ""
+        unit = journal_unit(path)
+        label = (f"the journal ({unit})" if unit else "the journal") if unit is not None else resolve_path(path)
+        start = time.perf_counter()
+
+        if mode == "tail":
+            if unit is not None:
+                found, cursor = _tail_journal(unit, count, regex)
+                next_hint = f'mode="follow", offset="{cursor}"' if cursor else None
+            else:
+                found, end = tail_file(label, count, regex)
+                next_hint = f'mode="follow", offset={end}'
+            output = [f"Last {len(found)} line(s) of {label}{matching}:"] + found
+            if next_hint:
+                output.append(f"[new lines later: log_analyze(path=\"{path}\", {next_hint})]")
+            return "\n".join(output)
+
+        if mode == "follow":
+            if offset is None or offset == "":
+                return "Error analyzing log: follow needs the offset (or journal cursor) returned by a previous call"
+            if unit is not None:
+                found, cursor, more = _follow_journal(unit, str(offset), count, regex)
+                next_offset, rotated = f'"{cursor}"', False
+            else:
+                found, end, rotated, more = follow_file(label, int(offset), count, regex)
+                next_offset = end
+            output = []
+            if rotated:
+                output.append(f"Note: {label} is shorter than offset {offset} - it was rotated or truncated; "
+                              f"reading from the start")
+            output.append(f"{len(found)} new line(s) in {label}{matching}:" if found
+                          else f"No new lines in {label}{matching}.")
+            output += found
+            output.append(f"[{'more pending - ' if more else ''}next: log_analyze(path=\"{path}\", mode=\"follow\", "
+                          f"offset={next_offset})]")
+            return "\n".join(output)
+
+        summary = LogSummary(bucket)
+        if unit is not None:
+            cursor = str(offset) if offset not in (None, "") else None
+            window = since or (None if cursor else JOURNAL_SUMMARY_SINCE)
+            for line, cursor_seen, level in iter_journal(unit, after_cursor=cursor, since=window):
+                summary.lines += 1
+                cursor = cursor_seen
+                if regex is None or regex.search(line):
+                    summary.add(line, level)
+            scanned = (f"{matching} of {summary.lines:,}" if pattern else "") + (f" since {window}" if window else "")
+            next_offset = f'"{cursor}"' if cursor else None
+        else:
+            position = int(offset) if offset not in (None, "") else 0
+            if position > os.path.getsize(label):
+                position = 0
+            begin = position
+            for line, position in iter_file(label, position):
+                summary.lines += 1
+                if regex is None or regex.search(line):
+                    summary.add(line)
+            scanned = ((f"{matching} of {summary.lines:,}" if pattern else "")
+                       + f" ({(position - begin) / 1024 / 1024:,.1f} MB scanned)")
+            next_offset = position
+        result = _summary_report(summary, label, scanned, time.perf_counter() - start, max(1, top))
+        if next_offset is not None:
+            result += (f"\n[summarize only newer lines: log_analyze(path=\"{path}\", mode=\"summary\", "
+                       f"offset={next_offset})]")
+        return result
+    except Exception as e:
+        return f"Error analyzing log: {str(e)}"
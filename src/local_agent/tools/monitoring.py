@@ -0,0 +1,58 @@
+# C:\David\src\local_agent\tools\monitoring.py
+# System monitoring
+
+import subprocess
+import platform
+import time
+
+from ..tool_registry import lazy_tool, optional_import
+
+@lazy_tool(category="monitoring", requires=["mod:psutil"])
+def monitor_cpu(duration: int = 60) -> str:
+    """Monitor CPU usage over time."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil is None:
+            return "CPU monitoring requires psutil"
+        
+        samples = []
+        for i in range(min(duration, 10)):  # Limit samples
+            cpu_percent = psutil.cpu_percent(interval=1)
+            samples.append(cpu_percent)
+        
+        avg_cpu = sum(samples) / len(samples)
+        return f"CPU monitoring ({len(samples)} seconds): Average {avg_cpu:.1f}%, Peak {max(samples):.1f}%"
+    except Exception as e:
+        return f"Error monitoring CPU: {str(e)}"
+
+@lazy_tool(category="monitoring", requires=["mod:psutil"])
+def monitor_memory(duration: int = 60) -> str:
+    """Monitor memory usage over time."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil is None:
+            return "Memory monitoring requires psutil"
+        
+        samples = []
+        for i in range(min(duration // 10, 6)):  # Sample every 10 seconds
+            mem = psutil.virtual_memory()
+            samples.append(mem.percent)
+            time.sleep(1)
+        
+        avg_mem = sum(samples) / len(samples)
+        return f"Memory monitoring: Average {avg_mem:.1f}%, Peak {max(samples):.1f}%"
+    except Exception as e:
+        return f"Error monitoring memory: {str(e)}"
+
+@lazy_tool(category="monitoring", requires=["os:Windows", "bin:wevtutil"])
+def system_logs(log_type: str = 'system', count: int = 100) -> str:
+    """Read system logs."""
+    try:
+        if platform.system() == "Windows":
+            result = subprocess.run(['wevtutil', 'qe', log_type, '/c:' + str(count), '/f:text'], 
+                                  capture_output=True, text=True)
+            return f"System logs ({log_type}):\n{result.stdout}"
+        else:
+            return "System logs require Windows Event Viewer"
+    except Exception as e:
+        return f"Error reading system logs: {str(e)}"
@@ -0,0 +1,65 @@
+# C:\David\src\local_agent\tools\network.py
+# Network operations
+
+import subprocess
+import platform
+
+from ..tool_registry import lazy_tool, optional_import
+
+@lazy_tool(category="network", requires=["bin:ping"])
+def ping_host(target: str, count: int = 4) -> str:
+    """Ping network host."""
+    try:
+        cmd = ['ping', '-n', str(count), target] if platform.system() == "Windows" else ['ping', '-c', str(count), target]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        return f"Ping results for {target}:\n{result.stdout}"
+    except Exception as e:
+        return f"Error pinging host: {str(e)}"
+
+@lazy_tool(category="network", requires=["bin:nslookup"])
+def nslookup(hostname: str) -> str:
+    """DNS lookup."""
+    try:
+        result = subprocess.run(['nslookup', hostname], capture_output=True, text=True, timeout=10)
+        return f"DNS lookup for {hostname}:\n{result.stdout}"
+    except Exception as e:
+        return f"Error in DNS lookup: {str(e)}"
+
+@lazy_tool(category="network", requires=["bin:tracert|traceroute"])
+def traceroute(target: str) -> str:
+    """Trace network route."""
+    try:
+        cmd = ['tracert', target] if platform.system() == "Windows" else ['traceroute', target]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        return f"Traceroute to {target}:\n{result.stdout}"
+    except Exception as e:
+        return f"Error in traceroute: {str(e)}"
+
+@lazy_tool(category="network", requires=["bin:netstat"])
+def netstat(options: str = '') -> str:
+    """Network connection status."""
+    try:
+        cmd = ['netstat'] + options.split() if options else ['netstat']
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        return f"Network status:\n{result.stdout}"
+    except Exception as e:
+        return f"Error getting network status: {str(e)}"
+
+@lazy_tool(category="network", requires=["mod:psutil|bin:ipconfig"])
+def network_interfaces() -> str:
+    """List network interfaces."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            interfaces = psutil.net_if_addrs()
+            info = []
+            for interface, addrs in interfaces.items():
+                info.append(f"Interface: {interface}")
+                for addr in addrs:
+                    info.append(f"  {addr.family.name}: {addr.address}")
+            return "\n".join(info)
+        else:
+            result = subprocess.run(['ipconfig'], capture_output=True, text=True)
+            return f"Network interfaces:\n{result.stdout}"
+    except Exception as e:
+        return f"Error getting network interfaces: {str(e)}"
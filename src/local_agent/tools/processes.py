@@ -0,0 +1,122 @@
+# C:\David\src\local_agent\tools\processes.py
+# Process management
+
+import csv
+import subprocess
+from typing import Optional
+
+from ..tool_registry import lazy_tool, optional_import
+from .common import resolve_path, session_env, current_context
+from .tables import table_result
+
+LIST_PROCESSES_COLUMNS = ("pid", "name", "cpu", "mem")
+
+@lazy_tool(category="processes", requires=["mod:psutil|bin:tasklist"])
+def list_processes(format: str = "text", sort: Optional[str] = None, filter: Optional[str] = None,
+                   limit: Optional[int] = None, fields: Optional[str] = None) -> str:
+    """List all running processes. Columns: pid, name, cpu, mem (percent). format="json"/"tsv" returns a compact table; sort="-col", filter="col>value,col~text", limit=N, fields="a,b"."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            rows = []
+            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
+                info = proc.info
+                if info['cpu_percent'] is None or info['memory_percent'] is None:
+                    continue
+                rows.append((info['pid'], info['name'], round(info['cpu_percent'], 1), round(info['memory_percent'], 1)))
+
+            def text(rows, total):
+                processes = [f"PID {pid}: {name} (CPU: {cpu:.1f}%, MEM: {mem:.1f}%)" for pid, name, cpu, mem in rows]
+                return f"Running processes ({total}):\n" + "\n".join(processes)
+
+            return table_result(LIST_PROCESSES_COLUMNS, rows, format, sort, filter, limit, fields, text)
+        elif format == "text" and not (sort or filter or limit or fields):
+            result = subprocess.run(['tasklist'], capture_output=True, text=True)
+            return f"Process list:\n{result.stdout}"
+        else:
+            # tasklist has no CPU/memory percentages - those columns stay empty
+            result = subprocess.run(['tasklist', '/FO', 'CSV', '/NH'], capture_output=True, text=True)
+            rows = [(int(r[1]), r[0], None, None) for r in csv.reader(result.stdout.splitlines())
+                    if len(r) > 1 and r[1].isdigit()]
+            return table_result(LIST_PROCESSES_COLUMNS, rows, format, sort, filter, limit, fields)
+    except Exception as e:
+        return f"Error listing processes: {str(e)}"
+
+@lazy_tool(category="processes", requires=["mod:psutil"])
+def process_info(pid_or_name: str) -> str:
+    """Get detailed process information."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            if pid_or_name.isdigit():
+                proc = psutil.Process(int(pid_or_name))
+            else:
+                procs = [p for p in psutil.process_iter() if p.name().lower() == pid_or_name.lower()]
+                if not procs:
+                    return f"Process '{pid_or_name}' not found"
+                proc = procs[0]
+            
+            info = []
+            info.append(f"PID: {proc.pid}")
+            info.append(f"Name: {proc.name()}")
+            info.append(f"CPU: {proc.cpu_percent()}%")
+            info.append(f"Memory: {proc.memory_percent():.2f}%")
+            info.append(f"Status: {proc.status()}")
+            return "\n".join(info)
+        else:
+            return f"Process info for {pid_or_name} (requires psutil)"
+    except Exception as e:
+        return f"Error getting process info: {str(e)}"
+
+@lazy_tool(category="processes")
+def start_process(executable: str, args: str = None, working_dir: str = None) -> str:
+    """Start new process."""
+    try:
+        cmd = [executable]
+        if args:
+            cmd.extend(args.split())
+        
+        working_dir = resolve_path(working_dir) if working_dir else current_context().cwd
+        
+        proc = subprocess.Popen(cmd, cwd=working_dir, env=session_env())
+        return f"Started process: {executable} (PID: {proc.pid})"
+    except Exception as e:
+        return f"Error starting process: {str(e)}"
+
+@lazy_tool(category="processes", requires=["mod:psutil|bin:taskkill"])
+def kill_process(pid_or_name: str) -> str:
+    """Terminate process."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            if pid_or_name.isdigit():
+                proc = psutil.Process(int(pid_or_name))
+                proc.terminate()
+                return f"Terminated process PID {pid_or_name}"
+            else:
+                killed = 0
+                for proc in psutil.process_iter():
+                    if proc.name().lower() == pid_or_name.lower():
+                        proc.terminate()
+                        killed += 1
+                return f"Terminated {killed} processes named '{pid_or_name}'"
+        else:
+            subprocess.run(['taskkill', '/f', '/im', pid_or_name], check=True)
+            return f"Terminated process: {pid_or_name}"
+    except Exception as e:
+        return f"Error killing process: {str(e)}"
+
+@lazy_tool(category="processes", requires=["mod:psutil|bin:tasklist"])
+def process_exists(name: str) -> str:
+    """Check if process is running."""
+    try:
+        psutil = optional_import("psutil")
+        if psutil:
+            exists = any(p.name().lower() == name.lower() for p in psutil.process_iter())
+            return f"Process '{name}': {'RUNNING' if exists else 'NOT RUNNING'}"
+        else:
+            result = subprocess.run(['tasklist', '/fi', f'imagename eq {name}'], capture_output=True, text=True)
+            exists = name.lower() in result.stdout.lower()
+            return f"Process '{name}': {'RUNNING' if exists else 'NOT RUNNING'}"
+    except Exception as e:
+        return f"Error checking process: {str(e)}"
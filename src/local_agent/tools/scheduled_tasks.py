@@ -0,0 +1,34 @@
+# C:\David\src\local_agent\tools\scheduled_tasks.py
+# Scheduled tasks (Windows)
+
+import subprocess
+
+from ..tool_registry import lazy_tool
+
+@lazy_tool(category="scheduled_tasks", requires=["bin:schtasks"])
+def list_scheduled_tasks() -> str:
+    """List Windows scheduled tasks."""
+    try:
+        result = subprocess.run(['schtasks', '/query', '/fo', 'csv'], capture_output=True, text=True)
+        return f"Scheduled tasks:\n{result.stdout}"
+    except Exception as e:
+        return f"Error listing scheduled tasks: {str(e)}"
+
+@lazy_tool(category="scheduled_tasks", requires=["bin:schtasks"])
+def create_scheduled_task(name: str, command: str, schedule: str) -> str:
+    """Create scheduled task."""
+    try:
+        result = subprocess.run(['schtasks', '/create', '/tn', name, '/tr', command, '/sc', schedule], 
+                              capture_output=True, text=True)
+        return f"Created scheduled task '{name}':\n{result.stdout}"
+    except Exception as e:
+        return f"Error creating scheduled task: {str(e)}"
+
+@lazy_tool(category="scheduled_tasks", requires=["bin:schtasks"])
+def delete_scheduled_task(name: str) -> str:
+    """Delete scheduled task."""
+    try:
+        result = subprocess.run(['schtasks', '/delete', '/tn', name, '/f'], capture_output=True, text=True)
+        return f"Deleted scheduled task '{name}':\n{result.stdout}"
+    except Exception as e:
+        return f"Error deleting scheduled task: {str(e)}"
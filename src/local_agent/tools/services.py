@@ -0,0 +1,54 @@
+# C:\David\src\local_agent\tools\services.py
+# Service management (Windows)
+
+import subprocess
+import time
+
+from ..tool_registry import lazy_tool
+
+@lazy_tool(category="services", requires=["os:Windows", "bin:sc"])
+def list_services() -> str:
+    """List Windows services."""
+    try:
+        result = subprocess.run(['sc', 'query'], capture_output=True, text=True)
+        return f"Windows services:\n{result.stdout}"
+    except Exception as e:
+        return f"Error listing services: {str(e)}"
+
+@lazy_tool(category="services", requires=["os:Windows", "bin:sc"])
+def service_status(service_name: str) -> str:
+    """Get service status."""
+    try:
+        result = subprocess.run(['sc', 'query', service_name], capture_output=True, text=True)
+        return f"Service {service_name} status:\n{result.stdout}"
+    except Exception as e:
+        return f"Error getting service status: {str(e)}"
+
+@lazy_tool(category="services", requires=["os:Windows", "bin:sc"])
+def start_service(service_name: str) -> str:
+    """Start Windows service."""
+    try:
+        result = subprocess.run(['sc', 'start', service_name], capture_output=True, text=True)
+        return f"Started service {service_name}:\n{result.stdout}"
+    except Exception as e:
+        return f"Error starting service: {str(e)}"
+
+@lazy_tool(category="services", requires=["os:Windows", "bin:sc"])
+def stop_service(service_name: str) -> str:
+    """Stop Windows service."""
+    try:
+        result = subprocess.run(['sc', 'stop', service_name], capture_output=True, text=True)
+        return f"Stopped service {service_name}:\n{result.stdout}"
+    except Exception as e:
+        return f"Error stopping service: {str(e)}"
+
+@lazy_tool(category="services", requires=["os:Windows", "bin:sc"])
+def restart_service(service_name: str) -> str:
+    """Restart Windows service."""
+    try:
+        stop_result = subprocess.run(['sc', 'stop', service_name], capture_output=True, text=True)
+        time.sleep(2)
+        start_result = subprocess.run(['sc', 'start', service_name], capture_output=True, text=True)
+        return f"Restarted service {service_name}:\nStop: {stop_result.stdout}\nStart: {start_result.stdout}"
+    except Exception as e:
+        return f"Error restarting service: {str(e)}"
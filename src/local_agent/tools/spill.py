@@ -0,0 +1,23 @@
+# C:\David\src\local_agent\tools\spill.py
+# Paging through tool outputs that were too large to return in full
+
+from ..session_context import current_context
+from ..spill_store import owns, read_range
+from ..tool_registry import lazy_tool
+
+@lazy_tool(category="spill")
+def read_spill(handle: str, offset: int = 0, limit: int = 4000) -> str:
+    """Read part of a large tool output that was saved to a spill file."""
+    try:
+        limit = max(1, min(limit, 8000))
+        if not owns(handle, current_context().session_id):
+            return f"Error reading spilled output: no spilled output with handle {handle} in this session"
+        chunk, total = read_range(handle, max(0, offset), limit)
+        end = min(offset + len(chunk), total)
+        output = [f"Spill {handle}: chars {offset:,}-{end:,} of {total:,}"]
+        output.append(chunk)
+        if end < total:
+            output.append(f"[more: read_spill(handle=\"{handle}\", offset={end})]")
+        return "\n".join(output)
+    except Exception as e:
+        return f"Error reading spilled output: {str(e)}"
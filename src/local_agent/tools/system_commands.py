@@ -0,0 +1,164 @@
+# C:\David\src\local_agent\tools\system_commands.py
+# System commands and status
+
+import os
+import subprocess
+import shutil
+import platform
+
+from ..tool_registry import REGISTRY, lazy_tool, optional_import
+from .common import resolve_path, session_env, current_context
+
+@lazy_tool(category="system")
+def execute_command(command: str, working_dir: str = ".", timeout: int = 30) -> str:
+    """Execute system command."""
+    try:
+        result = subprocess.run(
+            command,
+            shell=True,
+            cwd=resolve_path(working_dir),
+            env=session_env(),
+            timeout=timeout,
+            capture_output=True,
+            text=True
+        )
+        
+        output = [f"Command: {command}", f"Exit code: {result.returncode}"]
+        
+        if result.stdout:
+            output.append(f"STDOUT:\n{result.stdout}")
+        if result.stderr:
+            output.append(f"STDERR:\n{result.stderr}")
+            
+        return "\n".join(output)
+    except subprocess.TimeoutExpired:
+        return f"Command timed out after {timeout} seconds"
+    except Exception as e:
+        return f"Error executing command: {str(e)}"
+
+@lazy_tool(category="system", requires=["bin:python"])
+def python_execute(code: str, file_path: str = "", timeout: int = 30) -> str:
+    """Execute Python code."""
+    try:
+        if file_path:
+            file_path = resolve_path(file_path)
+            if not os.path.exists(file_path):
+                return f"Python file {file_path} does not exist"
+            result = subprocess.run(
+                ["python", file_path],
+                cwd=current_context().cwd,
+                env=session_env(),
+                timeout=timeout,
+                capture_output=True,
+                text=True
+            )
+        else:
+            result = subprocess.run(
+                ["python", "-c", code],
+                cwd=current_context().cwd,
+                env=session_env(),
+                timeout=timeout,
+                capture_output=True,
+                text=True
+            )
+        
+        output = [f"Python execution completed", f"Exit code: {result.returncode}"]
+        if result.stdout:
+            output.append(f"Output:\n{result.stdout}")
+        if result.stderr:
+            output.append(f"Error:\n{result.stderr}")
+        
+        return "\n".join(output)
+    except subprocess.TimeoutExpired:
+        return f"Python execution timed out after {timeout} seconds"
+    except Exception as e:
+        return f"Error executing Python: {str(e)}"
+
+@lazy_tool(category="system")
+def system_info() -> str:
+    """Get system information."""
+    try:
+        info = []
+        info.append(f"System: {platform.system()}")
+        info.append(f"Release: {platform.release()}")
+        info.append(f"Version: {platform.version()}")
+        info.append(f"Machine: {platform.machine()}")
+        info.append(f"Processor: {platform.processor()}")
+        info.append(f"Python version: {platform.python_version()}")
+        
+        psutil = optional_import("psutil")
+        if psutil:
+            info.append(f"CPU cores: {psutil.cpu_count()}")
+            memory = psutil.virtual_memory()
+            info.append(f"Memory: {memory.total // (1024**3)} GB total, {memory.available // (1024**3)} GB available")
+        
+        return "\n".join(info)
+    except Exception as e:
+        return f"Error getting system info: {str(e)}"
+
+@lazy_tool(category="system")
+def get_status() -> dict:
+    """Get David's status."""
+    from ..tool_cache import TOOL_CACHE
+    model = os.getenv("OLLAMA_MODEL", "qwen3:14b")
+    return {
+        "model_name": model,
+        "temperature": 0.6,
+        "context_window": 8192,
+        "status": "operational",
+        "tools_available": len(REGISTRY.available()),
+        "tools_unavailable": REGISTRY.unavailable_names(),
+        "tool_cache": TOOL_CACHE.stats()
+    }
+
+@lazy_tool(category="system", requires=["bin:powershell|pwsh"])
+def execute_powershell(script: str, working_dir: str = '.', timeout: int = 30) -> str:
+    """Run PowerShell commands."""
+    try:
+        working_dir = resolve_path(working_dir)
+        # Windows PowerShell where present, else PowerShell 7 - whichever satisfied the probe
+        executable = shutil.which('powershell') or shutil.which('pwsh')
+        if executable is None:
+            return "Error executing PowerShell: neither powershell nor pwsh is on PATH"
+        result = subprocess.run(
+            [executable, '-Command', script],
+            cwd=working_dir,
+            env=session_env(),
+            timeout=timeout,
+            capture_output=True,
+            text=True
+        )
+        
+        output = [f"PowerShell: {script}", f"Exit code: {result.returncode}"]
+        if result.stdout:
+            output.append(f"Output:\n{result.stdout}")
+        if result.stderr:
+            output.append(f"Error:\n{result.stderr}")
+        
+        return "\n".join(output)
+    except Exception as e:
+        return f"Error executing PowerShell: {str(e)}"
+
+@lazy_tool(category="system", requires=["bin:cmd"])
+def execute_batch(script: str, working_dir: str = '.', timeout: int = 30) -> str:
+    """Run batch scripts."""
+    try:
+        working_dir = resolve_path(working_dir)
+        result = subprocess.run(
+            ['cmd', '/c', script],
+            cwd=working_dir,
+            env=session_env(),
+            timeout=timeout,
+            capture_output=True,
+            text=True
+        )
+        
+        output = [f"Batch: {script}", f"Exit code: {result.returncode}"]
+        if result.stdout:
+            output.append(f"Output:\n{result.stdout}")
+        if result.stderr:
+            output.append(f"Error:\n{result.stderr}")
+        
+        return "\n".join(output)
+    except Exception as e:
+        return f"Error executing batch: {str(e)}"
@@ -0,0 +1,138 @@
+# C:\David\src\local_agent\tools\tables.py
+# Shared output for list-type tools - text, columnar JSON or TSV, with sort/filter/limit/fields
+#
+# A list tool collects its rows as tuples with typed values (sizes as ints, percentages as
+# floats) and hands them to table_result() with its column names. The same parameters work on
+# every list tool:
+#   format  "text" (the tool's own readable lines), "json" or "tsv"
+#   sort    "size" or "-size,name" - comma-separated columns, "-" for descending
+#   filter  "type=file,size>1000,name~log" - all must match; operators = != > >= < <= ~ !~
+#           (~ is a case-insensitive substring match; comparisons are numeric when both sides are)
+#   limit   keep the first N rows after sorting and filtering
+#   fields  "name,size" - columns to keep, in that order (with format="text" this gives TSV)
+# JSON is {"columns": [...], "total": N, "rows": [[...], ...]} with one row per line, so a
+# truncated preview still cuts between rows.
+
+import json
+import re
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+FORMATS = ("text", "json", "tsv")
+_FILTER_RE = re.compile(r"^\s*([\w.]+)\s*(!~|~|!=|>=|<=|=|>|<)\s*(.*?)\s*$")
+
+
+def _column(columns: Sequence[str], name: str) -> int:
+    try:
+        return columns.index(name.strip())
+    except ValueError:
+        raise ValueError(f"unknown column '{name.strip()}' (columns: {', '.join(columns)})")
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _matches(value: Any, op: str, wanted: str) -> bool:
+    if op in ("~", "!~"):
+        found = wanted.lower() in ("" if value is None else str(value)).lower()
+        return found if op == "~" else not found
+    left, right = _number(value), _number(wanted)
+    if left is None or right is None:
+        left, right = ("" if value is None else str(value)).lower(), wanted.lower()
+    if op == "=":
+        return left == right
+    if op == "!=":
+        return left != right
+    if op == ">":
+        return left > right
+    if op == ">=":
+        return left >= right
+    if op == "<":
+        return left < right
+    return left <= right
+
+
+def _filters(columns: Sequence[str], spec: str) -> List[Tuple[int, str, str]]:
+    parsed = []
+    for clause in filter(None, (c.strip() for c in spec.split(","))):
+        match = _FILTER_RE.match(clause)
+        if not match:
+            raise ValueError(f"bad filter '{clause}' - use column<op>value with one of = != > >= < <= ~ !~")
+        name, op, wanted = match.groups()
+        parsed.append((_column(columns, name), op, wanted))
+    return parsed
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Numbers before text, None last - mixed columns still sort."""
+    if value is None:
+        return (2, "")
+    number = _number(value)
+    return (0, number) if number is not None else (1, str(value).lower())
+
+
+def select_rows(columns: Sequence[str], rows: List[tuple], sort: Optional[str] = None, filter: Optional[str] = None,
+                limit: Optional[int] = None) -> Tuple[List[tuple], int]:
+    """Filtered, sorted and limited rows, plus the number that matched before the limit."""
+    if filter:
+        clauses = _filters(columns, filter)
+        rows = [r for r in rows if all(_matches(r[i], op, wanted) for i, op, wanted in clauses)]
+    if sort:
+        # Stable sorts applied last key first give a multi-key sort with per-key direction
+        for key in reversed([k.strip() for k in sort.split(",") if k.strip()]):
+            descending = key.startswith("-")
+            index = _column(columns, key.lstrip("+-"))
+            rows = sorted(rows, key=lambda r: _sort_key(r[index]), reverse=descending)
+    total = len(rows)
+    if limit is not None and limit >= 0:
+        rows = rows[:limit]
+    return rows, total
+
+
+def _tsv_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    text = value if isinstance(value, str) else json.dumps(value) if isinstance(value, (list, dict)) else str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def render_json(columns: Sequence[str], rows: List[tuple], total: int) -> str:
+    dumps = lambda v: json.dumps(v, separators=(",", ":"), ensure_ascii=False, default=str)  # noqa: E731
+    body = ",\n".join(dumps(list(r)) for r in rows)
+    return f'{{"columns":{dumps(list(columns))},"total":{total},"rows":[\n{body}\n]}}'
+
+
+def render_tsv(columns: Sequence[str], rows: List[tuple], total: int) -> str:
+    lines = ["\t".join(columns)] + ["\t".join(_tsv_cell(v) for v in r) for r in rows]
+    if total > len(rows):
+        lines.append(f"# {len(rows)} of {total} rows")
+    return "\n".join(lines)
+
+
+def table_result(columns: Sequence[str], rows: List[tuple], format: str = "text", sort: Optional[str] = None,
+                 filter: Optional[str] = None, limit: Optional[int] = None, fields: Optional[str] = None,
+                 text: Optional[Callable[[List[tuple], int], str]] = None) -> str:
+    """Render a list tool's rows. `text(rows, total)` produces the tool's own readable format."""
+    format = (format or "text").lower()
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    rows, total = select_rows(columns, rows, sort=sort, filter=filter, limit=limit)
+    if format == "text" and text is not None and not fields:
+        result = text(rows, total)
+        if total > len(rows):
+            result += f"\n... showing {len(rows)} of {total}"
+        return result
+    if fields:
+        indexes = [_column(columns, f) for f in fields.split(",") if f.strip()]
+        columns = [columns[i] for i in indexes]
+        rows = [tuple(r[i] for i in indexes) for r in rows]
+    if format == "json":
+        return render_json(columns, rows, total)
+    return render_tsv(columns, rows, total)
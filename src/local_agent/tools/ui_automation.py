@@ -0,0 +1,79 @@
+# C:\David\src\local_agent\tools\ui_automation.py
+# User interface automation
+
+import subprocess
+import platform
+import time
+
+from ..tool_registry import lazy_tool, optional_import
+from .common import resolve_path
+
+@lazy_tool(category="ui", requires=["mod:pyautogui"])
+def screenshot(file_path: str = None) -> str:
+    """Take screenshot."""
+    try:
+        pyautogui = optional_import("pyautogui")
+        if pyautogui is None:
+            return "Screenshot requires pyautogui"
+        
+        if not file_path:
+            file_path = f"screenshot_{int(time.time())}.png"
+        
+        resolved_path = resolve_path(file_path)
+        screenshot = pyautogui.screenshot()
+        screenshot.save(resolved_path)
+        return f"Screenshot saved to {resolved_path}"
+    except Exception as e:
+        return f"Error taking screenshot: {str(e)}"
+
+@lazy_tool(category="ui", requires=["mod:pyautogui"])
+def click_coordinates(x: int, y: int) -> str:
+    """Click at specific coordinates."""
+    try:
+        pyautogui = optional_import("pyautogui")
+        if pyautogui is None:
+            return "Mouse control requires pyautogui"
+        
+        pyautogui.click(x, y)
+        return f"Clicked at coordinates ({x}, {y})"
+    except Exception as e:
+        return f"Error clicking: {str(e)}"
+
+@lazy_tool(category="ui", requires=["mod:pyautogui"])
+def type_text(text: str) -> str:
+    """Type text at current cursor."""
+    try:
+        pyautogui = optional_import("pyautogui")
+        if pyautogui is None:
+            return "Text input requires pyautogui"
+        
+        pyautogui.typewrite(text)
+        return f"Typed text: {text[:50]}{'...' if len(text) > 50 else ''}"
+    except Exception as e:
+        return f"Error typing text: {str(e)}"
+
+@lazy_tool(category="ui", requires=["mod:pyautogui"])
+def key_combination(keys: str) -> str:
+    """Send key combinations (Ctrl+C, etc.)."""
+    try:
+        pyautogui = optional_import("pyautogui")
+        if pyautogui is None:
+            return "Key input requires pyautogui"
+        
+        key_list = [k.strip() for k in keys.split('+')]
+        pyautogui.hotkey(*key_list)
+        return f"Sent key combination: {keys}"
+    except Exception as e:
+        return f"Error sending keys: {str(e)}"
+
+@lazy_tool(category="ui", requires=["os:Windows", "bin:tasklist"])
+def window_list() -> str:
+    """List open windows."""
+    try:
+        if platform.system() == "Windows":
+            result = subprocess.run(['tasklist', '/fo', 'csv'], capture_output=True, text=True)
+            return f"Open windows:\n{result.stdout}"
+        else:
+            return "Window list requires Windows"
+    except Exception as e:
+        return f"Error listing windows: {str(e)}"
@@ -0,0 +1,55 @@
+# C:\David\src\local_agent\tools\watch.py
+# File watching - register a path once, then ask what changed instead of re-listing it
+
+from ..file_watcher import FILE_WATCHER
+from ..tool_registry import lazy_tool
+from .common import resolve_path
+
+MAX_CHANGES = 500
+_MARKS = {"created": "A", "modified": "M", "deleted": "D"}
+
+@lazy_tool(category="files")
+def watch_path(path: str, recursive: bool = True) -> str:
+    """Start watching a folder or file for changes. Returns a cursor to pass to changes_since."""
+    try:
+        watch = FILE_WATCHER.watch(resolve_path(path), recursive=recursive)
+        return (f"Watching {watch.path} ({'recursive, ' if watch.recursive else ''}{watch.backend} backend, "
+                f"watch id {watch.id}). Cursor: {FILE_WATCHER.cursor} - call changes_since(cursor={FILE_WATCHER.cursor})")
+    except Exception as e:
+        return f"Error watching path: {str(e)}"
+
+@lazy_tool(category="files")
+def unwatch_path(path: str) -> str:
+    """Stop watching a path started with watch_path."""
+    try:
+        resolved_path = resolve_path(path)
+        stopped = [w for w in FILE_WATCHER.watches() if w.path == resolved_path]
+        for watch in stopped:
+            FILE_WATCHER.unwatch(watch.id)
+        return f"Stopped watching {resolved_path}" if stopped else f"{resolved_path} is not being watched"
+    except Exception as e:
+        return f"Error unwatching path: {str(e)}"
+
+@lazy_tool(category="files")
+def changes_since(cursor: int = 0, path: str = None, limit: int = 200) -> str:
+    """Files created (A), modified (M) or deleted (D) in watched paths since `cursor`, one net change per file. Optionally only under `path`."""
+    try:
+        if not FILE_WATCHER.watches():
+            return "No paths are being watched - call watch_path first"
+        changes, latest, missed = FILE_WATCHER.changes_since(cursor, resolve_path(path) if path else None)
+        limit = max(1, min(limit, MAX_CHANGES))
+        lines = []
+        if missed:
+            lines.append(f"Warning: older changes after cursor {cursor} were dropped from the feed - "
+                         f"re-list the folder to be sure")
+        if not changes:
+            lines.append(f"No changes since cursor {cursor}. Cursor: {latest}")
+            return "\n".join(lines)
+        lines.append(f"{len(changes)} changed path(s) since cursor {cursor}. Cursor: {latest}")
+        lines += [f"{_MARKS[kind]} {changed}" + (f" (x{count})" if count > 1 else "")
+                  for kind, changed, count in changes[:limit]]
+        if len(changes) > limit:
+            lines.append(f"... and {len(changes) - limit} more (pass a larger limit or a narrower path)")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"Error reading changes: {str(e)}"
@@ -0,0 +1,36 @@
+# C:\David\src\local_agent\tools\windows_features.py
+# Windows-specific features
+
+import subprocess
+
+from ..tool_registry import lazy_tool
+
+@lazy_tool(category="windows", requires=["bin:wmic"])
+def installed_programs() -> str:
+    """List installed programs."""
+    try:
+        result = subprocess.run(['wmic', 'product', 'get', 'name,version', '/format:csv'], 
+                              capture_output=True, text=True)
+        return f"Installed programs:\n{result.stdout}"
+    except Exception as e:
+        return f"Error listing installed programs: {str(e)}"
+
+@lazy_tool(category="windows", requires=["bin:dism"])
+def windows_features() -> str:
+    """List Windows features."""
+    try:
+        result = subprocess.run(['dism', '/online', '/get-features', '/format:table'], 
+                              capture_output=True, text=True)
+        return f"Windows features:\n{result.stdout}"
+    except Exception as e:
+        return f"Error listing Windows features: {str(e)}"
+
+@lazy_tool(category="windows", requires=["bin:netsh"])
+def windows_firewall_status() -> str:
+    """Get Windows Firewall status."""
+    try:
+        result = subprocess.run(['netsh', 'advfirewall', 'show', 'allprofiles'], 
+                              capture_output=True, text=True)
+        return f"Windows Firewall status:\n{result.stdout}"
+    except Exception as e:
+        return f"Error getting firewall status: {str(e)}"
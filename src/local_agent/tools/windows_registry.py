@@ -0,0 +1,48 @@
+# C:\David\src\local_agent\tools\windows_registry.py
+# Registry access (Windows)
+
+
+from ..tool_registry import lazy_tool, optional_import
+
+@lazy_tool(category="registry", requires=["mod:winreg"])
+def registry_read(key_path: str, value_name: str) -> str:
+    """Read registry value."""
+    try:
+        winreg = optional_import("winreg")
+        if winreg is None:
+            return "Registry access requires Windows"
+        
+        key_parts = key_path.split('\\', 1)
+        hive = getattr(winreg, key_parts[0])
+        subkey = key_parts[1] if len(key_parts) > 1 else ""
+        
+        with winreg.OpenKey(hive, subkey) as key:
+            value, _ = winreg.QueryValueEx(key, value_name)
+            return f"Registry value {key_path}\\{value_name}: {value}"
+    except Exception as e:
+        return f"Error reading registry: {str(e)}"
+
+@lazy_tool(category="registry", requires=["mod:winreg"])
+def registry_write(key_path: str, value_name: str, value: str, value_type: str) -> str:
+    """Write registry value."""
+    try:
+        winreg = optional_import("winreg")
+        if winreg is None:
+            return "Registry access requires Windows"
+        
+        key_parts = key_path.split('\\', 1)
+        hive = getattr(winreg, key_parts[0])
+        subkey = key_parts[1] if len(key_parts) > 1 else ""
+        
+        type_map = {
+            'REG_SZ': winreg.REG_SZ,
+            'REG_DWORD': winreg.REG_DWORD,
+            'REG_BINARY': winreg.REG_BINARY
+        }
+        reg_type = type_map.get(value_type, winreg.REG_SZ)
+        
+        with winreg.OpenKey(hive, subkey, 0, winreg.KEY_SET_VALUE) as key:
+            winreg.SetValueEx(key, value_name, 0, reg_type, value)
+            return f"Registry value written: {key_path}\\{value_name}"
+    except Exception as e:
+        return f"Error writing registry: {str(e)}"
@@ -0,0 +1,25 @@
+# C:\David\src\local_agent\warmup.py
+# Ollama warm-up - load the model into memory without generating anything
+
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_model(model_name: str, keep_alive: str = None, host: str = None) -> float:
+    """Ask Ollama to load `model_name` with an empty prompt (no tokens generated).
+
+    Returns the load time in seconds. Raises if Ollama is unreachable.
+    """
+    from ollama import AsyncClient
+
+    keep_alive = keep_alive or os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    start = time.perf_counter()
+    # An empty prompt makes Ollama load the model and return immediately
+    await AsyncClient(host=host).generate(model=model_name, prompt="", keep_alive=keep_alive)
+    elapsed = time.perf_counter() - start
+    logger.info("warmup.model_loaded model=%s host=%s seconds=%.2f keep_alive=%s",
+                model_name, host or "default", elapsed, keep_alive)
+    return elapsed
@@ -0,0 +1,150 @@
+# C:\David\tests\test_approval_grants.py
+# Remembered approvals - grant scopes, allow-rule matching and plan approvals
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.local_agent.approval_grants import ANY_PATH, ApprovalGrants, grant_scope  # noqa: E402
+from src.local_agent.approval_policy import build_policy  # noqa: E402
+
+ROOT = "C:\\David"
+BASE = "C:/David"
+SESSION = "session-1"
+
+
+def call(name, **args):
+    return {"name": name, "args": args, "id": f"{name}-{len(args)}"}
+
+
+@pytest.fixture
+def policy():
+    return build_policy({"root": ROOT})
+
+
+@pytest.fixture
+def grants(tmp_path):
+    return ApprovalGrants(rules_path=tmp_path / "approval_rules.json")
+
+
+def answer(grants, policy, reply, *calls, request_id="request-1"):
+    classification = policy.classify(list(calls), BASE)
+    return grants.apply_answer(reply, SESSION, request_id, classification, policy, BASE)
+
+
+def pending(grants, policy, *calls, request_id="request-1"):
+    classification = grants.filter(SESSION, request_id, policy.classify(list(calls), BASE), policy, BASE)
+    return classification.needs_approval
+
+
+def test_pathless_high_risk_scope_pins_arguments(policy):
+    scopes = grant_scope(call("execute_command", command="git status"), policy, BASE)
+    assert scopes == [("execute_command", ANY_PATH, '{"command":"git status"}')]
+
+
+def test_path_scope_is_parent_folder(policy):
+    scopes = grant_scope(call("write_file", path="src/app.py", content="x"), policy, BASE)
+    assert scopes == [("write_file", "c:/david/src", None)]
+
+
+def test_high_risk_path_scope_pins_other_arguments(policy):
+    scopes = grant_scope(call("execute_command", command="dir", working_dir="src/app"), policy, BASE)
+    assert scopes == [("execute_command", "c:/david/src/app", '{"command":"dir"}')]
+
+
+@pytest.mark.parametrize("name", ["delete_directory", "delete_file", "move_directory"])
+def test_destructive_path_scope_is_exact_path(name, policy):
+    scopes = grant_scope(call(name, path="build"), policy, BASE)
+    assert [(tool, prefix) for tool, prefix, _ in scopes] == [(name, "c:/david/build")]
+
+
+def test_session_grant_on_delete_never_covers_parent_or_siblings(grants, policy):
+    assert answer(grants, policy, "s", call("delete_directory", path="C:\\David\\build"))
+    assert not pending(grants, policy, call("delete_directory", path="build"))
+    assert not pending(grants, policy, call("delete_directory", path="build/sub"))
+    assert pending(grants, policy, call("delete_directory", path="."))
+    assert pending(grants, policy, call("delete_directory", path="C:\\David"))
+    assert pending(grants, policy, call("delete_directory", path="docs"))
+    assert pending(grants, policy, call("delete_directory", path="build2"))
+
+
+def test_always_on_delete_persists_the_path_only(grants, policy):
+    assert answer(grants, policy, "always", call("delete_file", path="build/out.log"))
+    rules = json.loads(grants.rules_path.read_text(encoding="utf-8"))
+    assert [r["pattern"] for r in rules] == ["c:/david/build/out.log/*"]
+    assert not pending(grants, policy, call("delete_file", path="build/out.log"))
+    assert pending(grants, policy, call("delete_file", path="build/other.log"))
+    assert pending(grants, policy, call("delete_directory", path="build"))
+
+
+def test_always_on_command_allows_only_that_command(grants, policy):
+    assert answer(grants, policy, "always", call("execute_command", command="git status"))
+    rules = json.loads(grants.rules_path.read_text(encoding="utf-8"))
+    assert rules == [{"tool": "execute_command", "pattern": "*", "args": '{"command":"git status"}'}]
+    assert not pending(grants, policy, call("execute_command", command="git status"))
+    assert not pending(grants, policy, call("execute_command", command="  git status "))
+    assert pending(grants, policy, call("execute_command", command="del /s /q C:\\"))
+    assert pending(grants, policy, call("registry_write", key="HKCU\\Run", value="x"))
+
+
+def test_session_grant_on_command_is_exact(grants, policy):
+    assert answer(grants, policy, "s 5", call("kill_process", pid=100))
+    assert not pending(grants, policy, call("kill_process", pid=100))
+    assert pending(grants, policy, call("kill_process", pid=4))
+
+
+def test_session_grant_on_folder_covers_siblings_only(grants, policy):
+    assert answer(grants, policy, "s", call("write_file", path="src/a.py", content="1"))
+    assert not pending(grants, policy, call("write_file", path="src/b.py", content="2"))
+    assert not pending(grants, policy, call("write_file", path="src/sub/c.py", content="3"))
+    assert pending(grants, policy, call("write_file", path="docs/a.md", content="4"))
+    assert pending(grants, policy, call("append_file", path="src/a.py", content="5"))
+
+
+def test_session_grants_are_per_session(grants, policy):
+    assert answer(grants, policy, "s", call("write_file", path="src/a.py", content="1"))
+    classification = policy.classify([call("write_file", path="src/b.py", content="2")], BASE)
+    assert grants.filter("other-session", "request-1", classification, policy, BASE).needs_approval
+
+
+def test_plan_covers_only_the_calls_shown(grants, policy):
+    shown = [call("execute_command", command="pytest"), call("write_file", path="src/a.py", content="1")]
+    assert answer(grants, policy, "plan", *shown)
+    assert not pending(grants, policy, call("execute_command", command="pytest"))
+    assert not pending(grants, policy, call("write_file", path="src/b.py", content="2"))
+    assert pending(grants, policy, call("execute_command", command="rm -rf build"))
+    assert pending(grants, policy, call("delete_file", path="src/a.py"))
+
+
+def test_plan_ends_with_the_request(grants, policy):
+    assert answer(grants, policy, "plan", call("execute_command", command="pytest"))
+    assert pending(grants, policy, call("execute_command", command="pytest"), request_id="request-2")
+
+
+def test_yes_and_no_remember_nothing(grants, policy):
+    assert answer(grants, policy, "y", call("execute_command", command="pytest"))
+    assert not answer(grants, policy, "n", call("execute_command", command="pytest"))
+    assert pending(grants, policy, call("execute_command", command="pytest"))
+    assert not grants.rules_path.exists()
+
+
+def test_rule_patterns_and_wildcards(grants, policy):
+    grants.add_rule("write_file", "c:/david/src/*")
+    grants.add_rule("*", "c:/david/scratch/*")
+    assert not pending(grants, policy, call("write_file", path="src/a.py", content="1"))
+    assert pending(grants, policy, call("write_file", path="docs/a.md", content="1"))
+    assert not pending(grants, policy, call("delete_file", path="scratch/tmp.txt"))
+    assert pending(grants, policy, call("execute_command", command="pytest"))
+
+
+def test_outside_root_read_needs_its_folder_granted(grants, policy):
+    outside = call("read_file", path="D:/secrets/keys.txt")
+    assert pending(grants, policy, outside)
+    assert answer(grants, policy, "always", outside)
+    assert not pending(grants, policy, call("read_file", path="D:/secrets/other.txt"))
+    assert pending(grants, policy, call("read_file", path="D:/private/keys.txt"))
@@ -0,0 +1,56 @@
+# C:\David\tests\test_list_tools.py
+# List-type tools through the agent's tool list - table options omitted, null or set
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.local_agent.david_tools import available_tools  # noqa: E402
+from src.local_agent.tool_cache import with_tool_cache  # noqa: E402
+from src.local_agent.tool_registry import materialize  # noqa: E402
+
+TOOLS = {t.name: t for t in with_tool_cache(materialize(available_tools()))}
+TABLE_OPTIONS = {"sort": None, "filter": None, "limit": None, "fields": None}
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAVID_DATA_DIR", str(tmp_path / "data"))
+    (tmp_path / "a.txt").write_text("abc", encoding="utf-8")
+    (tmp_path / "people.csv").write_text("name,age\nann,31\nbob,42\n", encoding="utf-8")
+    return tmp_path
+
+
+def _calls(workspace):
+    db = str(workspace / "t.sqlite")
+    TOOLS["sqlite_query"].invoke({"db_path": db, "query": "CREATE TABLE IF NOT EXISTS t (x INTEGER)"})
+    return {
+        "list_directory": {"path": str(workspace)},
+        "sqlite_query": {"db_path": db, "query": "SELECT * FROM t"},
+        "list_processes": {},
+        "environment_variables": {},
+        "disk_list": {},
+        "profile_data": {"path": str(workspace / "people.csv")},
+    }
+
+
+@pytest.mark.parametrize("name", ["list_directory", "sqlite_query", "list_processes", "environment_variables",
+                                  "disk_list", "profile_data"])
+@pytest.mark.parametrize("options", [{}, TABLE_OPTIONS], ids=["omitted", "null"])
+def test_table_options_optional(name, options, workspace):
+    if name not in TOOLS:
+        pytest.skip(f"{name} is not available on this machine")
+    result = TOOLS[name].invoke({**_calls(workspace)[name], **options})
+    assert not str(result).startswith("Error"), result
+
+
+@pytest.mark.parametrize("name", ["list_directory", "profile_data"])
+def test_table_options_json(name, workspace):
+    result = TOOLS[name].invoke({**_calls(workspace)[name], "format": "json", "limit": 1, "fields": "name"})
+    table = json.loads(result)
+    assert table["columns"] == ["name"] and len(table["rows"]) == 1
@@ -0,0 +1,100 @@
+# C:\David\tests\test_tool_cache.py
+# Cache-wrapped tools - the list ToolNode runs must accept calls with only the required arguments
+
+import inspect
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.local_agent.david_tools import available_tools  # noqa: E402
+from src.local_agent.tool_cache import ToolResultCache, _wrap, with_tool_cache  # noqa: E402
+from src.local_agent.tool_registry import materialize  # noqa: E402
+
+ORIGINAL = materialize(available_tools())
+AGENT_TOOLS = with_tool_cache(ORIGINAL)
+WRAPPED = [original for original, agent in zip(ORIGINAL, AGENT_TOOLS) if original is not agent]
+BY_NAME = {t.name: t for t in AGENT_TOOLS}
+
+
+def _sample(annotation: Any, tmp_path: Path) -> Any:
+    if get_origin(annotation) is Union:
+        annotation = next(a for a in get_args(annotation) if a is not type(None))
+    origin = get_origin(annotation) or annotation
+    if origin in (list, List):
+        return []
+    if origin in (dict, Dict):
+        return {}
+    if origin is bool:
+        return False
+    if origin is int:
+        return 1
+    if origin is float:
+        return 1.0
+    return str(tmp_path / "sample.txt")
+
+
+def _required_args(tool_obj, tmp_path: Path) -> Dict[str, Any]:
+    return {name: _sample(field.annotation, tmp_path)
+            for name, field in tool_obj.args_schema.model_fields.items() if field.is_required()}
+
+
+def test_cache_wraps_tools():
+    assert {"list_directory", "directory_tree", "sqlite_query"} <= {t.name for t in WRAPPED}
+
+
+@pytest.mark.parametrize("original", WRAPPED, ids=lambda t: t.name)
+def test_wrapped_tool_accepts_required_args_only(original, tmp_path):
+    received = {}
+
+    def stub(**kwargs):
+        received.update(kwargs)
+        return "ok"
+
+    stub.__signature__ = inspect.signature(original.func)
+    fake = StructuredTool.from_function(func=stub, name=original.name, description=original.description,
+                                        args_schema=original.args_schema)
+    args = _required_args(original, tmp_path)
+    assert _wrap(fake, ToolResultCache()).invoke(args) == "ok"
+    assert set(args) <= set(received)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("abc", encoding="utf-8")
+    (tmp_path / "sub" / "b.log").write_text("hello", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.mark.parametrize("name, args", [
+    ("list_directory", {}),
+    ("directory_tree", {}),
+    ("directory_size", {}),
+    ("file_info", {"path": "a.txt"}),
+])
+def test_read_tools_through_agent_list(name, args, tree):
+    path = args.get("path")
+    call = {**args, "path": str(tree / path) if path else str(tree)}
+    result = BY_NAME[name].invoke(call)
+    assert isinstance(result, (str, dict))
+    assert not str(result).startswith("Error"), result
+
+
+def test_list_directory_table_options(tree):
+    result = BY_NAME["list_directory"].invoke({"path": str(tree), "format": "tsv", "filter": "type=file",
+                                               "limit": 1})
+    assert result.splitlines()[0].startswith("name\t")
+    assert "a.txt" in result
+
+
+def test_sqlite_query_required_args(tmp_path):
+    db = str(tmp_path / "t.sqlite")
+    BY_NAME["sqlite_query"].invoke({"db_path": db, "query": "CREATE TABLE t (x INTEGER)"})
+    result = BY_NAME["sqlite_query"].invoke({"db_path": db, "query": "SELECT COUNT(*) FROM t"})
+    assert not result.startswith("Error"), result